@@ -3,12 +3,13 @@ Router for invitation code management.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Dict, Optional, List
 from backend.models.invitation import invitation_store
 
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class InvitationRequest(BaseModel):
@@ -27,8 +28,14 @@ class InvitationResponse(BaseModel):
     max_requests: Optional[int] = None
 
 
+class InvitationCreateResponse(BaseModel):
+    """Response model for a newly created invitation code."""
+
+    code: str
+
+
 @router.post("/validate", response_model=InvitationResponse)
-async def validate_invitation_code(request: InvitationRequest):
+def validate_invitation_code(request: InvitationRequest):
     """
     Validate an invitation code for a session.
 
@@ -40,19 +47,19 @@ async def validate_invitation_code(request: InvitationRequest):
     """
     result = invitation_store.validate_code(request.code, request.session_id)
 
-    # Convert to response model
-    response = InvitationResponse(valid=result["valid"], message=result["message"])
+    payload = {"valid": result["valid"], "message": result["message"]}
 
     # Add optional fields if valid
     if result["valid"]:
-        response.remaining_requests = result["remaining_requests"]
-        response.max_requests = result["max_requests"]
+        payload["remaining_requests"] = result["remaining_requests"]
+        payload["max_requests"] = result["max_requests"]
 
-    return response
+    # Store results are already trusted, so skip constructor validation
+    return InvitationResponse.model_construct(**payload)
 
 
 @router.post("/use", response_model=InvitationResponse)
-async def use_invitation_request(request: InvitationRequest):
+def use_invitation_request(request: InvitationRequest):
     """
     Use a request from an invitation code's quota.
 
@@ -65,22 +72,22 @@ async def use_invitation_request(request: InvitationRequest):
     Raises:
         HTTPException: If the code is invalid or has no remaining requests
     """
-    # validate the invitation code
-    validation = invitation_store.validate_code(request.code, request.session_id)
-    if not validation["valid"]:
-        raise HTTPException(status_code=403, detail=validation["message"])
-    remaining = invitation_store.use_request(request.code, request.session_id)
-    return InvitationResponse(
+    # Validate the code and use a request in one atomic store call
+    result = invitation_store.consume_request(request.code, request.session_id)
+    if not result["valid"]:
+        raise HTTPException(status_code=403, detail=result["message"])
+    remaining = result["remaining_requests"]
+    return InvitationResponse.model_construct(
         valid=True,
         message=f"Request used successfully. {remaining} requests remaining.",
         remaining_requests=remaining,
-        max_requests=validation["max_requests"],
+        max_requests=result["max_requests"],
     )
 
 
 # For admin/development purposes only - should be protected in production
-@router.post("/create")
-async def create_invitation():
+@router.post("/create", response_model=InvitationCreateResponse)
+def create_invitation():
     """Create a new invitation code (for development/testing only)."""
     code = invitation_store.create_invitation_code()
     return {"code": code}
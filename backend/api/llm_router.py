@@ -2,83 +2,287 @@
 Router for LLM service diagnostics and management.
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any, List
-import requests
+import asyncio
+import hashlib
+import time
+import httpx
+import orjson
+from functools import lru_cache
+from fastapi import APIRouter, Request, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import Dict, Any, List, Optional, Tuple
 
 from backend.core.services.llm_service import (
     get_available_providers,
-    get_provider_models,
-    validate_provider_credentials
+    acheck_provider_credentials,
+    aget_all_provider_models
 )
+from backend.core.services.model_catalog import get_models_cached
 from backend.core.config import settings
+from backend.models.llm import LLMStatusResponse, ProviderHealth, ProviderStatus
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-@router.get("/status", response_model=Dict[str, Any])
-async def check_llm_status():
-    """Check the status of connected LLM providers."""
-    statuses = {}
-    
-    # Check OpenAI
-    try:
-        openai_key = settings.OPENAI_API_KEY
-        if openai_key:
-            openai_valid = validate_provider_credentials("openai", openai_key)
-            statuses["openai"] = {
-                "status": "available" if openai_valid else "invalid_credentials",
-                "api_configured": True
-            }
-        else:
-            statuses["openai"] = {"status": "not_configured"}
-    except Exception as e:
-        statuses["openai"] = {"status": "error", "message": str(e)}
-    
-    # Check Anthropic if available
+# Last probe result per provider: name -> (monotonic timestamp, health)
+_health_cache: Dict[str, Tuple[float, ProviderHealth]] = {}
+# Probe currently running per provider; concurrent callers await the same task
+_health_probes: Dict[str, asyncio.Task] = {}
+# Caps simultaneous upstream probes across all /status callers
+_PROBE_SEM = asyncio.Semaphore(settings.LLM_PROBE_CONCURRENCY or 5)
+
+
+# Providers reported by /status:
+# (provider id, API key setting, endpoint setting, report the model list)
+PROVIDERS: Tuple[Tuple[str, Optional[str], Optional[str], bool], ...] = (
+    ("openai", "OPENAI_API_KEY", None, False),
+    ("anthropic", "ANTHROPIC_API_KEY", None, False),
+    ("llama", None, "LLAMA_API_ENDPOINT", True),
+)
+
+
+def _tagged(payload: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Serialize a payload and derive a strong ETag from its bytes."""
+    body = orjson.dumps(payload)
+    return body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _etag_response(
+    request: Request, body: bytes, etag: str, cache_control: str
+) -> Response:
+    """
+    Send a serialized payload with its ETag and caching policy.
+
+    Args:
+        request: The incoming request
+        body: The JSON body
+        etag: ETag of the body
+        cache_control: Cache-Control header value
+
+    Returns:
+        A bodiless 304 if the client's If-None-Match already has this ETag,
+        otherwise the JSON response
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def _shared_cache_control() -> str:
+    """Let clients and proxies reuse a response as long as the server would."""
+    return f"public, max-age={settings.LLM_HEALTH_TTL}"
+
+
+def _elapsed_ms(started: float) -> float:
+    """Milliseconds since a `time.perf_counter()` reading."""
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+async def _probe(
+    provider: Tuple[str, Optional[str], Optional[str], bool],
+    http_client: httpx.AsyncClient
+) -> ProviderHealth:
+    """
+    Check a single provider described by a `PROVIDERS` record.
+
+    Args:
+        provider: The provider record
+        http_client: Shared async HTTP client
+
+    Returns:
+        The provider health, with the upstream check's latency
+    """
+    name, key_setting, endpoint_setting, fetch_models = provider
+    api_key = getattr(settings, key_setting) if key_setting else None
+    api_endpoint = getattr(settings, endpoint_setting) if endpoint_setting else None
+    if not (api_key or api_endpoint):
+        return ProviderHealth(status=ProviderStatus.NOT_CONFIGURED)
+
+    # Hold a slot only for the upstream call itself
+    async with _PROBE_SEM:
+        started = time.perf_counter()
+        timeout = settings.LLM_PROBE_TIMEOUT or 10.0
+        try:
+            if not fetch_models:
+                status = await asyncio.wait_for(
+                    acheck_provider_credentials(
+                        http_client, name, api_key, api_endpoint
+                    ),
+                    timeout=timeout
+                )
+                return ProviderHealth(status=status, latency_ms=_elapsed_ms(started))
+
+            # Served from the on-disk catalog; only a cache miss hits the endpoint
+            models, stale = await asyncio.wait_for(
+                get_models_cached(
+                    http_client, name, api_key=api_key, api_endpoint=api_endpoint
+                ),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            # A wedged upstream must not hold /status (or a semaphore slot) open
+            return ProviderHealth(
+                status=ProviderStatus.UNAVAILABLE,
+                latency_ms=_elapsed_ms(started),
+                message="probe timeout"
+            )
+        latency_ms = _elapsed_ms(started)
+
+    if models is None:
+        return ProviderHealth(
+            status=ProviderStatus.UNAVAILABLE,
+            latency_ms=latency_ms,
+            message="Endpoint validation failed"
+        )
+    return ProviderHealth(
+        status=ProviderStatus.HEALTHY,
+        latency_ms=latency_ms,
+        endpoint=api_endpoint,
+        models=[m.get("id") for m in models],
+        stale=stale or None
+    )
+
+
+async def _record_probe(
+    provider: Tuple[str, Optional[str], Optional[str], bool],
+    http_client: httpx.AsyncClient
+) -> ProviderHealth:
+    """Probe a provider and store the result in the health cache."""
+    result = await _probe(provider, http_client)
+    _health_cache[provider[0]] = (time.monotonic(), result)
+    return result
+
+
+async def _cached_probe(
+    provider: Tuple[str, Optional[str], Optional[str], bool],
+    http_client: httpx.AsyncClient,
+    refresh: bool = False
+) -> ProviderHealth:
+    """
+    Run a provider probe, reusing a result younger than LLM_HEALTH_TTL.
+
+    Callers that miss the cache while a probe of the same provider is
+    already running await that probe instead of starting their own.
+
+    Args:
+        provider: The `PROVIDERS` record to probe
+        http_client: Shared async HTTP client
+        refresh: Skip the cached result
+
+    Returns:
+        The provider health
+    """
+    name = provider[0]
+    cached = _health_cache.get(name)
+    if (
+        cached
+        and not refresh
+        and time.monotonic() - cached[0] < settings.LLM_HEALTH_TTL
+    ):
+        return cached[1]
+
+    probe = _health_probes.get(name)
+    if probe is None:
+        probe = asyncio.ensure_future(_record_probe(provider, http_client))
+        _health_probes[name] = probe
+        probe.add_done_callback(lambda _: _health_probes.pop(name, None))
+
+    # Shielded so a caller that goes away does not cancel the probe for the rest
+    return await asyncio.shield(probe)
+
+
+async def _provider_health(
+    provider: Tuple[str, Optional[str], Optional[str], bool],
+    http_client: httpx.AsyncClient,
+    refresh: bool = False
+) -> Tuple[str, ProviderHealth]:
+    """
+    Get a provider's (possibly cached) health, reporting a failed probe as unavailable.
+
+    Args:
+        provider: The `PROVIDERS` record to probe
+        http_client: Shared async HTTP client
+        refresh: Skip the cached result
+
+    Returns:
+        Tuple of (provider name, health)
+    """
+    name = provider[0]
     try:
-        anthropic_key = settings.ANTHROPIC_API_KEY
-        if anthropic_key:
-            anthropic_valid = validate_provider_credentials("anthropic", anthropic_key)
-            statuses["anthropic"] = {
-                "status": "available" if anthropic_valid else "invalid_credentials",
-                "api_configured": True
-            }
-        else:
-            statuses["anthropic"] = {"status": "not_configured"}
+        return name, await _cached_probe(provider, http_client, refresh)
     except Exception as e:
-        statuses["anthropic"] = {"status": "error", "message": str(e)}
-    
-    # Check Llama/Ollama
-    try:
-        llama_endpoint = settings.LLAMA_API_ENDPOINT
-        if llama_endpoint:
-            llama_valid = validate_provider_credentials(
-                "llama", 
-                api_endpoint=llama_endpoint
+        return name, ProviderHealth(status=ProviderStatus.UNAVAILABLE, message=str(e))
+
+
+@router.get(
+    "/status", response_model=LLMStatusResponse, response_model_exclude_none=True
+)
+async def check_llm_status(request: Request, refresh: bool = False):
+    """
+    Check the status of connected LLM providers.
+
+    Results are cached for LLM_HEALTH_TTL seconds; pass `?refresh=true`
+    to force fresh probes. Responses carry an ETag so pollers can send
+    If-None-Match and get a 304 while nothing has changed, and a
+    Cache-Control max-age of LLM_HEALTH_TTL so proxies can answer polls.
+    """
+    http_client = request.app.state.http
+
+    # Probe all providers concurrently so the slowest one bounds the latency
+    results = await asyncio.gather(
+        *(_provider_health(provider, http_client, refresh) for provider in PROVIDERS)
+    )
+    statuses = dict(results)
+
+    payload = LLMStatusResponse(providers=statuses).model_dump(
+        mode="json", exclude_none=True
+    )
+    # Forced refreshes are for the caller only; everything else is shared
+    cache_control = "no-store" if refresh else _shared_cache_control()
+    return _etag_response(request, *_tagged(payload), cache_control)
+
+
+@router.get("/status/stream")
+async def stream_llm_status(request: Request, refresh: bool = False):
+    """
+    Stream provider statuses as Server-Sent Events.
+
+    Each provider is sent as soon as its probe completes, as an event whose
+    data is a JSON object mapping the provider name to its health, so a slow
+    provider does not hold back the others.
+    """
+    http_client = request.app.state.http
+
+    async def events():
+        probes = [
+            _provider_health(provider, http_client, refresh) for provider in PROVIDERS
+        ]
+        for probe in asyncio.as_completed(probes):
+            name, health = await probe
+            data = orjson.dumps(
+                {name: health.model_dump(mode="json", exclude_none=True)}
             )
-            
-            if llama_valid:
-                # Try to get available models
-                models = get_provider_models("llama")
-                model_names = [m.get("id") for m in models]
-                statuses["llama"] = {
-                    "status": "available",
-                    "endpoint": llama_endpoint,
-                    "models": model_names
-                }
-            else:
-                statuses["llama"] = {
-                    "status": "endpoint_error",
-                    "message": "Endpoint validation failed"
-                }
-        else:
-            statuses["llama"] = {"status": "not_configured"}
-    except Exception as e:
-        statuses["llama"] = {"status": "error", "message": str(e)}
-    
-    return {"providers": statuses}
+            yield b"data: " + data + b"\n\n"
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
+    )
+
+
+@lru_cache(maxsize=1)
+def _cached_providers() -> Tuple[bytes, str]:
+    """The serialized provider list, fixed once the provider modules import."""
+    return _tagged({"providers": get_available_providers()})
+
 
 @router.get("/providers", response_model=Dict[str, List[Dict[str, Any]]])
-async def list_llm_providers():
+async def list_llm_providers(request: Request):
     """Get a list of available LLM providers."""
-    return {"providers": get_available_providers()}
\ No newline at end of file
+    return _etag_response(request, *_cached_providers(), _shared_cache_control())
+
+
+@router.get("/models")
+async def list_llm_models(request: Request):
+    """Get the models of every available provider, fetched concurrently."""
+    return {"models": await aget_all_provider_models(request.app.state.http)}
@@ -2,28 +2,46 @@
 MLflow router module for handling MLflow chatbot endpoints.
 """
 
-import json
-import time
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import logging
+import orjson
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from itertools import islice
+from types import MappingProxyType
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+)
 from pydantic import BaseModel
-import requests
 
-from backend.models.chat import ChatRequest, ChatResponse
+from backend.models.chat import ChatReply, ChatRequest, ChatResponse
 from backend.models.invitation import invitation_store
+from backend.utils.rate_limiter import RateLimiter
 from backend.utils.session_store import (
-    get_conversation_history,
+    get_session_bundle,
     append_to_conversation,
-    get_session_data,
     set_session_data,
+    set_session_data_many,
 )
 from backend.core.services.llm_service import (
-    generate_chat_response,
+    agenerate_with_cascade,
+    generate_chat_response_stream,
     get_available_providers,
     get_provider_models,
 )
 from backend.core.services.mlflow_service import (
     get_experiment_id_by_name,
+    resolve_experiment_by_name,
     create_experiment,
     create_run,
     log_param,
@@ -31,8 +49,10 @@ from backend.core.services.mlflow_service import (
     delete_experiment,
     delete_run,
     get_experiment_by_id,
+    get_experiment_name,
     list_experiments,
     list_runs,
+    count_runs,
     get_mlflow_summary_stats,
     get_model_details,
     get_model_versions,
@@ -45,8 +65,26 @@ from backend.core.services.mlflow_service import (
 )
 from backend.core.config import settings
 
+logger = logging.getLogger("mlflow_router")
+
+# Throttles invitation code lookups before they reach the store: per client
+# and code, and per client overall so that trying many codes is limited too
+_invitation_limiter = RateLimiter(
+    settings.INVITATION_RATE_LIMIT, settings.INVITATION_RATE_WINDOW
+)
+_host_limiter = RateLimiter(
+    settings.INVITATION_HOST_RATE_LIMIT, settings.INVITATION_RATE_WINDOW
+)
+
+# Read-only stand-in for missing nested objects in MLflow responses, so
+# lookups on them do not allocate a new empty dict per row
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Runs independent MLflow requests of one intent handler side by side
+_mlflow_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="mlflow")
+
 # Create API router
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 # Models for LLM-related endpoints
@@ -70,72 +108,45 @@ async def list_llm_providers():
     return {"providers": get_available_providers()}
 
 
+def _check_rate_limit(http_request: Request, invitation_code: str) -> None:
+    """
+    Reject a client that keeps looking up invitation codes.
+
+    Raises:
+        HTTPException: If the client exceeded INVITATION_RATE_LIMIT for this
+            code or INVITATION_HOST_RATE_LIMIT across all codes
+    """
+    client = http_request.client.host if http_request.client else ""
+    if not (
+        _host_limiter.allow(client)
+        and _invitation_limiter.allow((client, invitation_code[:8]))
+    ):
+        raise HTTPException(
+            status_code=429, detail="Too many requests. Please try again later."
+        )
+
+
 @router.post("/provider-models", response_model=LLMModelsInfo)
-async def get_models_for_provider(request: ProviderModelRequest):
+async def get_models_for_provider(
+    request: ProviderModelRequest, http_request: Request
+):
     """Get available models for a specific provider."""
+    _check_rate_limit(http_request, request.invitation_code)
+
     # Validate the invitation code
-    validation = invitation_store.validate_code(
-        request.invitation_code, "model-listing"
+    validation = await asyncio.to_thread(
+        invitation_store.validate_code, request.invitation_code, "model-listing"
     )
     if not validation["valid"]:
         raise HTTPException(status_code=403, detail=validation["message"])
 
     # Get the models for the requested provider
-    models = get_provider_models(request.provider_id)
+    models = await asyncio.to_thread(get_provider_models, request.provider_id)
     return {"models": models}
 
 
-@router.post("/mlflow", response_model=ChatResponse)
-async def chatbot_mlflow(request: ChatRequest) -> ChatResponse:
-    """
-    Extended MLflow Chatbot that:
-      1) Creates experiments
-      2) Creates runs (by name or ID)
-      3) Logs parameters and metrics
-      4) Handles "create_experiment_and_start_run"
-      5) Provides user-friendly plain-text instructions if info is missing
-      6) Remembers the last created run ID in session_data so user can omit run_id
-      7) Supports "delete_experiment" and "delete_run" via new intents
-      8) Supports multiple LLM providers and models
-      9) Validates invitation codes and tracks request usage
-    """
-
-    # --------------------------------------------------------
-    # 1) Retrieve session ID and user query
-    # --------------------------------------------------------
-    session_id = request.session_id
-    user_query = request.query
-    invitation_code = request.invitation_code
-
-    # --------------------------------------------------------
-    # 2) Validate invitation code
-    # --------------------------------------------------------
-    validation = invitation_store.validate_code(invitation_code, session_id)
-    if not validation["valid"]:
-        parsed_response = {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"Invitation code error: {validation['message']} \
-            Please contact hey@prodizyplatform.in to request a new invitation code.",
-        }
-        return {"assistant_response": parsed_response}
-
-    # --------------------------------------------------------
-    # 3) Access conversation history & Append user message
-    # --------------------------------------------------------
-    conversation_history = get_conversation_history(session_id)
-    append_to_conversation(session_id, "user", user_query)
-
-    # (DEBUG) Print entire conversation history
-    print(f"[DEBUG] session_id={session_id} - Conversation History:")
-    for i, msg in enumerate(conversation_history, 1):
-        print(f"  {i}. {msg['role'].upper()}: {msg['content']}")
-    print("[DEBUG] End of conversation history\n")
-
-    # --------------------------------------------------------
-    # 4) System instructions
-    # --------------------------------------------------------
-    system_instructions = """
+# Instructions sent as the system message of every /mlflow prompt
+_SYSTEM_INSTRUCTIONS = """
 You are an intelligent MLflow assistant.
 Below is the conversation history between you and the user.
 Use this history to figure out the user's most recent request.
@@ -241,24 +252,255 @@ When the user wants to log a metric, you must use "metric_key" and "metric_value
 If the user uses synonyms, convert them to the correct JSON keys.
 When the user wants to log a parameter, you must use "param_key" and "param_value" exactly.
 """
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_INSTRUCTIONS}
+
+
+# Commands so unambiguous that they are mapped to an intent without the LLM;
+# each pattern must match the whole query
+_FAST_INTENTS: Tuple[Tuple[re.Pattern, str], ...] = (
+    (
+        re.compile(r"(?:list|show)(?: me)?(?: all)?(?: the)? experiments", re.I),
+        "list_experiments",
+    ),
+    (
+        re.compile(
+            r"(?:list|show)(?: me)?(?: all)?(?: the)? registered models", re.I
+        ),
+        "get_registered_models",
+    ),
+    (
+        re.compile(r"(?:show(?: me)?(?: the)? )?(?:mlflow )?summary", re.I),
+        "get_mlflow_summary",
+    ),
+)
+
+
+def _format_timestamp(timestamp_ms: Any) -> str:
+    """Format an MLflow millisecond timestamp as local "YYYY-MM-DD HH:MM:SS"."""
+    # isoformat skips the locale-aware strftime formatting
+    moment = datetime.fromtimestamp(int(timestamp_ms) // 1000)
+    return moment.isoformat(sep=" ", timespec="seconds")
+
+
+def _short_id(run_id: str) -> str:
+    """Shorten a run ID to its first 8 and last 4 characters for display."""
+    if len(run_id) <= 12:
+        return run_id
+    return f"{run_id[:8]}...{run_id[-4:]}"
+
+
+def _format_date(timestamp_ms: Any) -> str:
+    """Format an MLflow millisecond timestamp as a local "YYYY-MM-DD" date."""
+    return datetime.fromtimestamp(int(timestamp_ms) // 1000).date().isoformat()
+
+
+def _match_fast_intent(query: str) -> Optional[Dict[str, Any]]:
+    """
+    Map a query matching one of `_FAST_INTENTS` to a confirmed LLM-style response.
+
+    Args:
+        query: The user's query
+
+    Returns:
+        The response the LLM would give for the query, or None if no pattern
+        matches
+    """
+    query = query.strip().rstrip(".!?")
+    for pattern, intent in _FAST_INTENTS:
+        if pattern.fullmatch(query):
+            return {
+                "intent": intent,
+                "entities": {},
+                "confirmation": "confirmed",
+                "message": "",
+            }
+    return None
+
+
+@router.post("/mlflow", response_model=ChatResponse)
+async def chatbot_mlflow(
+    request: ChatRequest, http_request: Request
+) -> ChatResponse:
+    """
+    Extended MLflow Chatbot that:
+      1) Creates experiments
+      2) Creates runs (by name or ID)
+      3) Logs parameters and metrics
+      4) Handles "create_experiment_and_start_run"
+      5) Provides user-friendly plain-text instructions if info is missing
+      6) Remembers the last created run ID in session_data so user can omit run_id
+      7) Supports "delete_experiment" and "delete_run" via new intents
+      8) Supports multiple LLM providers and models
+      9) Validates invitation codes and tracks request usage
+    """
+    _check_rate_limit(http_request, request.invitation_code)
+
+    if request.stream:
+        return StreamingResponse(
+            _chat_events(request),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    # The body is already plain JSON data, so encode it with orjson directly
+    # instead of re-validating it against ChatResponse and jsonable_encoder
+    return ORJSONResponse(await _chat(request))
+
+
+async def _chat(request: ChatRequest) -> Dict[str, Any]:
+    """Handle a chat request and return the response body."""
+    body, messages, provider_id, model_id, sdata, spent = await _prepare_chat(
+        request
+    )
+    if body is not None:
+        return body
+
+    try:
+        # Tries the cheaper LLM_CASCADE models first when one is configured
+        raw_response = await agenerate_with_cascade(
+            messages=messages,
+            provider_id=provider_id,
+            model_id=model_id,
+            temperature=0.0,
+        )
+        logger.debug("LLM raw_response: %s", raw_response)
+    except Exception as e:
+        await _refund_request(request, spent)
+        return _llm_error(e)
+
+    return await _finish_chat(request.session_id, raw_response, sdata)
+
+
+async def _chat_events(request: ChatRequest) -> AsyncIterator[bytes]:
+    """
+    Handle a chat request as Server-Sent Events.
+
+    Each piece of LLM output is sent as a `{"delta": ...}` event while it is
+    generated; the last event carries the same body `_chat` would return.
+    """
+    body, messages, provider_id, model_id, sdata, spent = await _prepare_chat(
+        request
+    )
+    if body is None:
+        chunks = []
+        # Deltas go out as they arrive, so there is no whole reply to judge
+        # before sending it; streaming skips LLM_CASCADE and uses the selection
+        try:
+            async for chunk in generate_chat_response_stream(
+                messages=messages,
+                provider_id=provider_id,
+                model_id=model_id,
+                temperature=0.0,
+            ):
+                chunks.append(chunk)
+                yield b"data: " + orjson.dumps({"delta": chunk}) + b"\n\n"
+        except Exception as e:
+            await _refund_request(request, spent)
+            body = _llm_error(e)
+        else:
+            raw_response = "".join(chunks).strip()
+            logger.debug("LLM raw_response: %s", raw_response)
+            body = await _finish_chat(request.session_id, raw_response, sdata)
+
+    yield b"data: " + orjson.dumps(body) + b"\n\n"
+
+
+def _llm_error(error: Exception) -> Dict[str, Any]:
+    """Build the response body for a failed LLM call."""
+    parsed_response = {
+        "intent": "error",
+        "confirmation": "needs_clarification",
+        "message": f"Error accessing LLM: {str(error)}",
+    }
+    return {"assistant_response": parsed_response}
+
+
+async def _refund_request(request: ChatRequest, spent: bool) -> None:
+    """Give back the request _prepare_chat spent when the LLM gave no answer."""
+    if not spent:
+        return
+    remaining = await asyncio.to_thread(
+        invitation_store.refund_request, request.invitation_code
+    )
+    if remaining is not None:
+        set_session_data(request.session_id, "remaining_requests", remaining)
+
+
+async def _prepare_chat(
+    request: ChatRequest,
+) -> Tuple[
+    Optional[Dict[str, Any]],
+    List[Dict[str, str]],
+    str,
+    str,
+    Dict[str, Any],
+    bool,
+]:
+    """
+    Validate the request and build the LLM prompt for it.
+
+    Args:
+        request: The chat request
+
+    Returns:
+        A tuple of (body, messages, provider_id, model_id, session data,
+        spent). When body is not None the request is already answered (an
+        invitation error or a fast-path command) and no LLM call is needed.
+        spent tells whether a request was used up, so that an LLM failure can
+        give it back.
+    """
+
+    # --------------------------------------------------------
+    # 1) Retrieve session ID and user query
+    # --------------------------------------------------------
+    session_id = request.session_id
+    user_query = request.query
+    invitation_code = request.invitation_code
 
     # --------------------------------------------------------
-    # 5) Build the messages for LLM
+    # 2) Validate invitation code and use one of its requests
     # --------------------------------------------------------
-    messages = [{"role": "system", "content": system_instructions}]
-    messages.extend(conversation_history)
+    # One atomic store call, so concurrent chats cannot all pass validation
+    # and then each spend the last remaining request; it is refunded if the
+    # LLM then fails to answer
+    validation = await asyncio.to_thread(
+        invitation_store.consume_request, invitation_code, session_id
+    )
+    if not validation["valid"]:
+        parsed_response = {
+            "intent": "error",
+            "confirmation": "needs_clarification",
+            "message": f"Invitation code error: {validation['message']} \
+            Please contact hey@prodizyplatform.in to request a new invitation code.",
+        }
+        return {"assistant_response": parsed_response}, [], "", "", {}, False
 
-    # (DEBUG) Print prompt to LLM
-    print("[DEBUG] Prompt to LLM:")
-    for i, msg in enumerate(messages, 1):
-        print(f"  {i}. {msg['role'].upper()}: {msg['content']}")
-    print("[DEBUG] End of prompt\n")
+    # --------------------------------------------------------
+    # 3) Access conversation history & Append user message
+    # --------------------------------------------------------
+    append_to_conversation(session_id, "user", user_query)
 
     # --------------------------------------------------------
-    # 6) Get LLM provider settings from session data
+    # 4) Build the messages for LLM
     # --------------------------------------------------------
-    sdata = get_session_data(session_id)
+    # Only the recent turns are sent, so prompt size stays bounded as the
+    # conversation grows; the session data comes back in the same call
+    conversation_window, sdata = get_session_bundle(
+        session_id,
+        max_messages=settings.CHAT_HISTORY_MESSAGES,
+        max_chars=settings.CHAT_HISTORY_CHARS,
+    )
+    messages = [_SYSTEM_MESSAGE, *conversation_window]
+
+    # The window already ends with the user's message; skip the system prompt
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "session_id=%s prompt history: %s", session_id, conversation_window
+        )
 
+    # --------------------------------------------------------
+    # 5) Get LLM provider settings from session data
+    # --------------------------------------------------------
     # Get LLM provider settings from session data or use defaults
     provider_id = sdata.get(
         "llm_provider_id",
@@ -274,46 +516,59 @@ When the user wants to log a parameter, you must use "param_key" and "param_valu
     )
 
     # Store remaining requests in session data
-    remaining_requests = validation["remaining_requests"]
-    max_requests = validation["max_requests"]
-    set_session_data(session_id, "remaining_requests", remaining_requests)
-    set_session_data(session_id, "max_requests", max_requests)
-    set_session_data(session_id, "invitation_code", invitation_code)
+    set_session_data_many(
+        session_id,
+        {
+            "remaining_requests": validation["remaining_requests"],
+            "max_requests": validation["max_requests"],
+            "invitation_code": invitation_code,
+        },
+    )
 
     # --------------------------------------------------------
-    # 7) Call the LLM with appropriate provider
+    # 6) Answer unambiguous commands without the LLM
     # --------------------------------------------------------
-    try:
-        raw_response = generate_chat_response(
-            messages=messages,
-            provider_id=provider_id,
-            model_id=model_id,
-            temperature=0.0,
+    fast_response = _match_fast_intent(user_query)
+    if fast_response is not None:
+        # Unambiguous commands skip the LLM round-trip entirely
+        append_to_conversation(
+            session_id, "assistant", orjson.dumps(fast_response).decode()
         )
-        print(f"[DEBUG] LLM raw_response:\n{raw_response}\n")  # (DEBUG)
-    except Exception as e:
-        parsed_response = {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"Error accessing LLM: {str(e)}",
-        }
-        return {"assistant_response": parsed_response}
+        body = await asyncio.to_thread(
+            _handle_intent, fast_response, session_id, sdata
+        )
+        return body, messages, provider_id, model_id, sdata, False
+
+    spent = validation["consumed"]
+    return None, messages, provider_id, model_id, sdata, spent
+
 
+async def _finish_chat(
+    session_id: str, raw_response: str, sdata: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Record the LLM's reply, then parse it and carry out its intent.
+
+    A reply that is not valid JSON still counts against the invitation; only
+    a failed LLM call is refunded.
+
+    Args:
+        session_id: The unique session identifier
+        raw_response: The full LLM response text
+        sdata: Session data for the session
+
+    Returns:
+        The chat response body
+    """
     # Append the assistant's response to conversation
     append_to_conversation(session_id, "assistant", raw_response)
 
     # --------------------------------------------------------
-    # 8) Use a request from the invitation code
-    # --------------------------------------------------------
-    remaining = invitation_store.use_request(invitation_code, session_id)
-    set_session_data(session_id, "remaining_requests", remaining)
-
-    # --------------------------------------------------------
-    # 9) Attempt to parse JSON
+    # 7) Attempt to parse JSON
     # --------------------------------------------------------
     try:
-        parsed_response = json.loads(raw_response)
-    except json.JSONDecodeError:
+        parsed_response = orjson.loads(raw_response)
+    except orjson.JSONDecodeError:
         parsed_response = {
             "intent": "unknown",
             "confirmation": "needs_clarification",
@@ -321,978 +576,1123 @@ When the user wants to log a parameter, you must use "param_key" and "param_valu
         }
         return {"assistant_response": parsed_response}
 
-    intent = parsed_response.get("intent", "")
-    confirmation = parsed_response.get("confirmation", "")
-    entities = parsed_response.get("entities", {})
+    # The intent handlers call MLflow synchronously; keep them off the event loop
+    return await asyncio.to_thread(_handle_intent, parsed_response, session_id, sdata)
 
-    # --------------------------------------------------------
-    # 10) Intent Handling
-    # --------------------------------------------------------
 
-    # --------------- create_experiment ---------------
-    if intent == "create_experiment" and confirmation == "confirmed":
-        experiment_name = entities.get("experiment_name")
-        if not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide an experiment name. For example: 'my_experiment'."
+def _handle_intent(
+    parsed_response: Dict[str, Any], session_id: str, sdata: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    Carry out the intent parsed from the LLM response.
+
+    Args:
+        parsed_response: The parsed LLM response
+        session_id: The unique session identifier
+        sdata: Session data for the session
+
+    Returns:
+        The chat response body
+    """
+    reply = ChatReply.from_dict(parsed_response)
+    handler = _INTENT_HANDLERS.get(reply.intent)
+    if handler and reply.confirmation == "confirmed":
+        handler(reply, reply.entities, session_id, sdata)
+
+    # Return the final response
+    return {"assistant_response": reply.to_dict()}
+
+
+def _handle_create_experiment(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Create an experiment."""
+    experiment_name = entities.get("experiment_name")
+    if not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide an experiment name. For example: 'my_experiment'."
+        )
+    else:
+        success, result = create_experiment(experiment_name)
+        if success:
+            reply.message = (
+                f"✅ Experiment '{experiment_name}' created with ID: {result}."
             )
         else:
-            success, result = create_experiment(experiment_name)
-            if success:
-                parsed_response["message"] = (
-                    f"✅ Experiment '{experiment_name}' created with ID: {result}."
-                )
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = f"❌ Failed to create experiment: {result}"
-
-    # --------------- create_experiment_and_start_run ---------------
-    elif intent == "create_experiment_and_start_run" and confirmation == "confirmed":
-        experiment_name = entities.get("experiment_name")
-        run_name = entities.get("run_name")
-        if not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide an experiment name so we can create it and start a run.\n"
-                "e.g. 'my_experiment'"
+            reply.confirmation = "needs_clarification"
+            reply.message = f"❌ Failed to create experiment: {result}"
+
+
+def _handle_create_experiment_and_start_run(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Create an experiment and start a run in it."""
+    experiment_name = entities.get("experiment_name")
+    run_name = entities.get("run_name")
+    if not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide an experiment name so we can create it and start a run.\n"
+            "e.g. 'my_experiment'"
+        )
+    else:
+        exp_success, exp_result = create_experiment(experiment_name)
+        if not exp_success:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"❌ Failed to create experiment: {exp_result}"
             )
         else:
-            exp_success, exp_result = create_experiment(experiment_name)
-            if not exp_success:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"❌ Failed to create experiment: {exp_result}"
+            experiment_id = exp_result
+            run_success, run_msg, run_id = create_run(experiment_id, run_name)
+            if run_success:
+                reply.message = (
+                    f"✅ Created experiment '{experiment_name}' (ID: {experiment_id}) "
+                    f"and started run (ID: {run_id})."
                 )
+                # Save the run ID in session_data
+                set_session_data(session_id, "current_run_id", run_id)
             else:
-                experiment_id = exp_result
-                run_success, run_msg, run_id = create_run(experiment_id, run_name)
-                if run_success:
-                    parsed_response["message"] = (
-                        f"✅ Created experiment '{experiment_name}' (ID: {experiment_id}) "
-                        f"and started run (ID: {run_id})."
-                    )
-                    # Save the run ID in session_data
-                    set_session_data(session_id, "current_run_id", run_id)
-                else:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = (
-                        f"❌ Created experiment but failed to start run: {run_msg}"
-                    )
-
-    # --------------- create_run ---------------
-    elif intent == "create_run" and confirmation == "confirmed":
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
-        run_name = entities.get("run_name")
-
-        if not experiment_id and not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "To create a run, please specify either an 'experiment_id' or an 'experiment_name'.\n"
-                "e.g. 'my_experiment'"
-            )
-        else:
-            if not experiment_id and experiment_name:
-                found_id = get_experiment_id_by_name(experiment_name)
-                if not found_id:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = (
-                        f"No experiment found named '{experiment_name}'. "
-                        f"Please create it first or provide an existing ID."
-                    )
-                else:
-                    experiment_id = found_id
-
-            if experiment_id:
-                run_success, run_msg, run_id = create_run(experiment_id, run_name)
-                if run_success:
-                    parsed_response["message"] = f"✅ {run_msg}"
-                    # Store the newly created run in session_data
-                    set_session_data(session_id, "current_run_id", run_id)
-                else:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = f"❌ Failed to create run: {run_msg}"
-
-    # --------------- delete_experiment ---------------
-    elif intent == "delete_experiment" and confirmation == "confirmed":
-        # The user can pass either an experiment_id or experiment_name in "entities".
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
-
-        if not experiment_id and not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "To delete an experiment, please specify 'experiment_id' or 'experiment_name'."
-            )
-        else:
-            # If user only provided a name, look up the ID
-            if not experiment_id and experiment_name:
-                found_id = get_experiment_id_by_name(experiment_name)
-                if not found_id:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = (
-                        f"No experiment found named '{experiment_name}'. "
-                        f"Please provide a valid experiment name/ID."
-                    )
-                else:
-                    experiment_id = found_id
+                reply.confirmation = "needs_clarification"
+                reply.message = (
+                    f"❌ Created experiment but failed to start run: {run_msg}"
+                )
 
-            if experiment_id:
-                del_success, del_msg = delete_experiment(experiment_id)
-                if del_success:
-                    parsed_response["message"] = f"✅ {del_msg}"
-                else:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = (
-                        f"❌ Failed to delete experiment: {del_msg}"
-                    )
 
-    # --------------- delete_run ---------------
-    elif intent == "delete_run" and confirmation == "confirmed":
-        # The user must pass a run_id.
-        run_id = entities.get("run_id")
+def _handle_create_run(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Start a run in an experiment given by ID or name."""
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+    run_name = entities.get("run_name")
+
+    if not experiment_id and not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "To create a run, please specify either an 'experiment_id' or an "
+            "'experiment_name'.\n"
+            "e.g. 'my_experiment'"
+        )
+    else:
+        if not experiment_id and experiment_name:
+            found_id = get_experiment_id_by_name(experiment_name)
+            if not found_id:
+                reply.confirmation = "needs_clarification"
+                reply.message = (
+                    f"No experiment found named '{experiment_name}'. "
+                    f"Please create it first or provide an existing ID."
+                )
+            else:
+                experiment_id = found_id
 
-        if not run_id:
-            # If the user didn't provide one, attempt the last known run
-            if "current_run_id" in sdata:
-                run_id = sdata["current_run_id"]
+        if experiment_id:
+            run_success, run_msg, run_id = create_run(experiment_id, run_name)
+            if run_success:
+                reply.message = f"✅ {run_msg}"
+                # Store the newly created run in session_data
+                set_session_data(session_id, "current_run_id", run_id)
             else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    "To delete a run, please provide a run_id, e.g. 'abc123'."
+                reply.confirmation = "needs_clarification"
+                reply.message = f"❌ Failed to create run: {run_msg}"
+
+
+def _handle_delete_experiment(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Delete an experiment given by ID or name."""
+    # The user can pass either an experiment_id or experiment_name in "entities".
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+
+    if not experiment_id and not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "To delete an experiment, please specify 'experiment_id' or "
+            "'experiment_name'."
+        )
+    else:
+        # If user only provided a name, look up the ID
+        if not experiment_id and experiment_name:
+            found_id = get_experiment_id_by_name(experiment_name)
+            if not found_id:
+                reply.confirmation = "needs_clarification"
+                reply.message = (
+                    f"No experiment found named '{experiment_name}'. "
+                    f"Please provide a valid experiment name/ID."
                 )
-                return {"assistant_response": parsed_response}
+            else:
+                experiment_id = found_id
 
-        del_success, del_msg = delete_run(run_id)
-        if del_success:
-            parsed_response["message"] = f"✅ {del_msg}"
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ Failed to delete run: {del_msg}"
-
-    # --------------- log_param ---------------
-    elif intent == "log_param" and confirmation == "confirmed":
-        run_id = entities.get("run_id")
-        param_key = entities.get("param_key")
-        param_value = entities.get("param_value")
-
-        # Auto-fill run_id from session_data if not provided
-        if not run_id:
-            if "current_run_id" in sdata:
-                run_id = sdata["current_run_id"]
-                print(f"[DEBUG] Using stored run_id: {run_id}")
+        if experiment_id:
+            del_success, del_msg = delete_experiment(experiment_id)
+            if del_success:
+                reply.message = f"✅ {del_msg}"
             else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    "We need a 'run_id' to log this param, and none is stored. "
-                    "Please provide an actual run_id."
+                reply.confirmation = "needs_clarification"
+                reply.message = (
+                    f"❌ Failed to delete experiment: {del_msg}"
                 )
-                return {"assistant_response": parsed_response}
-
-        if not param_key:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = "We need the parameter key (e.g. 'alpha')."
-        elif param_value is None:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = "We need the parameter value (e.g. '0.1')."
+
+
+def _handle_delete_run(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Delete a run, defaulting to the session's current run."""
+    # The user must pass a run_id.
+    run_id = entities.get("run_id")
+
+    if not run_id:
+        # If the user didn't provide one, attempt the last known run
+        if "current_run_id" in sdata:
+            run_id = sdata["current_run_id"]
+        else:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                "To delete a run, please provide a run_id, e.g. 'abc123'."
+            )
+            return
+
+    del_success, del_msg = delete_run(run_id)
+    if del_success:
+        reply.message = f"✅ {del_msg}"
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ Failed to delete run: {del_msg}"
+
+
+def _handle_log_param(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Log a parameter, defaulting to the session's current run."""
+    run_id = entities.get("run_id")
+    param_key = entities.get("param_key")
+    param_value = entities.get("param_value")
+
+    # Auto-fill run_id from session_data if not provided
+    if not run_id:
+        if "current_run_id" in sdata:
+            run_id = sdata["current_run_id"]
+            logger.debug("Using stored run_id: %s", run_id)
+        else:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                "We need a 'run_id' to log this param, and none is stored. "
+                "Please provide an actual run_id."
+            )
+            return
+
+    if not param_key:
+        reply.confirmation = "needs_clarification"
+        reply.message = "We need the parameter key (e.g. 'alpha')."
+    elif param_value is None:
+        reply.confirmation = "needs_clarification"
+        reply.message = "We need the parameter value (e.g. '0.1')."
+    else:
+        success, msg = log_param(run_id, param_key, str(param_value))
+        if success:
+            reply.message = f"✅ {msg}"
         else:
-            success, msg = log_param(run_id, param_key, str(param_value))
+            reply.confirmation = "needs_clarification"
+            reply.message = f"❌ {msg}"
+
+
+def _handle_log_metric(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Log a metric, defaulting to the session's current run."""
+    run_id = entities.get("run_id")
+
+    # Accept "metric_key", "metric_name", or "key" for the metric name
+    metric_key = (
+        entities.get("metric_key")
+        or entities.get("metric_name")
+        or entities.get("key")
+    )
+    # Accept "metric_value" or "value"
+    metric_value = entities.get("metric_value", entities.get("value"))
+    step = entities.get("step", 0)
+
+    # Auto-fill run_id if user didn't provide it
+    if not run_id:
+        if "current_run_id" in sdata:
+            run_id = sdata["current_run_id"]
+            logger.debug("Using stored run_id: %s", run_id)
+        else:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                "We need a 'run_id' to log the metric, and none is stored. "
+                "Please provide an actual run_id."
+            )
+            return
+
+    if not metric_key:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "We need the metric name/key (e.g. 'accuracy')."
+        )
+    elif metric_value is None:
+        reply.confirmation = "needs_clarification"
+        reply.message = "We need a metric value (e.g. '0.95')."
+    else:
+        try:
+            value_float = float(metric_value)
+        except ValueError:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"The provided metric value '{metric_value}' isn't a number."
+            )
+        else:
+            success, msg = log_metric(run_id, metric_key, value_float, step)
             if success:
-                parsed_response["message"] = f"✅ {msg}"
+                reply.message = f"✅ {msg}"
             else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = f"❌ {msg}"
-
-    # --------------- log_metric ---------------
-    elif intent == "log_metric" and confirmation == "confirmed":
-        run_id = entities.get("run_id")
-
-        # Accept "metric_key", "metric_name", or "key" for the metric name
-        metric_key = (
-            entities.get("metric_key")
-            or entities.get("metric_name")
-            or entities.get("key")
+                reply.confirmation = "needs_clarification"
+                reply.message = f"❌ {msg}"
+
+
+def _handle_get_experiment_details(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Describe an experiment given by ID or name."""
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+
+    logger.debug(
+        "Processing get_experiment_details intent with entities: %s", entities
+    )
+
+    # Handle case where no identifier is provided
+    if not experiment_id and not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide an experiment name or ID to get details."
         )
-        # Accept "metric_value" or "value"
-        metric_value = entities.get("metric_value", entities.get("value"))
-        step = entities.get("step", 0)
-
-        # Auto-fill run_id if user didn't provide it
-        if not run_id:
-            if "current_run_id" in sdata:
-                run_id = sdata["current_run_id"]
-                print(f"[DEBUG] Using stored run_id: {run_id}")
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    "We need a 'run_id' to log the metric, and none is stored. "
-                    "Please provide an actual run_id."
-                )
-                return {"assistant_response": parsed_response}
+        return
 
-        if not metric_key:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "We need the metric name/key (e.g. 'accuracy')."
-            )
-        elif metric_value is None:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = "We need a metric value (e.g. '0.95')."
+    # Try name-based lookup first if provided
+    if experiment_name:
+        logger.debug("Looking up experiment ID for name: '%s'", experiment_name)
+        success, msg, found_id, experiments = resolve_experiment_by_name(
+            experiment_name
+        )
+
+        if found_id:
+            logger.debug("Resolved name '%s' to ID: %s", experiment_name, found_id)
+            experiment_id = found_id
         else:
-            try:
-                value_float = float(metric_value)
-            except ValueError:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"The provided metric value '{metric_value}' isn't a number."
+            # The lookup already listed the experiments that do exist
+            reply.confirmation = "needs_clarification"
+            if not success:
+                reply.message = f"❌ {msg}"
+            elif experiments:
+                # Show first few experiment names
+                exp_list = ", ".join(
+                    f"'{exp.get('name')}'" for exp in islice(experiments, 5)
+                )
+                if len(experiments) > 5:
+                    exp_list += f", and {len(experiments) - 5} more"
+                reply.message = (
+                    f"❌ Experiment '{experiment_name}' not found. "
+                    f"Available experiments include: {exp_list}"
                 )
             else:
-                success, msg = log_metric(run_id, metric_key, value_float, step)
-                if success:
-                    parsed_response["message"] = f"✅ {msg}"
-                else:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = f"❌ {msg}"
+                reply.message = "❌ No experiments found in MLflow."
+            return
+
+    # At this point, we should have an experiment_id
+    if not experiment_id:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "❌ Could not determine experiment ID from the provided information."
+        )
+        return
+
+    # Get the details using the ID
+    logger.debug("Getting details for experiment ID: %s", experiment_id)
+    success, msg, exp_details = get_experiment_by_id(experiment_id)
+
+    if success and exp_details:
+        name = exp_details.get("name", "Unknown")
+        lifecycle_stage = exp_details.get("lifecycle_stage", "Unknown")
+        artifact_location = exp_details.get("artifact_location", "Unknown")
+
+        # Get creation time if available
+        creation_time = exp_details.get("creation_time")
+        time_str = "Unknown"
+        if creation_time:
+            time_str = _format_timestamp(creation_time)
+
+        # Get run count for this experiment; pages through the runs instead
+        # of downloading all of them at once
+        run_success, _, run_count = count_runs(experiment_id)
+        if not run_success:
+            run_count = "Unknown"
+
+        # Format the experiment details
+        reply.message = (
+            f"📋 Experiment Details: {name}\n\n"
+            f"• ID: {experiment_id}\n"
+            f"• Created: {time_str}\n"
+            f"• Status: {lifecycle_stage}\n"
+            f"• Artifact Location: {artifact_location}\n"
+            f"• Total Runs: {run_count}"
+        )
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ Error getting experiment details: {msg}"
+
+
+def _format_run_line(i: int, run: Dict[str, Any]) -> str:
+    """Format one run as a numbered line of a run listing."""
+    run_info = run.get("info") or _EMPTY
+    run_id = run_info.get("run_id", "Unknown")
+    run_name = run_info.get("run_name", "Unnamed run")
+    status = run_info.get("status", "Unknown")
+
+    # Get start time
+    start_time = run_info.get("start_time")
+    time_str = ""
+    if start_time:
+        time_str = f", Started: {_format_timestamp(start_time)}"
+
+    # Get metrics if available
+    metrics = (run.get("data") or _EMPTY).get("metrics") or _EMPTY
+    metrics_str = ""
+    if metrics:
+        # Format top 3 metrics, noting how many more there are
+        top_metrics = ", ".join(
+            f"{k}: {v}" for k, v in islice(metrics.items(), 3)
+        )
+        more = len(metrics) - 3
+        more_str = f" and {more} more" if more > 0 else ""
+        metrics_str = f", Metrics: {top_metrics}{more_str}"
 
-        # --------------- get_experiment_details ---------------
-    elif intent == "get_experiment_details" and confirmation == "confirmed":
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
+    return (
+        f"{i}. {run_name} (ID: {_short_id(run_id)}, "
+        f"Status: {status}{time_str}{metrics_str})"
+    )
 
-        print(
-            f"[DEBUG] Processing get_experiment_details intent with entities: {entities}"
-        )
 
-        # Handle case where no identifier is provided
-        if not experiment_id and not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide an experiment name or ID to get details."
+def _handle_list_runs(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List the runs in an experiment."""
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+
+    if not experiment_id and not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide either an experiment ID or name to list runs for."
+        )
+        return
+
+    # Resolve experiment ID if only name provided
+    if not experiment_id and experiment_name:
+        found_id = get_experiment_id_by_name(experiment_name)
+        if not found_id:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"No experiment found named '{experiment_name}'."
             )
-            return {"assistant_response": parsed_response}
+            return
+        experiment_id = found_id
 
-        # Try name-based lookup first if provided
-        if experiment_name:
-            print(f"[DEBUG] Looking up experiment ID for name: '{experiment_name}'")
-            found_id = get_experiment_id_by_name(experiment_name)
+    # The experiment name is only needed for context; fetch it alongside the runs
+    name_future = _mlflow_pool.submit(get_experiment_name, experiment_id)
+    success, msg, runs = list_runs(experiment_id)
 
-            if found_id:
-                print(f"[DEBUG] Resolved name '{experiment_name}' to ID: {found_id}")
-                experiment_id = found_id
-            else:
-                print(
-                    f"[DEBUG] Failed to find experiment with name: '{experiment_name}'"
-                )
+    if success and runs:
+        # Get experiment name for context
+        exp_name = name_future.result() or "Unknown"
 
-                # Try to list available experiments to help the user
-                try:
-                    list_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/list"
-                    list_res = requests.get(list_url, timeout=10)
-
-                    if list_res.ok:
-                        experiments = list_res.json().get("experiments", [])
-                        if experiments:
-                            # Show first few experiment names
-                            exp_names = [
-                                f"'{exp.get('name')}'" for exp in experiments[:5]
-                            ]
-                            exp_list = ", ".join(exp_names)
-
-                            if len(experiments) > 5:
-                                exp_list += f", and {len(experiments) - 5} more"
-
-                            parsed_response["confirmation"] = "needs_clarification"
-                            parsed_response["message"] = (
-                                f"❌ Experiment '{experiment_name}' not found. Available experiments include: {exp_list}"
-                            )
-                        else:
-                            parsed_response["confirmation"] = "needs_clarification"
-                            parsed_response["message"] = (
-                                "❌ No experiments found in MLflow."
-                            )
-                    else:
-                        parsed_response["confirmation"] = "needs_clarification"
-                        parsed_response["message"] = (
-                            f"❌ Failed to list available experiments. Status: {list_res.status_code}"
-                        )
-                except Exception as e:
-                    parsed_response["confirmation"] = "needs_clarification"
-                    parsed_response["message"] = (
-                        f"❌ Error listing experiments: {str(e)}"
-                    )
+        # Format up to 20 runs, one per line
+        formatted_list = "\n".join(
+            _format_run_line(i, run) for i, run in enumerate(islice(runs, 20), 1)
+        )
 
-                return {"assistant_response": parsed_response}
+        # Add a note if there are more runs
+        if len(runs) > 20:
+            formatted_list += f"\n\n...and {len(runs) - 20} more runs."
 
-        # At this point, we should have an experiment_id
-        if not experiment_id:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "❌ Could not determine experiment ID from the provided information."
-            )
-            return {"assistant_response": parsed_response}
-
-        # Get the details using the ID
-        print(f"[DEBUG] Getting details for experiment ID: {experiment_id}")
-        success, msg, exp_details = get_experiment_by_id(experiment_id)
-
-        if success and exp_details:
-            name = exp_details.get("name", "Unknown")
-            lifecycle_stage = exp_details.get("lifecycle_stage", "Unknown")
-            artifact_location = exp_details.get("artifact_location", "Unknown")
-
-            # Get creation time if available
-            creation_time = exp_details.get("creation_time")
-            time_str = "Unknown"
-            if creation_time:
-                time_str = time.strftime(
-                    "%Y-%m-%d %H:%M:%S", time.localtime(int(creation_time) / 1000)
-                )
+        reply.message = (
+            f"📋 Found {len(runs)} runs for experiment '{exp_name}':\n\n"
+            f"{formatted_list}"
+        )
+    elif success:
+        reply.message = (
+            f"No runs found for experiment ID {experiment_id}."
+        )
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
+
+
+def _format_experiment_line(i: int, exp: Dict[str, Any]) -> str:
+    """Format one experiment as a numbered line of an experiment listing."""
+    name = exp.get("name", "Unnamed")
+    exp_id = exp.get("experiment_id", "Unknown")
+
+    # Get creation time if available (might not be in all MLflow versions)
+    creation_time = exp.get("creation_time")
+    time_str = ""
+    if creation_time:
+        time_str = f", Created: {_format_date(creation_time)}"
+
+    # Get lifecycle stage
+    lifecycle = exp.get("lifecycle_stage", "Unknown")
+
+    return f"{i}. {name} (ID: {exp_id}{time_str}, Status: {lifecycle})"
+
+
+def _handle_list_experiments(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List all experiments."""
+    success, msg, experiments = list_experiments()
+
+    if success and experiments:
+        # Format up to 20 experiments, one per line
+        formatted_list = "\n".join(
+            _format_experiment_line(i, exp)
+            for i, exp in enumerate(islice(experiments, 20), 1)
+        )
 
-            # Get run count for this experiment
-            run_success, _, runs = list_runs(experiment_id)
-            run_count = len(runs) if run_success else "Unknown"
-
-            # Format the experiment details
-            parsed_response["message"] = (
-                f"📋 Experiment Details: {name}\n\n"
-                f"• ID: {experiment_id}\n"
-                f"• Created: {time_str}\n"
-                f"• Status: {lifecycle_stage}\n"
-                f"• Artifact Location: {artifact_location}\n"
-                f"• Total Runs: {run_count}"
-            )
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ Error getting experiment details: {msg}"
-
-    # --------------- list_runs ---------------
-    elif intent == "list_runs" and confirmation == "confirmed":
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
-
-        if not experiment_id and not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide either an experiment ID or name to list runs for."
+        # Add a note if there are more experiments
+        if len(experiments) > 20:
+            formatted_list += (
+                f"\n\n...and {len(experiments) - 20} more experiments."
             )
-            return {"assistant_response": parsed_response}
 
-        # Resolve experiment ID if only name provided
-        if not experiment_id and experiment_name:
-            found_id = get_experiment_id_by_name(experiment_name)
-            if not found_id:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"No experiment found named '{experiment_name}'."
-                )
-                return {"assistant_response": parsed_response}
-            experiment_id = found_id
+        reply.message = (
+            f"📋 Found {len(experiments)} experiments:\n\n{formatted_list}"
+        )
+    elif success:
+        reply.message = "No experiments found in MLflow."
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
+
+
+def _handle_get_mlflow_summary(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Summarize experiment, model and run counts."""
+    summary = get_mlflow_summary_stats()
+
+    if "error" in summary:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            f"❌ Error retrieving MLflow summary: {summary['error']}"
+        )
+    else:
+        # Format a nice summary message
+        reply.message = (
+            f"📊 MLflow Summary Statistics:\n\n"
+            f"• Total Experiments: {summary['experiment_count']}\n"
+            f"• Registered Models: {summary['registered_model_count']}\n"
+            f"• Total Runs: {summary['total_runs']}\n"
+            f"• Active Runs: {summary['active_runs']}\n"
+            # The summary timestamp is in seconds, MLflow's are milliseconds
+            f"• Data as of: {_format_timestamp(summary['timestamp'] * 1000)}"
+        )
 
-        success, msg, runs = list_runs(experiment_id)
 
-        if success and runs:
-            # Get experiment name for context
-            exp_name = "Unknown"
-            exp_success, _, exp_details = get_experiment_by_id(experiment_id)
-            if exp_success:
-                exp_name = exp_details.get("name", "Unknown")
-
-            # Prepare a formatted list of runs
-            run_list = []
-            for i, run in enumerate(runs[:20], 1):  # Show up to 20 runs
-                run_info = run.get("info", {})
-                run_id = run_info.get("run_id", "Unknown")
-                run_name = run_info.get("run_name", "Unnamed run")
-                status = run_info.get("status", "Unknown")
-
-                # Get start time
-                start_time = run_info.get("start_time")
-                time_str = ""
-                if start_time:
-                    time_str = f", Started: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(int(start_time) / 1000))}"
-
-                # Get metrics if available
-                metrics = run.get("data", {}).get("metrics", {})
-                metrics_str = ""
-                if metrics:
-                    # Format top 3 metrics
-                    top_metrics = list(metrics.items())[:3]
-                    metrics_str = ", ".join([f"{k}: {v}" for k, v in top_metrics])
-                    metrics_str = f", Metrics: {metrics_str}"
-
-                    # Indicate if there are more metrics
-                    if len(metrics) > 3:
-                        metrics_str += f" and {len(metrics) - 3} more"
-
-                # Format the run info
-                run_list.append(
-                    f"{i}. {run_name} (ID: {run_id[:8]}...{run_id[-4:]}, Status: {status}{time_str}{metrics_str})"
+def _handle_get_model_versions(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List the versions of a registered model."""
+    model_name = entities.get("model_name")
+
+    # If there's no model_name but there's a message that appears to be an
+    # informational response
+    if (
+        not model_name
+        and len(reply.message) > 20
+    ):
+        # This is likely a general information response, just pass it through
+        # (The message length check helps distinguish between actual answers and
+        # placeholder messages)
+        logger.debug(
+            "Passing through informational response: %.50s...",
+            reply.message,
+        )
+        # No modifications needed to the reply, just use the LLM's message
+    elif not model_name:
+        # No model name and no informational message, ask for clarification
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide a model name to get versions for."
+        )
+    else:
+        # Normal flow when a model name is provided
+        success, msg, versions = get_model_versions(model_name)
+
+        if success and versions:
+            # Format model versions into readable output
+            version_entries: List[str] = []
+            for v in versions:
+                version_num = v.get("version", "Unknown")
+                status = v.get("current_stage", "Unknown")
+                user = v.get("user_id", "Unknown")
+                created = _format_timestamp(v.get("creation_timestamp", 0))
+                run_id = v.get("run_id", "Unknown")
+
+                version_entries.append(
+                    f"• Version {version_num} (Status: {status})\n"
+                    f"  - Created by: {user}\n"
+                    f"  - Created on: {created}\n"
+                    f"  - Run ID: {run_id}\n"
                 )
+            versions_text = "".join(version_entries)
 
-            # Join the run list with newlines
-            formatted_list = "\n".join(run_list)
-
-            # Add a note if there are more runs
-            if len(runs) > 20:
-                formatted_list += f"\n\n...and {len(runs) - 20} more runs."
-
-            parsed_response["message"] = (
-                f"📋 Found {len(runs)} runs for experiment '{exp_name}':\n\n{formatted_list}"
+            reply.message = (
+                f"📋 Versions for model '{model_name}':\n\n{versions_text}"
             )
         elif success:
-            parsed_response["message"] = (
-                f"No runs found for experiment ID {experiment_id}."
+            reply.message = (
+                f"No versions found for model '{model_name}'."
             )
         else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
-
-    # --------------- list_experiments ---------------
-    elif intent == "list_experiments" and confirmation == "confirmed":
-        success, msg, experiments = list_experiments()
-
-        if success and experiments:
-            # Prepare a formatted list of experiments
-            exp_list = []
-            for i, exp in enumerate(experiments[:20], 1):  # Show up to 20 experiments
-                name = exp.get("name", "Unnamed")
-                exp_id = exp.get("experiment_id", "Unknown")
-
-                # Get creation time if available (might not be in all MLflow versions)
-                creation_time = exp.get("creation_time")
-                time_str = ""
-                if creation_time:
-                    time_str = f", Created: {time.strftime('%Y-%m-%d', time.localtime(int(creation_time) / 1000))}"
-
-                # Get lifecycle stage
-                lifecycle = exp.get("lifecycle_stage", "Unknown")
-
-                # Format the experiment info
-                exp_list.append(
-                    f"{i}. {name} (ID: {exp_id}{time_str}, Status: {lifecycle})"
-                )
-
-            # Join the experiment list with newlines
-            formatted_list = "\n".join(exp_list)
-
-            # Add a note if there are more experiments
-            if len(experiments) > 20:
-                formatted_list += (
-                    f"\n\n...and {len(experiments) - 20} more experiments."
-                )
-
-            parsed_response["message"] = (
-                f"📋 Found {len(experiments)} experiments:\n\n{formatted_list}"
+            reply.confirmation = "needs_clarification"
+            reply.message = f"❌ {msg}"
+
+
+def _handle_get_model_details(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Describe a registered model version."""
+    model_name = entities.get("model_name")
+    version = entities.get("version")
+
+    if not model_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide a model name to get details for."
+        )
+    else:
+        success, msg, details = get_model_details(model_name, version)
+
+        if success and details:
+            version_num = details.get("version", "Unknown")
+            status = details.get("current_stage", "Unknown")
+            user = details.get("user_id", "Unknown")
+            created = _format_timestamp(details.get("creation_timestamp", 0))
+            run_id = details.get("run_id", "Unknown")
+            source = details.get("source", "Unknown")
+
+            # Get experiment name for this run
+            exp_id = (
+                (details.get("run") or _EMPTY).get("info") or _EMPTY
+            ).get("experiment_id", "Unknown")
+            exp_name = "Unknown"
+            if exp_id != "Unknown":
+                exp_name = get_experiment_name(exp_id) or "Unknown"
+
+            reply.message = (
+                f"📦 Model: {model_name} (Version {version_num})\n\n"
+                f"• Status: {status}\n"
+                f"• Created by: {user}\n"
+                f"• Created on: {created}\n"
+                f"• Run ID: {run_id}\n"
+                f"• Experiment: {exp_name}\n"
+                f"• Artifact Location: {source}\n"
             )
         elif success:
-            parsed_response["message"] = "No experiments found in MLflow."
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
-
-        # --------------- get_mlflow_summary ---------------
-    elif intent == "get_mlflow_summary" and confirmation == "confirmed":
-        summary = get_mlflow_summary_stats()
-
-        if "error" in summary:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                f"❌ Error retrieving MLflow summary: {summary['error']}"
+            reply.message = (
+                f"No details found for model '{model_name}'."
             )
         else:
-            # Format a nice summary message
-            parsed_response["message"] = (
-                f"📊 MLflow Summary Statistics:\n\n"
-                f"• Total Experiments: {summary['experiment_count']}\n"
-                f"• Registered Models: {summary['registered_model_count']}\n"
-                f"• Total Runs: {summary['total_runs']}\n"
-                f"• Active Runs: {summary['active_runs']}\n"
-                f"• Data as of: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(summary['timestamp']))}"
-            )
+            reply.confirmation = "needs_clarification"
+            reply.message = f"❌ {msg}"
 
-    # --------------- get_model_versions ---------------
-    elif intent == "get_model_versions" and confirmation == "confirmed":
-        model_name = entities.get("model_name")
-
-        # If there's no model_name but there's a message that appears to be an informational response
-        if (
-            not model_name
-            and "message" in parsed_response
-            and len(parsed_response["message"]) > 20
-        ):
-            # This is likely a general information response, just pass it through
-            # (The message length check helps distinguish between actual answers and placeholder messages)
-            print(
-                f"[DEBUG] Passing through informational response: {parsed_response['message'][:50]}..."
-            )
-            # No modifications needed to parsed_response, just use the LLM's message
-        elif not model_name:
-            # No model name and no informational message, ask for clarification
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide a model name to get versions for."
-            )
-        else:
-            # Normal flow when a model name is provided
-            success, msg, versions = get_model_versions(model_name)
-
-            if success and versions:
-                # Format model versions into readable output
-                versions_text = ""
-                for v in versions:
-                    version_num = v.get("version", "Unknown")
-                    status = v.get("current_stage", "Unknown")
-                    user = v.get("user_id", "Unknown")
-                    created = time.strftime(
-                        "%Y-%m-%d %H:%M:%S",
-                        time.localtime(int(v.get("creation_timestamp", 0) / 1000)),
-                    )
-                    run_id = v.get("run_id", "Unknown")
 
-                    versions_text += (
-                        f"• Version {version_num} (Status: {status})\n"
-                        f"  - Created by: {user}\n"
-                        f"  - Created on: {created}\n"
-                        f"  - Run ID: {run_id}\n"
-                    )
+def _model_versions(models: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    """
+    Get the versions to summarize for each registered model.
 
-                parsed_response["message"] = (
-                    f"📋 Versions for model '{model_name}':\n\n{versions_text}"
-                )
-            elif success:
-                parsed_response["message"] = (
-                    f"No versions found for model '{model_name}'."
-                )
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = f"❌ {msg}"
-
-    # --------------- get_model_details ---------------
-    elif intent == "get_model_details" and confirmation == "confirmed":
-        model_name = entities.get("model_name")
-        version = entities.get("version")
-
-        if not model_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide a model name to get details for."
-            )
-        else:
-            success, msg, details = get_model_details(model_name, version)
-
-            if success and details:
-                version_num = details.get("version", "Unknown")
-                status = details.get("current_stage", "Unknown")
-                user = details.get("user_id", "Unknown")
-                created = time.strftime(
-                    "%Y-%m-%d %H:%M:%S",
-                    time.localtime(int(details.get("creation_timestamp", 0) / 1000)),
-                )
-                run_id = details.get("run_id", "Unknown")
-                source = details.get("source", "Unknown")
-
-                # Get experiment name for this run
-                exp_id = (
-                    details.get("run", {})
-                    .get("info", {})
-                    .get("experiment_id", "Unknown")
-                )
-                exp_name = "Unknown"
-                if exp_id != "Unknown":
-                    exp_success, _, exp_details = get_experiment_by_id(exp_id)
-                    if exp_success:
-                        exp_name = exp_details.get("name", "Unknown")
-
-                parsed_response["message"] = (
-                    f"📦 Model: {model_name} (Version {version_num})\n\n"
-                    f"• Status: {status}\n"
-                    f"• Created by: {user}\n"
-                    f"• Created on: {created}\n"
-                    f"• Run ID: {run_id}\n"
-                    f"• Experiment: {exp_name}\n"
-                    f"• Artifact Location: {source}\n"
-                )
-            elif success:
-                parsed_response["message"] = (
-                    f"No details found for model '{model_name}'."
-                )
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = f"❌ {msg}"
+    Registered models already carry their newest version in each stage
+    (`latest_versions`), which is enough for the latest version number and
+    the set of stages, so no per-model request is needed. Models without it
+    (the field is omitted when empty) are looked up concurrently.
 
-    # --------------- get_recent_models ---------------
-    elif intent == "get_recent_models" and confirmation == "confirmed":
-        limit = entities.get("limit", 5)
+    Args:
+        models: Registered models as returned by MLflow
 
-        # Validate limit is reasonable
-        try:
-            limit = int(limit)
-            if limit <= 0:
-                limit = 5
-        except (ValueError, TypeError):
-            limit = 5
+    Returns:
+        One list of versions per model, in the same order
+    """
+    versions = [model.get("latest_versions") for model in models]
+    missing = [i for i, found in enumerate(versions) if found is None]
+    lookups = _mlflow_pool.map(
+        get_model_versions, [models[i].get("name", "") for i in missing]
+    )
+    for i, (success, _, found) in zip(missing, lookups, strict=True):
+        versions[i] = found if success else []
+    return versions
 
-        success, msg, recent_models = get_recently_updated_models(limit)
 
-        if success and recent_models:
-            models_text = ""
-            for i, model in enumerate(recent_models, 1):
-                name = model.get("name", "Unknown")
-                last_updated = time.strftime(
-                    "%Y-%m-%d %H:%M:%S",
-                    time.localtime(int(model.get("last_updated_timestamp", 0) / 1000)),
-                )
+def _latest_version(versions: List[Dict[str, Any]]) -> str:
+    """Return the highest version number among `versions`, or "Unknown"."""
+    if not versions:
+        return "Unknown"
+    latest = max(versions, key=lambda v: int(v.get("version", 0)))
+    return latest.get("version", "Unknown")
 
-                # Get latest version
-                version_success, _, versions = get_model_versions(name)
-                latest_version = "Unknown"
-                if version_success and versions:
-                    sorted_versions = sorted(
-                        versions, key=lambda v: int(v.get("version", 0)), reverse=True
-                    )
-                    if sorted_versions:
-                        latest_version = sorted_versions[0].get("version", "Unknown")
 
-                models_text += (
-                    f"{i}. {name}\n"
-                    f"   • Last Updated: {last_updated}\n"
-                    f"   • Latest Version: {latest_version}\n"
-                )
+def _handle_get_recent_models(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List the most recently updated registered models."""
+    limit = entities.get("limit", 5)
 
-            parsed_response["message"] = (
-                f"🔄 Top {len(recent_models)} Recently Updated Models:\n\n{models_text}"
+    # Validate limit is reasonable
+    try:
+        limit = int(limit)
+        if limit <= 0:
+            limit = 5
+    except (ValueError, TypeError):
+        limit = 5
+
+    success, msg, recent_models = get_recently_updated_models(limit)
+
+    if success and recent_models:
+        model_entries: List[str] = []
+        all_versions = _model_versions(recent_models)
+        model_pairs = zip(recent_models, all_versions, strict=True)
+        for i, (model, versions) in enumerate(model_pairs, 1):
+            name = model.get("name", "Unknown")
+            last_updated = _format_timestamp(model.get("last_updated_timestamp", 0))
+            latest_version = _latest_version(versions)
+
+            model_entries.append(
+                f"{i}. {name}\n"
+                f"   • Last Updated: {last_updated}\n"
+                f"   • Latest Version: {latest_version}\n"
             )
-        elif success:
-            parsed_response["message"] = "No registered models found in MLflow."
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
-
-    # --------------- batch_create_experiments ---------------
-    elif intent == "batch_create_experiments" and confirmation == "confirmed":
-        experiment_names = entities.get("experiment_names", [])
-
-        if (
-            not experiment_names
-            or not isinstance(experiment_names, list)
-            or len(experiment_names) == 0
-        ):
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide a list of experiment names to create."
+        models_text = "".join(model_entries)
+
+        reply.message = (
+            f"🔄 Top {len(recent_models)} Recently Updated Models:\n\n{models_text}"
+        )
+    elif success:
+        reply.message = "No registered models found in MLflow."
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
+
+
+def _handle_batch_create_experiments(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Create several experiments at once."""
+    experiment_names = entities.get("experiment_names", [])
+
+    if (
+        not experiment_names
+        or not isinstance(experiment_names, list)
+        or len(experiment_names) == 0
+    ):
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide a list of experiment names to create."
+        )
+    else:
+        results = batch_create_experiments(experiment_names)
+
+        # Count successful creations
+        successful = sum(1 for r in results if r["success"])
+
+        if successful == len(experiment_names):
+            exp_ids = [r["result"] for r in results if r["success"]]
+            exp_list = "\n".join(
+                [
+                    f"• {name} (ID: {id})"
+                    for name, id in zip(experiment_names, exp_ids)
+                ]
             )
+            reply.message = (
+                f"✅ Successfully created all {len(experiment_names)} experiments:"
+                f"\n\n{exp_list}"
+            )
+            # Store the experiment IDs for reference
+            set_session_data(session_id, "batch_experiment_ids", exp_ids)
+        elif successful > 0:
+            # Create a list of successful and failed creations
+            success_list = []
+            failed_list = []
+
+            for result in results:
+                name = result["experiment_name"]
+                if result["success"]:
+                    success_list.append(f"• {name} (ID: {result['result']})")
+                else:
+                    failed_list.append(f"• {name} (Error: {result['result']})")
+
+            reply.message = "\n".join((
+                f"⚠️ Created {successful} out of {len(experiment_names)} experiments.",
+                "",
+                "Successful:",
+                *success_list,
+                "",
+                "Failed:",
+                *failed_list,
+            ))
         else:
-            results = batch_create_experiments(experiment_names)
-
-            # Count successful creations
-            successful = sum(1 for r in results if r["success"])
-
-            if successful == len(experiment_names):
-                exp_ids = [r["result"] for r in results if r["success"]]
-                exp_list = "\n".join(
-                    [
-                        f"• {name} (ID: {id})"
-                        for name, id in zip(experiment_names, exp_ids)
-                    ]
-                )
-                parsed_response["message"] = (
-                    f"✅ Successfully created all {len(experiment_names)} experiments:\n\n{exp_list}"
-                )
-                # Store the experiment IDs for reference
-                set_session_data(session_id, "batch_experiment_ids", exp_ids)
-            elif successful > 0:
-                # Create a list of successful and failed creations
-                success_list = []
-                failed_list = []
-
-                for result in results:
-                    name = result["experiment_name"]
-                    if result["success"]:
-                        success_list.append(f"• {name} (ID: {result['result']})")
-                    else:
-                        failed_list.append(f"• {name} (Error: {result['result']})")
-
-                success_text = "\n".join(success_list)
-                failed_text = "\n".join(failed_list)
-
-                parsed_response["message"] = (
-                    f"⚠️ Created {successful} out of {len(experiment_names)} experiments.\n\n"
-                    f"Successful:\n{success_text}\n\n"
-                    f"Failed:\n{failed_text}"
-                )
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = "❌ Failed to create any experiments."
-
-    # --------------- get_models_with_artifacts ---------------
-    elif intent == "get_models_with_artifacts" and confirmation == "confirmed":
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
-
-        if not experiment_id and not experiment_name:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide either an experiment ID or name to find models."
+            reply.confirmation = "needs_clarification"
+            reply.message = "❌ Failed to create any experiments."
+
+
+def _handle_get_models_with_artifacts(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List the runs in an experiment that logged a model."""
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+
+    if not experiment_id and not experiment_name:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide either an experiment ID or name to find models."
+        )
+        return
+
+    # Resolve experiment ID if only name provided
+    if not experiment_id and experiment_name:
+        found_id = get_experiment_id_by_name(experiment_name)
+        if not found_id:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"No experiment found named '{experiment_name}'."
             )
-            return {"assistant_response": parsed_response}
-
-        # Resolve experiment ID if only name provided
-        if not experiment_id and experiment_name:
-            found_id = get_experiment_id_by_name(experiment_name)
-            if not found_id:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"No experiment found named '{experiment_name}'."
-                )
-                return {"assistant_response": parsed_response}
-            experiment_id = found_id
-
-        success, msg, runs = get_runs_with_model_info(experiment_id)
-
-        if success:
-            # Filter runs with models
-            runs_with_models = [
-                r for r in runs if r.get("model_info", {}).get("has_model", False)
-            ]
-
-            if runs_with_models:
-                runs_text = ""
-                for i, run in enumerate(runs_with_models[:10], 1):
-                    run_info = run.get("info", {})
-                    run_id = run_info.get("run_id", "Unknown")
-                    run_name = run_info.get("run_name", "Unnamed run")
-                    status = run_info.get("status", "Unknown")
-                    start_time = time.strftime(
-                        "%Y-%m-%d %H:%M:%S",
-                        time.localtime(int(run_info.get("start_time", 0) / 1000)),
-                    )
-
-                    artifact_paths = [
-                        a.get("path", "Unknown")
-                        for a in run.get("model_info", {}).get("model_artifacts", [])
-                    ]
-                    artifact_text = (
-                        "\n      ".join(artifact_paths) or "No specific paths found"
-                    )
+            return
+        experiment_id = found_id
 
-                    runs_text += (
-                        f"{i}. {run_name} (ID: {run_id[:8]}...)\n"
-                        f"   • Status: {status}\n"
-                        f"   • Started: {start_time}\n"
-                        f"   • Model Artifacts:\n      {artifact_text}\n"
-                    )
+    success, msg, runs = get_runs_with_model_info(experiment_id)
 
-                if len(runs_with_models) > 10:
-                    runs_text += (
-                        f"\n...and {len(runs_with_models) - 10} more runs with models."
-                    )
+    if success:
+        # Filter runs with models
+        runs_with_models = [
+            r for r in runs if (r.get("model_info") or _EMPTY).get("has_model", False)
+        ]
 
-                parsed_response["message"] = (
-                    f"🔍 Found {len(runs_with_models)} runs with models in experiment {experiment_id}:\n\n{runs_text}"
+        if runs_with_models:
+            run_entries: List[str] = []
+            for i, run in enumerate(islice(runs_with_models, 10), 1):
+                run_info = run.get("info") or _EMPTY
+                run_id = run_info.get("run_id", "Unknown")
+                run_name = run_info.get("run_name", "Unnamed run")
+                status = run_info.get("status", "Unknown")
+                start_time = _format_timestamp(run_info.get("start_time", 0))
+
+                model_info = run.get("model_info") or _EMPTY
+                artifact_paths = [
+                    a.get("path", "Unknown")
+                    for a in model_info.get("model_artifacts", ())
+                ]
+                artifact_text = (
+                    "\n      ".join(artifact_paths) or "No specific paths found"
                 )
-            else:
-                parsed_response["message"] = (
-                    f"No runs with logged models found in experiment {experiment_id}."
+
+                run_entries.append(
+                    f"{i}. {run_name} (ID: {_short_id(run_id)})\n"
+                    f"   • Status: {status}\n"
+                    f"   • Started: {start_time}\n"
+                    f"   • Model Artifacts:\n      {artifact_text}\n"
                 )
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
 
-        # --------------- get_recently_used_models ---------------
-    elif intent == "get_recently_used_models" and confirmation == "confirmed":
-        limit = entities.get("limit", 5)
+            if len(runs_with_models) > 10:
+                run_entries.append(
+                    f"\n...and {len(runs_with_models) - 10} more runs with models."
+                )
+            runs_text = "".join(run_entries)
 
-        # Validate limit
-        try:
-            limit = int(limit)
-            if limit <= 0:
-                limit = 5
-        except (ValueError, TypeError):
-            limit = 5
+            reply.message = (
+                f"🔍 Found {len(runs_with_models)} runs with models in experiment "
+                f"{experiment_id}:\n\n{runs_text}"
+            )
+        else:
+            reply.message = (
+                f"No runs with logged models found in experiment {experiment_id}."
+            )
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
 
-        success, msg, recent_models = get_recently_used_models(limit)
 
-        if success and recent_models:
-            models_text = ""
-            for i, model in enumerate(recent_models, 1):
-                name = model.get("name", "Unknown")
-                recent_runs = model.get("recent_runs", [])
+def _handle_get_recently_used_models(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List the models used by the most recent runs."""
+    limit = entities.get("limit", 5)
 
-                # Format timestamp of most recent use
-                latest_timestamp = model.get("latest_timestamp", 0)
-                latest_time = (
-                    time.strftime(
-                        "%Y-%m-%d %H:%M:%S",
-                        time.localtime(int(latest_timestamp / 1000)),
-                    )
-                    if latest_timestamp
-                    else "Unknown"
-                )
+    # Validate limit
+    try:
+        limit = int(limit)
+        if limit <= 0:
+            limit = 5
+    except (ValueError, TypeError):
+        limit = 5
 
-                # Get versions used
-                versions = set(
-                    run.get("version") for run in recent_runs if run.get("version")
-                )
-                versions_text = ", ".join(sorted(versions)) if versions else "Unknown"
+    success, msg, recent_models = get_recently_used_models(limit)
 
-                models_text += (
-                    f"{i}. {name}\n"
-                    f"   • Last Used: {latest_time}\n"
-                    f"   • Versions Used: {versions_text}\n"
-                    f"   • Recent Usage Count: {len(recent_runs)}\n"
-                )
+    if success and recent_models:
+        model_entries: List[str] = []
+        for i, model in enumerate(recent_models, 1):
+            name = model.get("name", "Unknown")
+            recent_runs = model.get("recent_runs", [])
 
-            parsed_response["message"] = (
-                f"🔄 Top {len(recent_models)} Recently Used Models:\n\n{models_text}"
+            # Format timestamp of most recent use
+            latest_timestamp = model.get("latest_timestamp", 0)
+            latest_time = (
+                _format_timestamp(latest_timestamp) if latest_timestamp else "Unknown"
             )
-        elif success:
-            parsed_response["message"] = "No recently used models found in MLflow."
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
-
-    # --------------- get_registered_models ---------------
-    elif intent == "get_registered_models" and confirmation == "confirmed":
-        success, msg, models = get_registered_models()
-
-        if success and models:
-            # Prepare a formatted list of models
-            model_list = []
-            for i, model in enumerate(models[:20], 1):  # Show up to 20 models
-                name = model.get("name", "Unnamed")
-
-                # Get latest version if available
-                latest_version = "Unknown"
-                version_success, _, versions = get_model_versions(name)
-                if version_success and versions:
-                    sorted_versions = sorted(
-                        versions, key=lambda v: int(v.get("version", 0)), reverse=True
-                    )
-                    if sorted_versions:
-                        latest_version = sorted_versions[0].get("version", "Unknown")
-
-                # Get last updated timestamp
-                last_updated = model.get("last_updated_timestamp")
-                time_str = ""
-                if last_updated:
-                    time_str = f", Updated: {time.strftime('%Y-%m-%d', time.localtime(int(last_updated) / 1000))}"
-
-                # Get stages if available
-                stages = set()
-                if version_success and versions:
-                    for v in versions:
-                        stage = v.get("current_stage")
-                        if stage and stage != "None":
-                            stages.add(stage)
-                stages_str = ""
-                if stages:
-                    stages_str = f", Stages: {', '.join(sorted(stages))}"
-
-                # Format the model info
-                model_list.append(
-                    f"{i}. {name} (Latest version: {latest_version}{time_str}{stages_str})"
-                )
-
-            # Join the model list with newlines
-            formatted_list = "\n".join(model_list)
 
-            # Add a note if there are more models
-            if len(models) > 20:
-                formatted_list += f"\n\n...and {len(models) - 20} more models."
+            # Get versions used
+            versions = {
+                version for run in recent_runs if (version := run.get("version"))
+            }
+            versions_text = ", ".join(sorted(versions)) if versions else "Unknown"
+
+            model_entries.append(
+                f"{i}. {name}\n"
+                f"   • Last Used: {latest_time}\n"
+                f"   • Versions Used: {versions_text}\n"
+                f"   • Recent Usage Count: {len(recent_runs)}\n"
+            )
+        models_text = "".join(model_entries)
 
-            parsed_response["message"] = (
-                f"📋 Found {len(models)} registered models:\n\n{formatted_list}"
+        reply.message = (
+            f"🔄 Top {len(recent_models)} Recently Used Models:\n\n{models_text}"
+        )
+    elif success:
+        reply.message = "No recently used models found in MLflow."
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
+
+
+def _handle_get_registered_models(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """List all registered models."""
+    success, msg, models = get_registered_models()
+
+    if success and models:
+        # Prepare a formatted list of models
+        model_list = []
+        shown = models[:20]  # Show up to 20 models
+        model_pairs = zip(shown, _model_versions(shown), strict=True)
+        for i, (model, versions) in enumerate(model_pairs, 1):
+            name = model.get("name", "Unnamed")
+            latest_version = _latest_version(versions)
+
+            # Get last updated timestamp
+            last_updated = model.get("last_updated_timestamp")
+            time_str = ""
+            if last_updated:
+                time_str = f", Updated: {_format_date(last_updated)}"
+
+            # Get stages if available
+            stages = {
+                stage
+                for v in versions
+                if (stage := v.get("current_stage")) and stage != "None"
+            }
+            stages_str = ""
+            if stages:
+                stages_str = f", Stages: {', '.join(sorted(stages))}"
+
+            # Format the model info
+            model_list.append(
+                f"{i}. {name} (Latest version: {latest_version}{time_str}{stages_str})"
             )
-        elif success:
-            parsed_response["message"] = "No registered models found in MLflow."
-        else:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = f"❌ {msg}"
 
-        # --------------- batch_create_runs ---------------
-    elif intent == "batch_create_runs" and confirmation == "confirmed":
-        experiment_id = entities.get("experiment_id")
-        experiment_name = entities.get("experiment_name")
-        run_names = entities.get("run_names", [])
+        # Join the model list with newlines
+        formatted_list = "\n".join(model_list)
 
-        if not run_names or not isinstance(run_names, list) or len(run_names) == 0:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = "Please provide a list of run names to create."
-            return {"assistant_response": parsed_response}
+        # Add a note if there are more models
+        if len(models) > 20:
+            formatted_list += f"\n\n...and {len(models) - 20} more models."
 
-        # Resolve experiment ID if only name provided
-        if not experiment_id and experiment_name:
-            found_id = get_experiment_id_by_name(experiment_name)
-            if not found_id:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"No experiment found named '{experiment_name}'. Please create it first or provide an existing ID."
-                )
-                return {"assistant_response": parsed_response}
-            experiment_id = found_id
+        reply.message = (
+            f"📋 Found {len(models)} registered models:\n\n{formatted_list}"
+        )
+    elif success:
+        reply.message = "No registered models found in MLflow."
+    else:
+        reply.confirmation = "needs_clarification"
+        reply.message = f"❌ {msg}"
+
+
+def _handle_batch_create_runs(
+    reply: ChatReply,
+    entities: Dict[str, Any],
+    session_id: str,
+    sdata: Dict[str, Any],
+) -> None:
+    """Create several runs in one experiment."""
+    experiment_id = entities.get("experiment_id")
+    experiment_name = entities.get("experiment_name")
+    run_names = entities.get("run_names", [])
+
+    if not run_names or not isinstance(run_names, list) or len(run_names) == 0:
+        reply.confirmation = "needs_clarification"
+        reply.message = "Please provide a list of run names to create."
+        return
+
+    # Resolve experiment ID if only name provided
+    if not experiment_id and experiment_name:
+        found_id = get_experiment_id_by_name(experiment_name)
+        if not found_id:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"No experiment found named '{experiment_name}'. "
+                "Please create it first or provide an existing ID."
+            )
+            return
+        experiment_id = found_id
 
-        if not experiment_id:
-            parsed_response["confirmation"] = "needs_clarification"
-            parsed_response["message"] = (
-                "Please provide either an experiment ID or name to create runs in."
+    if not experiment_id:
+        reply.confirmation = "needs_clarification"
+        reply.message = (
+            "Please provide either an experiment ID or name to create runs in."
+        )
+    else:
+        # Get experiment name for context
+        exp_name = get_experiment_name(experiment_id) or "Unknown"
+
+        results = batch_create_runs(experiment_id, run_names)
+
+        # Count successful creations
+        successful = sum(1 for r in results if r["success"])
+
+        if successful == len(run_names):
+            run_ids = [r["run_id"] for r in results if r["success"]]
+            run_list = "\n".join(
+                [
+                    f"• {name} (ID: {_short_id(id)})"
+                    for name, id in zip(run_names, run_ids)
+                    if id
+                ]
             )
-        else:
-            # Get experiment name for context
-            exp_name = "Unknown"
-            exp_success, _, exp_details = get_experiment_by_id(experiment_id)
-            if exp_success:
-                exp_name = exp_details.get("name", "Unknown")
-
-            results = batch_create_runs(experiment_id, run_names)
-
-            # Count successful creations
-            successful = sum(1 for r in results if r["success"])
-
-            if successful == len(run_names):
-                run_ids = [r["run_id"] for r in results if r["success"]]
-                run_list = "\n".join(
-                    [
-                        f"• {name} (ID: {id[:8]}...{id[-4:]})"
-                        for name, id in zip(run_names, run_ids)
-                        if id
-                    ]
-                )
-                parsed_response["message"] = (
-                    f"✅ Successfully created all {len(run_names)} runs in experiment '{exp_name}':\n\n{run_list}"
-                )
-                # Store the last run ID for reference
-                if run_ids:
-                    set_session_data(session_id, "current_run_id", run_ids[-1])
-                    set_session_data(session_id, "batch_run_ids", run_ids)
-            elif successful > 0:
-                # Create a list of successful and failed creations
-                success_list = []
-                failed_list = []
-
-                for result in results:
-                    name = result["run_name"]
-                    if result["success"]:
-                        run_id = result["run_id"]
-                        success_list.append(
-                            f"• {name} (ID: {run_id[:8]}...{run_id[-4:]})"
-                        )
-                    else:
-                        failed_list.append(f"• {name} (Error: {result['message']})")
-
-                success_text = "\n".join(success_list)
-                failed_text = "\n".join(failed_list)
-
-                parsed_response["message"] = (
-                    f"⚠️ Created {successful} out of {len(run_names)} runs in experiment '{exp_name}'.\n\n"
-                    f"Successful:\n{success_text}\n\n"
-                    f"Failed:\n{failed_text}"
-                )
-            else:
-                parsed_response["confirmation"] = "needs_clarification"
-                parsed_response["message"] = (
-                    f"❌ Failed to create any runs in experiment '{exp_name}'."
+            reply.message = (
+                f"✅ Successfully created all {len(run_names)} runs in experiment "
+                f"'{exp_name}':\n\n{run_list}"
+            )
+            # Store the last run ID for reference
+            if run_ids:
+                set_session_data_many(
+                    session_id,
+                    {"current_run_id": run_ids[-1], "batch_run_ids": run_ids},
                 )
+        elif successful > 0:
+            # Create a list of successful and failed creations
+            success_list = []
+            failed_list = []
+
+            for result in results:
+                name = result["run_name"]
+                if result["success"]:
+                    run_id = result["run_id"]
+                    success_list.append(
+                        f"• {name} (ID: {_short_id(run_id)})"
+                    )
+                else:
+                    failed_list.append(f"• {name} (Error: {result['message']})")
+
+            reply.message = "\n".join((
+                f"⚠️ Created {successful} out of {len(run_names)} runs "
+                f"in experiment '{exp_name}'.",
+                "",
+                "Successful:",
+                *success_list,
+                "",
+                "Failed:",
+                *failed_list,
+            ))
+        else:
+            reply.confirmation = "needs_clarification"
+            reply.message = (
+                f"❌ Failed to create any runs in experiment '{exp_name}'."
+            )
 
-    # Return the final response
-    return {"assistant_response": parsed_response}
+
+# Intent name -> handler; each updates the reply in place
+_INTENT_HANDLERS: Dict[str, Callable[..., None]] = {
+    "create_experiment": _handle_create_experiment,
+    "create_experiment_and_start_run": _handle_create_experiment_and_start_run,
+    "create_run": _handle_create_run,
+    "delete_experiment": _handle_delete_experiment,
+    "delete_run": _handle_delete_run,
+    "log_param": _handle_log_param,
+    "log_metric": _handle_log_metric,
+    "get_experiment_details": _handle_get_experiment_details,
+    "list_runs": _handle_list_runs,
+    "list_experiments": _handle_list_experiments,
+    "get_mlflow_summary": _handle_get_mlflow_summary,
+    "get_model_versions": _handle_get_model_versions,
+    "get_model_details": _handle_get_model_details,
+    "get_recent_models": _handle_get_recent_models,
+    "batch_create_experiments": _handle_batch_create_experiments,
+    "get_models_with_artifacts": _handle_get_models_with_artifacts,
+    "get_recently_used_models": _handle_get_recently_used_models,
+    "get_registered_models": _handle_get_registered_models,
+    "batch_create_runs": _handle_batch_create_runs,
+}
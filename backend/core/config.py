@@ -3,13 +3,12 @@ Configuration settings for the application.
 Loads settings from environment variables.
 """
 
-import os
+from functools import cache
+from typing import Any, Optional
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
-
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -18,36 +17,94 @@ class Settings(BaseSettings):
     # -----------------
 
     # OpenAI API key
-    OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY", "")
-    ANTHROPIC_API_KEY: str = os.getenv("ANTHROPIC_API_KEY", "")
-    LLAMA_API_ENDPOINT: str = os.getenv(
-        "LLAMA_API_ENDPOINT", "http://localhost:11434/v1"
-    )
+    OPENAI_API_KEY: str = ""
+    ANTHROPIC_API_KEY: str = ""
+    LLAMA_API_ENDPOINT: str = "http://localhost:11434/v1"
 
     # MLflow tracking server URL
-    MLFLOW_TRACKING_URI: str = os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5000")
+    MLFLOW_TRACKING_URI: str = "http://127.0.0.1:5000"
 
     # FastAPI service port
-    API_PORT: int = int(os.getenv("API_PORT", "5003"))
+    API_PORT: int = 5003
+    # Run a single auto-reloading worker instead of the production server
+    DEBUG: bool = False
+    # Uvicorn worker processes when not in DEBUG; 0 means one per CPU. Chat
+    # sessions, rate limits and caches live in process memory, so more than one
+    # worker needs that state moved to a shared store first
+    WORKERS: int = 1
 
-    # Backend API URL for frontend to connect to
-    BACKEND_API_URL: str = os.getenv(
-        "BACKEND_API_URL", f"http://127.0.0.1:{os.getenv('API_PORT', '5003')}/"
-    )
+    # Backend API URL for frontend to connect to; defaults to the API on API_PORT
+    BACKEND_API_URL: Optional[str] = None
 
     # Default LLM configuration
-    DEFAULT_LLM_PROVIDER: str = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
-    DEFAULT_LLM_MODEL: str = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o")
+    DEFAULT_LLM_PROVIDER: str = "openai"
+    DEFAULT_LLM_MODEL: str = "gpt-4o"
 
     # Optional settings with defaults
     # ------------------------------
-    MAX_REQUESTS_PER_SESSION: int = int(os.getenv("MAX_REQUESTS_PER_SESSION", "10"))
-    INVITATION_EXPIRY_SECONDS: int = int(os.getenv("INVITATION_EXPIRY_SECONDS", "3600"))
-    REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
+    MAX_REQUESTS_PER_SESSION: int = 10
+    INVITATION_EXPIRY_SECONDS: int = 3600
+    # Invitation code lookups allowed per client and code every
+    # INVITATION_RATE_WINDOW seconds
+    INVITATION_RATE_LIMIT: int = 20
+    # Lookups allowed per client across all codes, so guessing codes is throttled too
+    INVITATION_HOST_RATE_LIMIT: int = 60
+    INVITATION_RATE_WINDOW: int = 60
+    REQUEST_TIMEOUT: int = 30
+    # Most recent chat messages (and their total characters) sent to the LLM
+    CHAT_HISTORY_MESSAGES: int = 20
+    CHAT_HISTORY_CHARS: int = 16000
+    # Comma-separated provider:model pairs, cheapest first, tried before the chat's
+    # selected model; a reply is kept once it parses as an intent. Empty disables it
+    LLM_CASCADE: str = ""
+    # Seconds to reuse LLM provider health results in /llm/status; also sent as
+    # Cache-Control max-age on /llm/status and /llm/providers
+    LLM_HEALTH_TTL: int = 60
+    # Maximum number of provider probes in flight at once
+    LLM_PROBE_CONCURRENCY: int = 5
+    # Seconds a single provider probe may take before it is reported unavailable
+    LLM_PROBE_TIMEOUT: float = 10.0
+    # Where provider model catalogs are cached, and how long (seconds) they stay fresh
+    MODEL_CATALOG_DIR: str = "~/.cache/prodizy"
+    MODEL_CATALOG_TTL: int = 86400
+    # Seconds a resolved MLflow experiment name -> ID mapping is reused
+    MLFLOW_NAME_CACHE_TTL: int = 60
+    # Seconds the MLflow summary statistics are reused
+    MLFLOW_SUMMARY_TTL: int = 30
+    # Seconds MLflow experiment, registered model and model version listings are reused
+    MLFLOW_LISTING_TTL: int = 30
+    # Seconds the MLflow HTTP session may sit idle before it is replaced
+    MLFLOW_SESSION_IDLE_TIMEOUT: int = 300
+    # SQLite file backing the invitation store; empty uses invitation_store.db
+    INVITATION_DB_PATH: str = ""
     model_config = SettingsConfigDict(
         env_file=".env", case_sensitive=True, extra="ignore"
     )
 
+    @model_validator(mode="after")
+    def _default_backend_api_url(self) -> "Settings":
+        if self.BACKEND_API_URL is None:
+            self.BACKEND_API_URL = f"http://127.0.0.1:{self.API_PORT}/"
+        return self
+
+
+@cache
+def get_settings() -> Settings:
+    """
+    Get the application settings, reading them on first use.
+
+    Returns:
+        The shared Settings instance
+    """
+    # Settings reads .env itself; this also exports it to os.environ for code
+    # that reads variables directly
+    load_dotenv()
+    return Settings()
+
 
-# Create a global settings instance
-settings = Settings()
+def __getattr__(name: str) -> Any:
+    # `settings` is created lazily, so importing this module (e.g. for the
+    # Settings class) does not parse the environment and .env file
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
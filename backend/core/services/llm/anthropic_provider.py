@@ -2,9 +2,9 @@
 Anthropic (Claude) LLM provider implementation.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
 from fastapi import HTTPException
-from .base_provider import LLMProvider
+from .base_provider import LLMProvider, response_cache
 
 try:
     import anthropic
@@ -13,6 +13,42 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
 
 
+_AVAILABLE_MODELS = (
+    {
+        "id": "claude-3-opus-20240229",
+        "name": "Claude 3 Opus",
+        "max_tokens": 4096,
+        "description": (
+            "Most powerful Claude model for complex tasks requiring deep expertise."
+        ),
+        "default_temperature": 0.0
+    },
+    {
+        "id": "claude-3-sonnet-20240229",
+        "name": "Claude 3 Sonnet",
+        "max_tokens": 4096,
+        "description": "Balanced model for most tasks with excellent performance.",
+        "default_temperature": 0.0
+    },
+    {
+        "id": "claude-3-haiku-20240307",
+        "name": "Claude 3 Haiku",
+        "max_tokens": 4096,
+        "description": (
+            "Fastest and most compact Claude model for responsive applications."
+        ),
+        "default_temperature": 0.0
+    },
+    {
+        "id": "claude-3.5-sonnet-20240620",
+        "name": "Claude 3.5 Sonnet",
+        "max_tokens": 8192,
+        "description": "Latest Claude model with enhanced reasoning capabilities.",
+        "default_temperature": 0.0
+    }
+)
+
+
 class AnthropicProvider(LLMProvider):
     """Anthropic Claude API provider implementation."""
     
@@ -27,8 +63,10 @@ class AnthropicProvider(LLMProvider):
         self._api_key = api_key
         if api_key:
             self.client = anthropic.Anthropic(api_key=api_key)
+            self.async_client = anthropic.AsyncAnthropic(api_key=api_key)
         else:
             self.client = None
+            self.async_client = None
     
     @property
     def provider_name(self) -> str:
@@ -36,38 +74,33 @@ class AnthropicProvider(LLMProvider):
         return "Anthropic (Claude)"
     
     @property
-    def available_models(self) -> List[Dict[str, Any]]:
+    def available_models(self) -> Sequence[Dict[str, Any]]:
         """Get available Anthropic Claude models."""
-        return [
-            {
-                "id": "claude-3-opus-20240229",
-                "name": "Claude 3 Opus",
-                "max_tokens": 4096,
-                "description": "Most powerful Claude model for complex tasks requiring deep expertise.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "claude-3-sonnet-20240229",
-                "name": "Claude 3 Sonnet",
-                "max_tokens": 4096,
-                "description": "Balanced model for most tasks with excellent performance.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "claude-3-haiku-20240307",
-                "name": "Claude 3 Haiku",
-                "max_tokens": 4096,
-                "description": "Fastest and most compact Claude model for responsive applications.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "claude-3.5-sonnet-20240620",
-                "name": "Claude 3.5 Sonnet",
-                "max_tokens": 8192,
-                "description": "Latest Claude model with enhanced reasoning capabilities.",
-                "default_temperature": 0.0
-            }
-        ]
+        return _AVAILABLE_MODELS
+    
+    def _request_params(
+        self,
+        messages: List[Dict[str, str]],
+        model_id: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the Messages API request parameters."""
+        # Convert messages from OpenAI format to Anthropic format
+        system_blocks, anthropic_messages = self._convert_messages(messages)
+        request_params = {
+            "model": model_id,
+            "messages": anthropic_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens or 4096,
+        }
+        if system_blocks:
+            request_params["system"] = system_blocks
+        
+        # Add any additional Anthropic-specific parameters, never letting
+        # them override the ones built above
+        return {**kwargs, **request_params}
     
     def generate_chat_response(
         self, 
@@ -81,64 +114,134 @@ class AnthropicProvider(LLMProvider):
         if not self.client:
             raise ValueError("Anthropic client is not initialized. Please provide a valid API key.")
         
+        cache_key = response_cache.key(
+            self.provider_name, model_id, messages, temperature, max_tokens, kwargs
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            # Convert messages from OpenAI format to Anthropic format
-            anthropic_messages = self._convert_messages(messages)
-            
-            # Build request parameters
-            request_params = {
-                "model": model_id,
-                "messages": anthropic_messages,
-                "temperature": temperature,
-                "max_tokens": max_tokens or 4096,
-            }
-            
-            # Add any additional Anthropic-specific parameters
-            for key, value in kwargs.items():
-                if key not in request_params:
-                    request_params[key] = value
-            
             # Call the Anthropic API
-            response = self.client.messages.create(**request_params)
+            response = self.client.messages.create(
+                **self._request_params(
+                    messages, model_id, temperature, max_tokens, kwargs
+                )
+            )
             
             # Extract and return the response text
-            return response.content[0].text
+            content = response.content[0].text
+            response_cache.put(cache_key, content)
+            return content
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Anthropic API Error: {str(e)}")
     
+    async def agenerate_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str = "claude-3-sonnet-20240229",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """Generate a response using Anthropic's async Claude API."""
+        if not self.async_client:
+            raise ValueError(
+                "Anthropic client is not initialized. Please provide a valid API key."
+            )
+        
+        cache_key = response_cache.key(
+            self.provider_name, model_id, messages, temperature, max_tokens, kwargs
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            response = await self.async_client.messages.create(
+                **self._request_params(
+                    messages, model_id, temperature, max_tokens, kwargs
+                )
+            )
+            content = response.content[0].text
+            response_cache.put(cache_key, content)
+            return content
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Anthropic API Error: {str(e)}"
+            ) from e
+    
+    async def astream_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str = "claude-3-sonnet-20240229",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream a response from Anthropic's async Claude API."""
+        if not self.async_client:
+            raise ValueError(
+                "Anthropic client is not initialized. Please provide a valid API key."
+            )
+        
+        try:
+            request_params = self._request_params(
+                messages, model_id, temperature, max_tokens, kwargs
+            )
+            async with self.async_client.messages.stream(**request_params) as stream:
+                async for text in stream.text_stream:
+                    yield text
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"Anthropic API Error: {str(e)}"
+            ) from e
+    
+    def check_api_key(self, api_key: str) -> None:
+        """Check the Anthropic API key with a simple request, raising any API error."""
+        # Create a temporary client with the API key
+        temp_client = anthropic.Anthropic(api_key=api_key)
+        
+        # List available models to verify the key works
+        temp_client.models.list()
+    
     def validate_api_key(self, api_key: str) -> bool:
         """Validate Anthropic API key by testing a simple request."""
         if not ANTHROPIC_AVAILABLE:
             return False
         
         try:
-            # Create a temporary client with the API key
-            temp_client = anthropic.Anthropic(api_key=api_key)
-            
-            # List available models to verify the key works
-            temp_client.models.list()
+            self.check_api_key(api_key)
             return True
         except Exception:
             return False
     
-    def _convert_messages(self, openai_messages: List[Dict[str, str]]) -> List[Dict[str, Any]]:
-        """Convert messages from OpenAI format to Anthropic format."""
-        anthropic_messages = []
+    def _convert_messages(
+        self, openai_messages: List[Dict[str, str]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Convert messages from OpenAI format to Anthropic format.
         
-        for message in openai_messages:
-            role = message["role"]
-            content = message["content"]
-            
-            if role == "system":
-                # System messages are treated differently in Anthropic
-                anthropic_messages.append({
-                    "role": "user",
-                    "content": f"<system>\n{content}\n</system>"
-                })
-            elif role == "user":
-                anthropic_messages.append({"role": "user", "content": content})
-            elif role == "assistant":
-                anthropic_messages.append({"role": "assistant", "content": content})
-            # Skip 'function' role messages as Anthropic doesn't support them directly
+        Returns:
+            Tuple of (system blocks, messages); system content goes in the
+            request's top-level `system` parameter rather than a user turn
+        """
+        system_parts = [m["content"] for m in openai_messages if m["role"] == "system"]
+        # Skip 'function' role messages as Anthropic doesn't support them directly
+        anthropic_messages = [
+            {"role": m["role"], "content": m["content"]}
+            for m in openai_messages
+            if m["role"] in ("user", "assistant")
+        ]
         
-        return anthropic_messages
\ No newline at end of file
+        system_blocks = []
+        if system_parts:
+            # The system prompt is the same on every call, so mark it for
+            # prompt caching; later calls read it from the cache at a reduced
+            # rate instead of processing it again
+            system_blocks.append({
+                "type": "text",
+                "text": "\n\n".join(system_parts),
+                "cache_control": {"type": "ephemeral"}
+            })
+        return system_blocks, anthropic_messages
@@ -3,8 +3,115 @@ Base LLM provider interface.
 All LLM providers should implement this interface.
 """
 
+import asyncio
+import hashlib
+import orjson
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
+
+
+class ResponseCache:
+    """
+    Process-wide LRU of deterministic chat completions.
+    
+    Only temperature 0 requests are cached, keyed on everything that shapes
+    the completion, so a hit returns what the API would have returned.
+    Entries expire after `ttl` seconds, since a model behind a stable ID can
+    still be updated upstream.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: float = 3600):
+        self._maxsize = maxsize
+        self._ttl = ttl
+        # key -> (monotonic timestamp, completion)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+    
+    @staticmethod
+    def key(
+        scope: str,
+        model_id: str,
+        messages: List[Dict[str, str]],
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        """
+        Build the cache key for a request.
+        
+        Args:
+            scope: Identifies the provider (and endpoint) serving the request
+            model_id: The model ID
+            messages: The request messages
+            temperature: The sampling temperature
+            max_tokens: The maximum number of tokens to generate
+            kwargs: Additional provider-specific parameters
+            
+        Returns:
+            The key, or None if the request is not deterministic
+        """
+        if temperature:
+            return None
+        payload = orjson.dumps(
+            [scope, model_id, messages, max_tokens, kwargs],
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def get(self, key: Optional[str]) -> Optional[str]:
+        """Return the cached completion for a key, if any and not expired."""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] >= self._ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def put(self, key: Optional[str], value: str) -> None:
+        """Cache a completion, evicting the least recently used when full."""
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+    
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one cached completion, or all of them if no key is given."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+    
+    def cache_info(self) -> Dict[str, Any]:
+        """Report hit/miss counts and the current size for monitoring."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "ttl": self._ttl,
+            }
+
+
+# Shared by all providers; the scope in each key keeps them apart
+response_cache = ResponseCache()
 
 
 class LLMProvider(ABC):
@@ -18,12 +125,15 @@ class LLMProvider(ABC):
     
     @property
     @abstractmethod
-    def available_models(self) -> List[Dict[str, Any]]:
+    def available_models(self) -> Sequence[Dict[str, Any]]:
         """
         Get a list of available models from this provider.
         
+        Implementations may return a shared module-level constant, so callers
+        must not mutate the result.
+        
         Returns:
-            List of dictionaries with model information:
+            Sequence of dictionaries with model information:
             [
                 {
                     "id": "model-id",
@@ -61,6 +171,71 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def agenerate_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """
+        Async variant of `generate_chat_response`.
+        
+        Providers with an async client override this so the request runs on
+        the event loop; the default runs the sync call in a worker thread.
+        
+        Args:
+            messages: List of message objects (role, content) to send to the LLM
+            model_id: The specific model ID to use
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            max_tokens: Maximum number of tokens to generate
+            **kwargs: Additional provider-specific parameters
+            
+        Returns:
+            The generated response text
+        """
+        return await asyncio.to_thread(
+            self.generate_chat_response,
+            messages=messages,
+            model_id=model_id,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+    
+    async def astream_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str,
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Generate a response, yielding the text in chunks as it is produced.
+        
+        Providers with an async streaming API override this; the default
+        yields the whole `agenerate_chat_response` result as a single chunk.
+        
+        Args:
+            messages: List of message objects (role, content) to send to the LLM
+            model_id: The specific model ID to use
+            temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+            max_tokens: Maximum number of tokens to generate
+            **kwargs: Additional provider-specific parameters
+            
+        Yields:
+            Consecutive pieces of the generated response text
+        """
+        yield await self.agenerate_chat_response(
+            messages=messages,
+            model_id=model_id,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs
+        )
+    
     @abstractmethod
     def validate_api_key(self, api_key: str) -> bool:
         """
@@ -72,4 +247,20 @@ class LLMProvider(ABC):
         Returns:
             True if valid, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+    
+    def check_api_key(self, api_key: str) -> None:
+        """
+        Check the provided API key, raising the provider's error if it is unusable.
+        
+        Providers whose SDK reports why a key was rejected (revoked, out of
+        credits, rate limited) override this so the error can be classified.
+        
+        Args:
+            api_key: The API key to check
+            
+        Raises:
+            ValueError: If the key is not valid
+        """
+        if not self.validate_api_key(api_key):
+            raise ValueError("Invalid API key")
\ No newline at end of file
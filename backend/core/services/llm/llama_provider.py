@@ -2,16 +2,50 @@
 Self-hosted Llama model provider implementation with enhanced error handling.
 """
 
-import json
+import time
+import httpx
+import orjson
 import requests
 import logging
-from typing import List, Dict, Any, Optional
-from .base_provider import LLMProvider
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from .base_provider import LLMProvider, response_cache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("llama_provider")
 
+# Seconds a model list fetched from the endpoint is reused
+MODELS_CACHE_TTL = 60
+# Largest chat completion body read before the request is abandoned
+MAX_RESPONSE_BYTES = 4 * 1024 * 1024
+
+_AVAILABLE_MODELS = (
+    {
+        "id": "llama3",
+        "name": "Llama 3 (8B)",
+        "max_tokens": 4096,
+        "description": "Efficient 8B parameter Llama 3 model.",
+        "default_temperature": 0.0
+    },
+    {
+        "id": "llama-3-70b",
+        "name": "Llama 3 (70B)",
+        "max_tokens": 4096,
+        "description": "Powerful 70B parameter Llama 3 model for complex tasks.",
+        "default_temperature": 0.0
+    },
+    {
+        "id": "code-llama",
+        "name": "Code Llama",
+        "max_tokens": 4096,
+        "description": "Specialized model for coding and technical tasks.",
+        "default_temperature": 0.0
+    }
+)
+
+
 class LlamaProvider(LLMProvider):
     """Provider for self-hosted Llama models via API endpoint."""
     
@@ -25,72 +59,141 @@ class LlamaProvider(LLMProvider):
         """
         self._api_endpoint = api_endpoint
         self._api_key = api_key
-        logger.info(f"Initializing LlamaProvider with endpoint: {api_endpoint}")
+        # Provider instances are cached, so requests to the server reuse
+        # keep-alive connections from this pool
+        self._session = requests.Session()
+        # Ollama swapping models or dropping a socket is usually over within a
+        # second, so transient failures are retried with jittered backoff.
+        # Read errors are not: a generation that timed out would only be
+        # started again from scratch
+        retry = Retry(
+            total=3,
+            read=False,
+            backoff_factor=0.2,
+            backoff_jitter=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(("GET", "POST")),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=8, pool_maxsize=32, max_retries=retry
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        # Created on first async request, inside the running event loop
+        self._async_client: Optional[httpx.AsyncClient] = None
+        # (fetched at, models); the zero timestamp forces a first fetch
+        self._models_cache: Tuple[float, Sequence[Dict[str, Any]]] = (
+            0.0, _AVAILABLE_MODELS
+        )
+        logger.info("Initializing LlamaProvider with endpoint: %s", api_endpoint)
         
         # Validate endpoint format
         if api_endpoint and not api_endpoint.endswith("/v1"):
-            logger.warning(f"API endpoint '{api_endpoint}' might be incorrectly formatted. Expected format: 'http://hostname:port/v1'")
+            logger.warning(
+                "API endpoint '%s' might be incorrectly formatted. "
+                "Expected format: 'http://hostname:port/v1'",
+                api_endpoint
+            )
     
     @property
     def provider_name(self) -> str:
         """Get the name of the provider."""
         return "Self-hosted Llama"
     
+    def _default_models(self) -> Sequence[Dict[str, Any]]:
+        """Get the static Llama catalog used when the endpoint lists no models."""
+        return _AVAILABLE_MODELS
+    
     @property
-    def available_models(self) -> List[Dict[str, Any]]:
-        """Get available Llama models."""
-        models = [
-            {
-                "id": "llama3",
-                "name": "Llama 3 (8B)",
-                "max_tokens": 4096,
-                "description": "Efficient 8B parameter Llama 3 model.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "llama-3-70b",
-                "name": "Llama 3 (70B)",
-                "max_tokens": 4096,
-                "description": "Powerful 70B parameter Llama 3 model for complex tasks.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "code-llama",
-                "name": "Code Llama",
-                "max_tokens": 4096,
-                "description": "Specialized model for coding and technical tasks.",
-                "default_temperature": 0.0
-            }
-        ]
+    def available_models(self) -> Sequence[Dict[str, Any]]:
+        """Get available Llama models, re-fetching them at most once a minute."""
+        fetched_at, models = self._models_cache
         
         # Check if we can get the actual models from Ollama
-        if self._api_endpoint:
+        if self._api_endpoint and time.monotonic() - fetched_at > MODELS_CACHE_TTL:
             try:
-                response = requests.get(
+                response = self._session.get(
                     f"{self._api_endpoint}/models",
                     headers=self._get_headers(),
                     timeout=5
                 )
                 
                 if response.ok:
-                    available_models = response.json().get("models", [])
-                    if available_models:
-                        models = []
-                        for model in available_models:
-                            model_id = model.get("id", "unknown")
-                            models.append({
-                                "id": model_id,
-                                "name": model_id,
-                                "max_tokens": 4096,
-                                "description": f"Ollama model: {model_id}",
-                                "default_temperature": 0.0
-                            })
-                        logger.info(f"Found {len(models)} models from Ollama")
+                    models = (
+                        self._models_from_payload(orjson.loads(response.content))
+                        or self._default_models()
+                    )
+                    self._models_cache = (time.monotonic(), models)
+                    logger.info("Found %d models from Ollama", len(models))
             except Exception as e:
-                logger.error(f"Error fetching models from Ollama: {str(e)}")
+                logger.error("Error fetching models from Ollama: %s", e)
                 
         return models
     
+    def _models_from_payload(self, payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Convert an Ollama `/models` response into model descriptors."""
+        models = []
+        for model in payload.get("models", []):
+            model_id = model.get("id", "unknown")
+            models.append({
+                "id": model_id,
+                "name": model_id,
+                "max_tokens": 4096,
+                "description": f"Ollama model: {model_id}",
+                "default_temperature": 0.0
+            })
+        return models
+    
+    async def afetch_models(
+        self, http_client: httpx.AsyncClient
+    ) -> Optional[Sequence[Dict[str, Any]]]:
+        """
+        Fetch the model list from the endpoint using a shared async client.
+        
+        A single `/models` request both validates connectivity and returns the
+        models, so callers that need both avoid a second round-trip.
+        
+        Args:
+            http_client: Shared async HTTP client
+            
+        Returns:
+            List of model descriptors (the defaults if the endpoint reports none),
+            or None if the endpoint is unreachable or returns an error
+        """
+        if not self._api_endpoint:
+            return None
+        
+        try:
+            response = await http_client.get(
+                f"{self._api_endpoint}/models",
+                headers=self._get_headers()
+            )
+        except httpx.HTTPError as e:
+            logger.error("Error fetching models from Ollama: %s", e)
+            return None
+        
+        if response.status_code != 200:
+            return None
+        
+        models = (
+            self._models_from_payload(orjson.loads(response.content))
+            or self._default_models()
+        )
+        self._models_cache = (time.monotonic(), models)
+        return models
+    
+    @staticmethod
+    def _is_json_document(content: str) -> bool:
+        """Check whether a stripped reply is a JSON object or array."""
+        if content[:1] not in ("{", "["):
+            return False
+        try:
+            orjson.loads(content)
+            return True
+        except orjson.JSONDecodeError:
+            return False
+    
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers with optional authentication."""
         headers = {"Content-Type": "application/json"}
@@ -105,7 +208,145 @@ class LlamaProvider(LLMProvider):
             "confirmation": "needs_clarification",
             "message": message
         }
-        return json.dumps(error_response)
+        return orjson.dumps(error_response).decode()
+    
+    def _prepare_request(
+        self,
+        messages: List[Dict[str, str]],
+        model_id: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Optional[str], Optional[str], Dict[str, Any]]:
+        """
+        Build a chat completion request, or the reply to use instead of sending it.
+        
+        Returns:
+            Tuple of (reply, cache_key, payload); when reply is not None it is
+            an error or cached response and no request should be made
+        """
+        logger.info("Generating chat response with model: %s", model_id)
+        
+        # Validate API endpoint
+        if not self._api_endpoint:
+            error_msg = "Llama API endpoint is not configured. Please set LLAMA_API_ENDPOINT in your environment."
+            logger.error(error_msg)
+            return self._format_error_response(error_msg), None, {}
+        
+        # Different servers may serve different weights under one model name
+        cache_key = response_cache.key(
+            f"{self.provider_name}@{self._api_endpoint}",
+            model_id, messages, temperature, max_tokens, kwargs
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached, cache_key, {}
+        
+        # Build the request payload
+        payload = {
+            "model": model_id,
+            "messages": messages,
+            "temperature": temperature
+        }
+        
+        # Add optional parameters if provided
+        if max_tokens:
+            payload["max_tokens"] = max_tokens
+        
+        # Add any additional parameters
+        payload.update(kwargs)
+        
+        # Log request details
+        logger.info("Sending request to %s/chat/completions", self._api_endpoint)
+        # Only serialize the payload when someone will read it
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request payload: %s", orjson.dumps(payload).decode())
+        return None, cache_key, payload
+    
+    @staticmethod
+    def _extend_body(body: bytearray, chunk: bytes) -> None:
+        """Append a response chunk, refusing bodies over MAX_RESPONSE_BYTES."""
+        body.extend(chunk)
+        if len(body) > MAX_RESPONSE_BYTES:
+            raise ValueError(
+                f"Llama API response exceeded {MAX_RESPONSE_BYTES} bytes"
+            )
+    
+    def _reply_from_body(
+        self, status_code: int, body: bytearray, cache_key: Optional[str]
+    ) -> str:
+        """
+        Turn a chat completion HTTP response into the reply text.
+        
+        Args:
+            status_code: HTTP status of the response
+            body: The raw response body
+            cache_key: Where to cache a successful reply
+            
+        Returns:
+            The reply, or a formatted error response
+        """
+        # Handle HTTP errors
+        if status_code >= 400:
+            text = body.decode(errors="replace")
+            error_msg = f"Llama API returned error: {status_code} - {text}"
+            logger.error(error_msg)
+            if status_code == 404:
+                return self._format_error_response(
+                    "Llama model endpoint not found. Make sure the model is "
+                    "available in Ollama (try 'ollama list')."
+                )
+            return self._format_error_response(error_msg)
+        
+        # Parse the response
+        result = orjson.loads(body)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response: %s", orjson.dumps(result).decode())
+        
+        # Extract response content
+        try:
+            content = result["choices"][0]["message"]["content"].strip()
+            
+            # Prose never starts with a bracket, so only those replies are
+            # worth handing to the parser
+            if not self._is_json_document(content):
+                # Not JSON, wrap it in our standard format
+                mlflow_response = {
+                    "intent": "other_intent",
+                    "confirmation": "confirmed",
+                    "message": content
+                }
+                content = orjson.dumps(mlflow_response).decode()
+            # Only successful completions are cached, never error replies
+            response_cache.put(cache_key, content)
+            return content
+        except (KeyError, IndexError) as e:
+            error_msg = f"Unexpected response format from Llama API: {str(e)}"
+            logger.error(error_msg)
+            logger.error("Response was: %s", orjson.dumps(result).decode())
+            return self._format_error_response(error_msg)
+    
+    def _connection_error_response(self, error: Exception) -> str:
+        """Format the reply for a server that could not be reached."""
+        logger.error("Connection error to Llama API: %s", error)
+        return self._format_error_response(
+            "Could not connect to Llama API. Please ensure Ollama is running."
+        )
+    
+    def _timeout_response(self, error: Exception) -> str:
+        """Format the reply for a request that timed out."""
+        logger.error("Request to Llama API timed out: %s", error)
+        return self._format_error_response(
+            "Request to Llama API timed out. The model might be loading or the "
+            "server is overloaded."
+        )
+    
+    def _unexpected_error_response(self, error: Exception) -> str:
+        """Format the reply for any other request failure."""
+        logger.error("Unexpected error with Llama API: %s", error)
+        import traceback
+        logger.error(traceback.format_exc())
+        return self._format_error_response(f"Llama API Error: {str(error)}")
     
     def generate_chat_response(
         self, 
@@ -116,115 +357,78 @@ class LlamaProvider(LLMProvider):
         **kwargs
     ) -> str:
         """Generate a response using the Llama API."""
-        logger.info(f"Generating chat response with model: {model_id}")
-        
-        # Validate API endpoint
-        if not self._api_endpoint:
-            error_msg = "Llama API endpoint is not configured. Please set LLAMA_API_ENDPOINT in your environment."
-            logger.error(error_msg)
-            return self._format_error_response(error_msg)
+        reply, cache_key, payload = self._prepare_request(
+            messages, model_id, temperature, max_tokens, kwargs
+        )
+        if reply is not None:
+            return reply
         
+        # No preflight check that the server is up: a down or unreachable
+        # server surfaces as ConnectionError/Timeout from the request itself
+        # The body is read incrementally so a runaway generation is dropped
+        # at MAX_RESPONSE_BYTES instead of being buffered whole
         try:
-            # Build the request payload
-            payload = {
-                "model": model_id,
-                "messages": messages,
-                "temperature": temperature
-            }
-            
-            # Add optional parameters if provided
-            if max_tokens:
-                payload["max_tokens"] = max_tokens
-            
-            # Add any additional parameters
-            for key, value in kwargs.items():
-                payload[key] = value
-            
-            # Log request details
-            logger.info(f"Sending request to {self._api_endpoint}/chat/completions")
-            logger.debug(f"Request payload: {json.dumps(payload, indent=2)}")
-            
-            # Check if Ollama is running before making the request
-            try:
-                health_check = requests.get(
-                    # Ollama doesn't have a dedicated health endpoint, so we just check the base URL
-                    self._api_endpoint.replace("/v1", ""), 
-                    timeout=3
-                )
-                if not health_check.ok:
-                    error_msg = f"Ollama server not responding properly (status: {health_check.status_code})"
-                    logger.error(error_msg)
-                    return self._format_error_response(error_msg)
-            except requests.RequestException as e:
-                error_msg = f"Ollama server not available: {str(e)}"
-                logger.error(error_msg)
-                return self._format_error_response(
-                    "Llama API endpoint not found. Please make sure Ollama is running on the correct port."
-                )
-            
-            # Make the API request
-            response = requests.post(
+            with self._session.post(
                 f"{self._api_endpoint}/chat/completions",
                 headers=self._get_headers(),
-                json=payload,
-                timeout=120  # Longer timeout for self-hosted models
-            )
-            
-            # Handle HTTP errors
-            if not response.ok:
-                error_msg = f"Llama API returned error: {response.status_code} - {response.text}"
-                logger.error(error_msg)
-                if response.status_code == 404:
-                    return self._format_error_response(
-                        "Llama model endpoint not found. Make sure the model is available in Ollama (try 'ollama list')."
-                    )
-                return self._format_error_response(error_msg)
-            
-            # Parse the response
-            result = response.json()
-            logger.debug(f"Response: {json.dumps(result, indent=2)}")
-            
-            # Extract response content
-            try:
-                content = result["choices"][0]["message"]["content"].strip()
-                
-                # Check if content is already in JSON format
-                try:
-                    json.loads(content)
-                    # If it parses as JSON, return it directly
-                    return content
-                except json.JSONDecodeError:
-                    # Not JSON, wrap it in our standard format
-                    mlflow_response = {
-                        "intent": "other_intent",
-                        "confirmation": "confirmed",
-                        "message": content
-                    }
-                    return json.dumps(mlflow_response)
-            except (KeyError, IndexError) as e:
-                error_msg = f"Unexpected response format from Llama API: {str(e)}"
-                logger.error(error_msg)
-                logger.error(f"Response was: {json.dumps(result, indent=2)}")
-                return self._format_error_response(error_msg)
-                
+                data=orjson.dumps(payload),
+                timeout=120,  # Longer timeout for self-hosted models
+                stream=True
+            ) as response:
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=8192):
+                    self._extend_body(body, chunk)
+            return self._reply_from_body(response.status_code, body, cache_key)
         except requests.exceptions.ConnectionError as e:
-            error_msg = f"Connection error to Llama API: {str(e)}"
-            logger.error(error_msg)
-            return self._format_error_response(
-                "Could not connect to Llama API. Please ensure Ollama is running."
-            )
+            return self._connection_error_response(e)
         except requests.exceptions.Timeout as e:
-            error_msg = f"Request to Llama API timed out: {str(e)}"
-            logger.error(error_msg)
-            return self._format_error_response(
-                "Request to Llama API timed out. The model might be loading or the server is overloaded."
-            )
+            return self._timeout_response(e)
         except Exception as e:
-            error_msg = f"Unexpected error with Llama API: {str(e)}"
-            logger.error(error_msg)
-            import traceback
-            logger.error(traceback.format_exc())
-            return self._format_error_response(f"Llama API Error: {str(e)}")
+            return self._unexpected_error_response(e)
+    
+    async def agenerate_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str = "llama3",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """Generate a response using the Llama API without blocking the event loop."""
+        reply, cache_key, payload = self._prepare_request(
+            messages, model_id, temperature, max_tokens, kwargs
+        )
+        if reply is not None:
+            return reply
+        
+        try:
+            async with self._get_async_client().stream(
+                "POST",
+                f"{self._api_endpoint}/chat/completions",
+                headers=self._get_headers(),
+                content=orjson.dumps(payload),
+                timeout=120  # Longer timeout for self-hosted models
+            ) as response:
+                body = bytearray()
+                async for chunk in response.aiter_bytes(chunk_size=8192):
+                    self._extend_body(body, chunk)
+            return self._reply_from_body(response.status_code, body, cache_key)
+        except httpx.ConnectError as e:
+            return self._connection_error_response(e)
+        except httpx.TimeoutException as e:
+            return self._timeout_response(e)
+        except Exception as e:
+            return self._unexpected_error_response(e)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """Get the async HTTP client for chat requests, creating it on first use."""
+        if self._async_client is None:
+            # httpx only retries failed connection attempts, not 5xx replies
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=32, keepalive_expiry=60),
+                transport=httpx.AsyncHTTPTransport(retries=3)
+            )
+        return self._async_client
     
     def validate_api_key(self, api_key: str) -> bool:
         """
@@ -240,18 +444,21 @@ class LlamaProvider(LLMProvider):
             if api_key:
                 headers["Authorization"] = f"Bearer {api_key}"
             
-            logger.info(f"Validating connection to Llama API at {self._api_endpoint}")
+            logger.info("Validating connection to Llama API at %s", self._api_endpoint)
             
             # Try to access the models endpoint to verify connectivity
-            response = requests.get(
+            response = self._session.get(
                 f"{self._api_endpoint}/models",
                 headers=headers,
                 timeout=10
             )
             
             is_valid = response.status_code == 200
-            logger.info(f"Llama API connection validation: {'Success' if is_valid else 'Failed'}")
+            logger.info(
+                "Llama API connection validation: %s",
+                "Success" if is_valid else "Failed"
+            )
             return is_valid
         except Exception as e:
-            logger.error(f"Error validating Llama API connection: {str(e)}")
+            logger.error("Error validating Llama API connection: %s", e)
             return False
\ No newline at end of file
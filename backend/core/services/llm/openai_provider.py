@@ -2,10 +2,45 @@
 OpenAI LLM provider implementation.
 """
 
-import openai
-from typing import List, Dict, Any, Optional
+import hashlib
+from openai import AsyncOpenAI, OpenAI
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Any, Optional, Sequence
 from fastapi import HTTPException
-from .base_provider import LLMProvider
+from .base_provider import LLMProvider, response_cache
+
+
+@lru_cache(maxsize=32)
+def _prompt_cache_key(system_prompt: str) -> str:
+    """Derive a short, stable prompt cache key from a system prompt."""
+    return hashlib.sha1(system_prompt.encode()).hexdigest()[:16]
+
+
+_AVAILABLE_MODELS = (
+    {
+        "id": "gpt-4o",
+        "name": "GPT-4o",
+        "max_tokens": 8192,
+        "description": (
+            "Most capable model for complex tasks, reasoning, and creative content."
+        ),
+        "default_temperature": 0.0
+    },
+    {
+        "id": "gpt-4-turbo",
+        "name": "GPT-4 Turbo",
+        "max_tokens": 4096,
+        "description": "Improved version of GPT-4 with better performance.",
+        "default_temperature": 0.0
+    },
+    {
+        "id": "gpt-3.5-turbo",
+        "name": "GPT-3.5 Turbo",
+        "max_tokens": 4096,
+        "description": "Good balance of capability and cost efficiency.",
+        "default_temperature": 0.0
+    }
+)
 
 
 class OpenAIProvider(LLMProvider):
@@ -13,9 +48,15 @@ class OpenAIProvider(LLMProvider):
     
     def __init__(self, api_key: str = None):
         """Initialize the OpenAI provider with an API key."""
-        if api_key:
-            openai.api_key = api_key
         self._api_key = api_key
+        # Each provider owns its clients, so differently keyed instances
+        # never race on the SDK's module-level api_key
+        if api_key:
+            self.client = OpenAI(api_key=api_key)
+            self.async_client = AsyncOpenAI(api_key=api_key)
+        else:
+            self.client = None
+            self.async_client = None
     
     @property
     def provider_name(self) -> str:
@@ -23,31 +64,50 @@ class OpenAIProvider(LLMProvider):
         return "OpenAI"
     
     @property
-    def available_models(self) -> List[Dict[str, Any]]:
+    def available_models(self) -> Sequence[Dict[str, Any]]:
         """Get available OpenAI models."""
-        return [
-            {
-                "id": "gpt-4o",
-                "name": "GPT-4o",
-                "max_tokens": 8192,
-                "description": "Most capable model for complex tasks, reasoning, and creative content.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "gpt-4-turbo",
-                "name": "GPT-4 Turbo",
-                "max_tokens": 4096,
-                "description": "Improved version of GPT-4 with better performance.",
-                "default_temperature": 0.0
-            },
-            {
-                "id": "gpt-3.5-turbo",
-                "name": "GPT-3.5 Turbo",
-                "max_tokens": 4096,
-                "description": "Good balance of capability and cost efficiency.",
-                "default_temperature": 0.0
+        return _AVAILABLE_MODELS
+    
+    def _get_client(self) -> OpenAI:
+        """Return the sync client, raising if no API key was configured."""
+        if self.client is None:
+            raise ValueError(
+                "OpenAI client is not initialized. Please provide a valid API key."
+            )
+        return self.client
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """Return the async client, raising if no API key was configured."""
+        if self.async_client is None:
+            raise ValueError(
+                "OpenAI client is not initialized. Please provide a valid API key."
+            )
+        return self.async_client
+    
+    def _request_params(
+        self,
+        messages: List[Dict[str, str]],
+        model_id: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build the chat completion request parameters."""
+        request_params = {
+            "model": model_id,
+            "messages": messages,
+            "temperature": temperature
+        }
+        if max_tokens:
+            request_params["max_tokens"] = max_tokens
+        # Requests sharing a system prompt share a prompt prefix; a common
+        # cache key routes them to servers likely to hold it in cache
+        if messages and messages[0]["role"] == "system":
+            request_params["extra_body"] = {
+                "prompt_cache_key": _prompt_cache_key(messages[0]["content"])
             }
-        ]
+        request_params.update(kwargs)
+        return request_params
     
     def generate_chat_response(
         self, 
@@ -58,29 +118,85 @@ class OpenAIProvider(LLMProvider):
         **kwargs
     ) -> str:
         """Generate a response using OpenAI's API."""
+        cache_key = response_cache.key(
+            self.provider_name, model_id, messages, temperature, max_tokens, kwargs
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
         try:
-            request_params = {
-                "model": model_id,
-                "messages": messages,
-                "temperature": temperature
-            }
-            if max_tokens:
-                request_params["max_tokens"] = max_tokens
-            for key, value in kwargs.items():
-                request_params[key] = value
-            response = openai.ChatCompletion.create(**request_params)
-            return response.choices[0].message["content"].strip()
+            response = self._get_client().chat.completions.create(
+                **self._request_params(
+                    messages, model_id, temperature, max_tokens, kwargs
+                )
+            )
+            content = response.choices[0].message.content.strip()
+            response_cache.put(cache_key, content)
+            return content
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"OpenAI Error: {str(e)}")
     
+    async def agenerate_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str = "gpt-4o",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> str:
+        """Generate a response using OpenAI's async API."""
+        cache_key = response_cache.key(
+            self.provider_name, model_id, messages, temperature, max_tokens, kwargs
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                **self._request_params(
+                    messages, model_id, temperature, max_tokens, kwargs
+                )
+            )
+            content = response.choices[0].message.content.strip()
+            response_cache.put(cache_key, content)
+            return content
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"OpenAI Error: {str(e)}"
+            ) from e
+    
+    async def astream_chat_response(
+        self, 
+        messages: List[Dict[str, str]], 
+        model_id: str = "gpt-4o",
+        temperature: float = 0.0,
+        max_tokens: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """Stream a response from OpenAI's async API as it is generated."""
+        try:
+            request_params = self._request_params(
+                messages, model_id, temperature, max_tokens, kwargs
+            )
+            request_params["stream"] = True
+            client = self._get_async_client()
+            async for chunk in await client.chat.completions.create(**request_params):
+                content = chunk.choices[0].delta.content if chunk.choices else None
+                if content:
+                    yield content
+        except Exception as e:
+            raise HTTPException(
+                status_code=500, detail=f"OpenAI Error: {str(e)}"
+            ) from e
+    
+    def check_api_key(self, api_key: str) -> None:
+        """Check OpenAI API key by testing a simple request, raising any API error."""
+        OpenAI(api_key=api_key).models.list()
+    
     def validate_api_key(self, api_key: str) -> bool:
         """Validate OpenAI API key by testing a simple request."""
-        original_key = openai.api_key
         try:
-            openai.api_key = api_key
-            openai.Model.list(limit=1)
+            self.check_api_key(api_key)
             return True
         except Exception:
-            return False
-        finally:
-            openai.api_key = original_key
\ No newline at end of file
+            return False
\ No newline at end of file
@@ -2,41 +2,51 @@
 Factory for creating LLM provider instances.
 """
 
-from typing import Dict, List, Optional, Any
+import hashlib
+import importlib
+import importlib.util
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Any, Tuple, Type
 from .base_provider import LLMProvider
-from .openai_provider import OpenAIProvider
 
-# Conditionally import other providers
-try:
-    from .anthropic_provider import AnthropicProvider
-    ANTHROPIC_AVAILABLE = True
-except ImportError:
-    ANTHROPIC_AVAILABLE = False
+# Provider modules (and the SDKs they pull in) are imported on first use,
+# so a deployment that never calls a provider never loads its SDK
+ANTHROPIC_AVAILABLE = importlib.util.find_spec("anthropic") is not None
+LLAMA_AVAILABLE = True
 
-try:
-    from .llama_provider import LlamaProvider
-    LLAMA_AVAILABLE = True
-except ImportError:
-    LLAMA_AVAILABLE = False
+
+def _key_fingerprint(api_key: Optional[str]) -> Optional[str]:
+    """Return a short SHA-256 prefix identifying an API key without exposing it."""
+    if api_key is None:
+        return None
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
 
 
 class LLMProviderFactory:
     """Factory for creating and managing LLM provider instances."""
     
-    # Mapping of provider IDs to their implementation classes
-    _provider_classes = {
-        "openai": OpenAIProvider
+    # Mapping of provider IDs to their implementing (module, class name)
+    _provider_modules = {
+        "openai": (".openai_provider", "OpenAIProvider")
     }
     
     # Initialize optional providers
     if ANTHROPIC_AVAILABLE:
-        _provider_classes["anthropic"] = AnthropicProvider
+        _provider_modules["anthropic"] = (".anthropic_provider", "AnthropicProvider")
     
     if LLAMA_AVAILABLE:
-        _provider_classes["llama"] = LlamaProvider
+        _provider_modules["llama"] = (".llama_provider", "LlamaProvider")
     
-    # Cache of provider instances
-    _provider_instances: Dict[str, LLMProvider] = {}
+    # LRU of provider instances; bounded so callers cycling through many API
+    # keys cannot grow it without limit
+    _provider_instances: "OrderedDict[Tuple[Any, ...], LLMProvider]" = OrderedDict()
+    _max_provider_instances = 64
+    # Guards changes to the instance cache; lookups read it without the lock
+    _instances_lock = threading.Lock()
+    # Per-key locks held while an instance is built, so concurrent first calls
+    # share one instance instead of each building its own client pools
+    _build_locks: Dict[Tuple[Any, ...], threading.Lock] = {}
     
     @classmethod
     def get_available_providers(cls) -> List[Dict[str, Any]]:
@@ -77,6 +87,13 @@ class LLMProviderFactory:
         
         return providers
     
+    @classmethod
+    def _provider_class(cls, provider_id: str) -> Type[LLMProvider]:
+        """Import a provider's module and return its implementation class."""
+        module_name, class_name = cls._provider_modules[provider_id]
+        module = importlib.import_module(module_name, __package__)
+        return getattr(module, class_name)
+    
     @classmethod
     def create_provider(
         cls, 
@@ -101,33 +118,106 @@ class LLMProviderFactory:
             ValueError: If the provider ID is unknown
         """
         # Check if the provider ID is valid
-        if provider_id not in cls._provider_classes:
+        if provider_id not in cls._provider_modules:
             raise ValueError(f"Unknown provider ID: {provider_id}")
         
-        # Create a unique cache key that includes the provider ID and API key
-        cache_key = f"{provider_id}:{api_key}:{api_endpoint}"
+        cache_key = cls._cache_key(provider_id, api_key, api_endpoint, kwargs)
+        provider = cls._cached(cache_key)
+        if provider is not None:
+            return provider
         
-        # Return cached instance if available
-        if cache_key in cls._provider_instances:
-            return cls._provider_instances[cache_key]
-        
-        # Create provider instance based on type
-        provider_class = cls._provider_classes[provider_id]
+        # Only callers building the same instance wait for each other; the
+        # SDK import and client setup run outside the shared lock
+        with cls._instances_lock:
+            build_lock = cls._build_locks.setdefault(cache_key, threading.Lock())
+        with build_lock:
+            provider = cls._provider_instances.get(cache_key)
+            if provider is not None:
+                return provider
+            
+            try:
+                # Create provider instance based on type
+                provider_class = cls._provider_class(provider_id)
+                
+                if provider_id == "llama":
+                    # Llama provider requires an API endpoint
+                    provider = provider_class(
+                        api_endpoint=api_endpoint, api_key=api_key, **kwargs
+                    )
+                else:
+                    # Standard API key-based providers
+                    provider = provider_class(api_key=api_key, **kwargs)
+                
+                # Cache the provider instance
+                with cls._instances_lock:
+                    cls._provider_instances[cache_key] = provider
+                    if len(cls._provider_instances) > cls._max_provider_instances:
+                        cls._provider_instances.popitem(last=False)
+            finally:
+                with cls._instances_lock:
+                    cls._build_locks.pop(cache_key, None)
         
-        if provider_id == "llama":
-            # Llama provider requires an API endpoint
-            provider = provider_class(api_endpoint=api_endpoint, api_key=api_key, **kwargs)
-        else:
-            # Standard API key-based providers
-            provider = provider_class(api_key=api_key, **kwargs)
+        return provider
+    
+    @classmethod
+    def get_cached_provider(
+        cls,
+        provider_id: str,
+        api_key: Optional[str] = None,
+        api_endpoint: Optional[str] = None,
+        **kwargs
+    ) -> Optional[LLMProvider]:
+        """
+        Return an already created provider instance without ever blocking.
         
-        # Cache the provider instance
-        cls._provider_instances[cache_key] = provider
+        Async callers use this first and build a missing instance with
+        `create_provider` in a worker thread.
         
+        Args:
+            provider_id: The ID of the provider
+            api_key: API key for the provider
+            api_endpoint: API endpoint for self-hosted providers
+            **kwargs: Additional provider-specific parameters
+            
+        Returns:
+            The cached provider instance, or None if it has not been created
+        """
+        return cls._cached(cls._cache_key(provider_id, api_key, api_endpoint, kwargs))
+    
+    @staticmethod
+    def _cache_key(
+        provider_id: str,
+        api_key: Optional[str],
+        api_endpoint: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[Any, ...]:
+        """Build the instance cache key for a provider's settings."""
+        # A tuple keeps None and "" distinct and hashes without building a string;
+        # the key is fingerprinted so raw secrets never sit in the cache's keys
+        return (
+            provider_id,
+            _key_fingerprint(api_key),
+            api_endpoint,
+            tuple(sorted(kwargs.items())),
+        )
+    
+    @classmethod
+    def _cached(cls, cache_key: Tuple[Any, ...]) -> Optional[LLMProvider]:
+        """Look up a provider instance without waiting on the lock."""
+        provider = cls._provider_instances.get(cache_key)
+        # Refresh its LRU position only when that needs no waiting either
+        if provider is not None and cls._instances_lock.acquire(blocking=False):
+            try:
+                if cache_key in cls._provider_instances:
+                    cls._provider_instances.move_to_end(cache_key)
+            finally:
+                cls._instances_lock.release()
         return provider
     
     @classmethod
-    def get_provider_models(cls, provider_id: str, api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_provider_models(
+        cls, provider_id: str, api_key: Optional[str] = None
+    ) -> Sequence[Dict[str, Any]]:
         """
         Get available models for a specific provider.
         
@@ -3,11 +3,35 @@ Main LLM service module for integration with the application.
 Handles model selection and configuration for LLM providers.
 """
 
-from typing import List, Dict, Any, Optional
+import asyncio
+import httpx
+import orjson
+from typing import (
+    AsyncIterator, Callable, List, Dict, Any, Optional, Sequence, Tuple
+)
 from fastapi import HTTPException
 from backend.core.config import settings
+from backend.models.llm import ProviderStatus
+from .llm.base_provider import LLMProvider
 from .llm.provider_factory import LLMProviderFactory
 
+# Model used when a request names a provider but no model
+DEFAULT_MODELS: Dict[str, str] = {
+    "openai": "gpt-4o",
+    "anthropic": "claude-3-sonnet-20240229",
+    "llama": "llama3",
+}
+
+# Server-side API key used when a request brings none; read lazily so a
+# settings reload is picked up
+DEFAULT_KEYS: Dict[str, Callable[[], Optional[str]]] = {
+    "openai": lambda: settings.OPENAI_API_KEY,
+    "anthropic": lambda: settings.ANTHROPIC_API_KEY,
+}
+
+# Deterministic chat calls in flight: (provider, model, prompt) -> running call
+_inflight_responses: Dict[Tuple[str, Optional[str], bytes], asyncio.Future] = {}
+
 
 def get_available_providers() -> List[Dict[str, Any]]:
     """
@@ -19,7 +43,9 @@ def get_available_providers() -> List[Dict[str, Any]]:
     return LLMProviderFactory.get_available_providers()
 
 
-def get_provider_models(provider_id: str, api_key: Optional[str] = None) -> List[Dict[str, Any]]:
+def get_provider_models(
+    provider_id: str, api_key: Optional[str] = None
+) -> Sequence[Dict[str, Any]]:
     """
     Get available models for a specific provider.
     
@@ -32,10 +58,7 @@ def get_provider_models(provider_id: str, api_key: Optional[str] = None) -> List
     """
     try:
         # If no API key provided, use the default from settings
-        if not api_key and provider_id == "openai":
-            api_key = settings.OPENAI_API_KEY
-        elif not api_key and provider_id == "anthropic":
-            api_key = settings.ANTHROPIC_API_KEY
+        api_key = api_key or _default_api_key(provider_id)
         
         return LLMProviderFactory.get_provider_models(provider_id, api_key)
     except ValueError as e:
@@ -44,6 +67,72 @@ def get_provider_models(provider_id: str, api_key: Optional[str] = None) -> List
         raise HTTPException(status_code=500, detail=f"Error fetching models: {str(e)}")
 
 
+def _default_api_key(provider_id: str) -> Optional[str]:
+    """Return the configured API key for a provider, if it has one."""
+    default_key = DEFAULT_KEYS.get(provider_id)
+    return default_key() if default_key else None
+
+
+def _resolve_provider(
+    provider_id: str,
+    model_id: Optional[str],
+    api_key: Optional[str],
+    api_endpoint: Optional[str]
+) -> Tuple[LLMProvider, str]:
+    """
+    Create the provider instance and pick the model, filling in defaults.
+    
+    Args:
+        provider_id: The LLM provider to use
+        model_id: The specific model ID to use
+        api_key: Optional API key for the provider
+        api_endpoint: Optional API endpoint for self-hosted models
+        
+    Returns:
+        The provider instance and the model ID to call it with
+    """
+    # If no API key provided, use the default from settings
+    api_key = api_key or _default_api_key(provider_id)
+    
+    # If no model ID provided, use the default model for the provider
+    model_id = model_id or DEFAULT_MODELS.get(provider_id)
+    
+    # If using Llama and no endpoint is provided, use the default from settings
+    if provider_id == "llama" and not api_endpoint:
+        api_endpoint = settings.LLAMA_API_ENDPOINT
+    
+    # Create the provider instance
+    provider = LLMProviderFactory.create_provider(
+        provider_id=provider_id,
+        api_key=api_key,
+        api_endpoint=api_endpoint
+    )
+    return provider, model_id
+
+
+async def _aresolve_provider(
+    provider_id: str,
+    model_id: Optional[str]
+) -> Tuple[LLMProvider, str]:
+    """
+    Async variant of `_resolve_provider` for the default key and endpoint.
+    
+    A provider that was already created is used directly; building a new one
+    imports its SDK and sets up clients, so that runs in a worker thread
+    instead of on the event loop.
+    """
+    provider = LLMProviderFactory.get_cached_provider(
+        provider_id=provider_id,
+        api_key=_default_api_key(provider_id),
+        api_endpoint=settings.LLAMA_API_ENDPOINT if provider_id == "llama" else None
+    )
+    if provider is None:
+        return await asyncio.to_thread(
+            _resolve_provider, provider_id, model_id, None, None
+        )
+    return provider, model_id or DEFAULT_MODELS.get(provider_id)
+
+
 def generate_chat_response(
     messages: List[Dict[str, str]],
     provider_id: str = "openai",
@@ -71,30 +160,8 @@ def generate_chat_response(
         The generated response text
     """
     try:
-        # If no API key provided, use the default from settings
-        if not api_key and provider_id == "openai":
-            api_key = settings.OPENAI_API_KEY
-        elif not api_key and provider_id == "anthropic":
-            api_key = settings.ANTHROPIC_API_KEY
-        
-        # If no model ID provided, determine the default model for the provider
-        if not model_id:
-            if provider_id == "openai":
-                model_id = "gpt-4o"
-            elif provider_id == "anthropic":
-                model_id = "claude-3-sonnet-20240229"
-            elif provider_id == "llama":
-                model_id = "llama3"
-        
-        # If using Llama and no endpoint is provided, use the default from settings
-        if provider_id == "llama" and not api_endpoint:
-            api_endpoint = settings.LLAMA_API_ENDPOINT
-        
-        # Create the provider instance
-        provider = LLMProviderFactory.create_provider(
-            provider_id=provider_id,
-            api_key=api_key,
-            api_endpoint=api_endpoint
+        provider, model_id = _resolve_provider(
+            provider_id, model_id, api_key, api_endpoint
         )
         
         # Generate the response
@@ -111,21 +178,107 @@ def generate_chat_response(
         raise HTTPException(status_code=500, detail=f"Error generating response: {str(e)}")
 
 
-def validate_provider_credentials(
+def _is_intent_response(response: str) -> bool:
+    """Accept a reply that is a JSON object carrying a non-error intent."""
+    try:
+        parsed = orjson.loads(response)
+    except orjson.JSONDecodeError:
+        return False
+    return isinstance(parsed, dict) and parsed.get("intent") not in (None, "error")
+
+
+def _cascade_models() -> List[Tuple[str, str]]:
+    """Parse LLM_CASCADE into (provider ID, model ID) pairs, cheapest first."""
+    pairs = []
+    for entry in settings.LLM_CASCADE.split(","):
+        provider_id, _, model_id = entry.strip().partition(":")
+        if provider_id and model_id:
+            pairs.append((provider_id, model_id))
+    return pairs
+
+
+async def agenerate_with_cascade(
+    messages: List[Dict[str, str]],
+    provider_id: str = "openai",
+    model_id: Optional[str] = None,
+    confidence_fn: Callable[[str], bool] = _is_intent_response,
+    temperature: float = 0.0
+) -> str:
+    """
+    Generate a response, trying the LLM_CASCADE models before the selected one.
+    
+    Each cascade model answers only if `confidence_fn` accepts its reply; a
+    rejected reply or a failed call moves on to the next model, ending with
+    the selected model, whose reply is returned as is. With LLM_CASCADE unset
+    this is a plain `agenerate_chat_response` call.
+    
+    Args:
+        messages: List of message objects (role, content)
+        provider_id: The LLM provider selected for the chat
+        model_id: The model selected for the chat
+        confidence_fn: Decides whether a cascade model's reply is good enough
+        temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+        
+    Returns:
+        The first accepted reply, or the selected model's reply
+    """
+    selected = (provider_id, model_id or DEFAULT_MODELS.get(provider_id))
+    for cheaper in _cascade_models():
+        if cheaper == selected:
+            break
+        try:
+            response = await agenerate_chat_response(
+                messages, *cheaper, temperature
+            )
+        except HTTPException:
+            continue
+        if confidence_fn(response):
+            return response
+    return await agenerate_chat_response(
+        messages, provider_id, model_id, temperature
+    )
+
+
+def classify_provider_error(error: Exception) -> ProviderStatus:
+    """
+    Map an error raised while checking a provider to a health status.
+    
+    Args:
+        error: The exception raised by the provider SDK or HTTP client
+        
+    Returns:
+        The matching provider status
+    """
+    # openai exposes `http_status`, anthropic and httpx-based errors `status_code`
+    status_code = (
+        getattr(error, "status_code", None) or getattr(error, "http_status", None)
+    )
+    message = str(error).lower()
+    
+    if status_code in (400, 402, 429) and ("credit" in message or "quota" in message):
+        return ProviderStatus.INSUFFICIENT_CREDITS
+    if status_code in (401, 403):
+        return ProviderStatus.INVALID_KEY
+    if status_code == 429:
+        return ProviderStatus.RATE_LIMITED
+    return ProviderStatus.UNAVAILABLE
+
+
+def check_provider_credentials(
     provider_id: str,
     api_key: Optional[str] = None,
     api_endpoint: Optional[str] = None
-) -> bool:
+) -> ProviderStatus:
     """
-    Validate credentials for a specific LLM provider.
+    Check credentials for a specific LLM provider and classify any failure.
     
     Args:
         provider_id: The ID of the provider
-        api_key: API key to validate
+        api_key: API key to check
         api_endpoint: API endpoint for self-hosted providers
         
     Returns:
-        True if credentials are valid, False otherwise
+        ProviderStatus.HEALTHY if the credentials work, otherwise the failure status
     """
     try:
         # Create a provider instance
@@ -141,7 +294,227 @@ def validate_provider_credentials(
                 api_key=api_key
             )
         
-        # Validate the API key
-        return provider.validate_api_key(api_key)
-    except Exception:
-        return False
\ No newline at end of file
+        # Check the API key
+        provider.check_api_key(api_key)
+    except Exception as e:
+        return classify_provider_error(e)
+    return ProviderStatus.HEALTHY
+
+
+def validate_provider_credentials(
+    provider_id: str,
+    api_key: Optional[str] = None,
+    api_endpoint: Optional[str] = None
+) -> bool:
+    """
+    Validate credentials for a specific LLM provider.
+    
+    Args:
+        provider_id: The ID of the provider
+        api_key: API key to validate
+        api_endpoint: API endpoint for self-hosted providers
+        
+    Returns:
+        True if credentials are valid, False otherwise
+    """
+    status = check_provider_credentials(provider_id, api_key, api_endpoint)
+    return status == ProviderStatus.HEALTHY
+
+
+async def aget_provider_models(
+    http_client: httpx.AsyncClient,
+    provider_id: str,
+    api_key: Optional[str] = None,
+    api_endpoint: Optional[str] = None
+) -> Optional[Sequence[Dict[str, Any]]]:
+    """
+    Async variant of `get_provider_models`.
+    
+    Llama models are fetched over the shared HTTP client; SDK-backed
+    providers are resolved in a worker thread.
+    
+    Args:
+        http_client: Shared async HTTP client
+        provider_id: The ID of the provider
+        api_key: Optional API key for the provider
+        api_endpoint: Optional API endpoint for self-hosted models
+        
+    Returns:
+        List of dictionaries with model information, or None if the
+        self-hosted endpoint could not be reached
+    """
+    if provider_id == "llama":
+        api_endpoint = api_endpoint or settings.LLAMA_API_ENDPOINT
+        provider = LLMProviderFactory.get_cached_provider(
+            provider_id=provider_id, api_key=api_key, api_endpoint=api_endpoint
+        )
+        if provider is None:
+            provider = await asyncio.to_thread(
+                LLMProviderFactory.create_provider,
+                provider_id=provider_id,
+                api_key=api_key,
+                api_endpoint=api_endpoint
+            )
+        return await provider.afetch_models(http_client)
+    
+    return await asyncio.to_thread(get_provider_models, provider_id, api_key)
+
+
+async def aget_all_provider_models(
+    http_client: httpx.AsyncClient
+) -> Dict[str, Optional[Sequence[Dict[str, Any]]]]:
+    """
+    Get the models of every available provider concurrently.
+    
+    A slow self-hosted endpoint then bounds the total latency instead of
+    adding to it.
+    
+    Args:
+        http_client: Shared async HTTP client
+        
+    Returns:
+        Mapping of provider ID to its models, or None for a provider whose
+        models could not be fetched
+    """
+    provider_ids = [p["id"] for p in get_available_providers()]
+    results = await asyncio.gather(
+        *(aget_provider_models(http_client, pid) for pid in provider_ids),
+        return_exceptions=True
+    )
+    return {
+        pid: None if isinstance(result, Exception) else result
+        for pid, result in zip(provider_ids, results, strict=True)
+    }
+
+
+async def acheck_provider_credentials(
+    http_client: httpx.AsyncClient,
+    provider_id: str,
+    api_key: Optional[str] = None,
+    api_endpoint: Optional[str] = None
+) -> ProviderStatus:
+    """
+    Async variant of `check_provider_credentials`.
+    
+    Args:
+        http_client: Shared async HTTP client
+        provider_id: The ID of the provider
+        api_key: API key to check
+        api_endpoint: API endpoint for self-hosted providers
+        
+    Returns:
+        ProviderStatus.HEALTHY if the credentials work, otherwise the failure status
+    """
+    if provider_id == "llama":
+        models = await aget_provider_models(
+            http_client, provider_id, api_key=api_key, api_endpoint=api_endpoint
+        )
+        if models is None:
+            return ProviderStatus.UNAVAILABLE
+        return ProviderStatus.HEALTHY
+    
+    return await asyncio.to_thread(
+        check_provider_credentials, provider_id, api_key, api_endpoint
+    )
+
+
+async def _agenerate(
+    messages: List[Dict[str, str]],
+    provider_id: str,
+    model_id: Optional[str],
+    temperature: float
+) -> str:
+    """Call the provider's async API, mapping errors like `generate_chat_response`."""
+    try:
+        provider, model_id = await _aresolve_provider(provider_id, model_id)
+        return await provider.agenerate_chat_response(
+            messages=messages,
+            model_id=model_id,
+            temperature=temperature
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error generating response: {str(e)}"
+        ) from e
+
+
+async def agenerate_chat_response(
+    messages: List[Dict[str, str]],
+    provider_id: str = "openai",
+    model_id: Optional[str] = None,
+    temperature: float = 0.0
+) -> str:
+    """
+    Async variant of `generate_chat_response`.
+    
+    The request runs on the provider's async client, so waiting on the LLM
+    does not hold a worker thread. Chat APIs take one conversation per call,
+    so concurrent requests cannot share an upstream batch. Identical
+    deterministic (temperature 0) requests arriving while one is in flight
+    can share its answer, though, so they await that call instead of issuing
+    their own.
+    
+    Args:
+        messages: List of message objects (role, content)
+        provider_id: The LLM provider to use
+        model_id: The specific model ID to use
+        temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+        
+    Returns:
+        The generated response text
+    """
+    if temperature:
+        return await _agenerate(messages, provider_id, model_id, temperature)
+    
+    key = (provider_id, model_id, orjson.dumps(messages))
+    call = _inflight_responses.get(key)
+    if call is None:
+        call = asyncio.ensure_future(
+            _agenerate(messages, provider_id, model_id, temperature)
+        )
+        _inflight_responses[key] = call
+        call.add_done_callback(lambda _: _inflight_responses.pop(key, None))
+    
+    # Shielded so one caller going away does not cancel the call for the rest
+    return await asyncio.shield(call)
+
+
+async def generate_chat_response_stream(
+    messages: List[Dict[str, str]],
+    provider_id: str = "openai",
+    model_id: Optional[str] = None,
+    temperature: float = 0.0
+) -> AsyncIterator[str]:
+    """
+    Generate a response, yielding the text in chunks as it is produced.
+    
+    Chunks come straight from the provider's async streaming API, so callers
+    can forward them before the whole response is generated.
+    
+    Args:
+        messages: List of message objects (role, content)
+        provider_id: The LLM provider to use
+        model_id: The specific model ID to use
+        temperature: Controls randomness (0.0 = deterministic, 1.0 = creative)
+        
+    Yields:
+        Consecutive pieces of the generated response text
+    """
+    try:
+        provider, model_id = await _aresolve_provider(provider_id, model_id)
+        async for chunk in provider.astream_chat_response(
+            messages=messages,
+            model_id=model_id,
+            temperature=temperature
+        ):
+            yield chunk
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error generating response: {str(e)}"
+        ) from e
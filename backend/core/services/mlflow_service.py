@@ -3,104 +3,387 @@ Service module for MLflow API interactions.
 Provides functions to interact with MLflow API endpoints.
 """
 
+import functools
+import heapq
+import logging
+import orjson
+import threading
 import time
 import requests
-import json
-import traceback
-from typing import Optional, Tuple, Dict, List, Any
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Callable, Iterator, Optional, Tuple, Dict, List, Any
 from backend.core.config import settings
 
+logger = logging.getLogger("mlflow_service")
+
+# Shared session so MLflow calls reuse keep-alive connections; replaced by
+# `_http` once it has been idle for MLFLOW_SESSION_IDLE_TIMEOUT
+_session: Optional[requests.Session] = None
+_session_used = 0.0
+_session_lock = threading.Lock()
+
+# (connect, read) seconds for MLflow calls that do not pass their own timeout,
+# so a hung server cannot hold a worker thread forever
+_TIMEOUT = (5, 30)
+
+# After this many consecutive MLflow outages (connection errors, timeouts,
+# 5xx replies) calls fail fast for _BREAKER_RESET_TIMEOUT seconds
+_BREAKER_FAIL_MAX = 5
+_BREAKER_RESET_TIMEOUT = 30
+
+# Runs independent per-item MLflow requests (batch creates, per-experiment
+# run listings) concurrently
+_batch_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="mlflow-batch")
+
+# Resolved experiment names: name -> (monotonic timestamp, experiment ID)
+_experiment_ids: Dict[str, Tuple[float, str]] = {}
+# The reverse mapping: experiment ID -> (monotonic timestamp, name)
+_experiment_names: Dict[str, Tuple[float, str]] = {}
+_EXPERIMENT_ID_CACHE_SIZE = 2048
+
+# Successful read-only listings: (function name, args) -> (monotonic timestamp, result)
+_listing_cache: Dict[Tuple[str, Tuple], Tuple[float, Tuple[bool, str, List[Dict]]]] = {}
+_LISTING_CACHE_SIZE = 256
+_listing_lock = threading.Lock()
+
+# Last successful summary statistics: (monotonic timestamp, summary)
+_summary_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_summary_lock = threading.Lock()
+
+
+class _CircuitBreaker:
+    """Track consecutive MLflow outages and fail fast while MLflow is down."""
+    
+    def __init__(self, fail_max: int, reset_timeout: float):
+        self._fail_max = fail_max
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def check(self) -> None:
+        """
+        Raise if the breaker is open.
+        
+        Raises:
+            requests.ConnectionError: While the reset timeout has not passed;
+                callers already handle it like any other unreachable server
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            if time.monotonic() - self._opened_at < self._reset_timeout:
+                raise requests.ConnectionError(
+                    "MLflow is unavailable (circuit breaker open)"
+                )
+            # Half-open: let calls through again, but a single further
+            # failure reopens the breaker
+            self._opened_at = None
+            self._failures = self._fail_max - 1
+    
+    def record(self, ok: bool) -> None:
+        """Record the outcome of an MLflow call."""
+        with self._lock:
+            if ok:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self._fail_max:
+                self._opened_at = time.monotonic()
+
+
+_breaker = _CircuitBreaker(_BREAKER_FAIL_MAX, _BREAKER_RESET_TIMEOUT)
+
+
+class _MlflowSession(requests.Session):
+    """Session that applies the default timeout and the circuit breaker."""
+    
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        _breaker.check()
+        kwargs.setdefault("timeout", _TIMEOUT)
+        try:
+            res = super().request(method, url, *args, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            _breaker.record(False)
+            raise
+        _breaker.record(res.status_code < 500)
+        return res
+
+
+def _new_session() -> requests.Session:
+    """Build a pooled session that retries transient MLflow failures."""
+    # Connection failures are retried for every method, since the request
+    # never reached the server; 429/5xx replies only for idempotent methods,
+    # so a create that did reach MLflow is not repeated
+    retry = Retry(
+        total=3,
+        read=False,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False
+    )
+    # The pool is sized for the worker threads that run intent handlers
+    # concurrently
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session = _MlflowSession()
+    # requests already sends Accept-Encoding: gzip, deflate; name the client so
+    # MLflow and proxy logs can tell platform traffic apart
+    session.headers["User-Agent"] = "prodizy-platform/1.0"
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _http() -> requests.Session:
+    """
+    Get the shared MLflow session.
+    
+    Servers and proxies drop keep-alive sockets that sit idle for a while,
+    so a session unused for MLFLOW_SESSION_IDLE_TIMEOUT is closed and
+    replaced rather than handing requests stale connections.
+    """
+    global _session, _session_used
+    with _session_lock:
+        now = time.monotonic()
+        if (
+            _session is None
+            or now - _session_used > settings.MLFLOW_SESSION_IDLE_TIMEOUT
+        ):
+            if _session is not None:
+                _session.close()
+            _session = _new_session()
+        _session_used = now
+        return _session
+
+
+def _json(res: requests.Response) -> Any:
+    """
+    Decode an MLflow response body with orjson.
+    
+    Malformed bodies raise a RequestException, as `res.json()` does, so the
+    callers' error handling is unchanged.
+    """
+    try:
+        return orjson.loads(res.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.InvalidJSONError(str(e), response=res) from e
+
+
+def _cached_listing(
+    fn: Callable[..., Tuple[bool, str, List[Dict]]]
+) -> Callable[..., Tuple[bool, str, List[Dict]]]:
+    """
+    Reuse a read-only lister's successful result for MLFLOW_LISTING_TTL seconds.
+    
+    Callers get their own copy of the list, so sorting it in place does not
+    disturb the cached result.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args: Any) -> Tuple[bool, str, List[Dict]]:
+        key = (fn.__name__, args)
+        with _listing_lock:
+            cached = _listing_cache.get(key)
+        if cached and time.monotonic() - cached[0] < settings.MLFLOW_LISTING_TTL:
+            success, msg, data = cached[1]
+            return success, msg, list(data)
+        
+        success, msg, data = fn(*args)
+        if success:
+            with _listing_lock:
+                _listing_cache.pop(key, None)
+                _listing_cache[key] = (time.monotonic(), (success, msg, data))
+                if len(_listing_cache) > _LISTING_CACHE_SIZE:
+                    _listing_cache.pop(next(iter(_listing_cache)), None)
+        return success, msg, list(data)
+    return wrapper
+
+def invalidate_listing_cache() -> None:
+    """Drop cached listings so the next read sees this process's writes."""
+    with _listing_lock:
+        _listing_cache.clear()
+
+def _cached_experiment_id(exp_name: str) -> Optional[str]:
+    """Return a name's experiment ID if it was resolved within MLFLOW_NAME_CACHE_TTL."""
+    cached = _experiment_ids.get(exp_name)
+    if cached and time.monotonic() - cached[0] < settings.MLFLOW_NAME_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _cached_experiment_name(exp_id: str) -> Optional[str]:
+    """Return an experiment's name if it was resolved within MLFLOW_NAME_CACHE_TTL."""
+    cached = _experiment_names.get(exp_id)
+    if cached and time.monotonic() - cached[0] < settings.MLFLOW_NAME_CACHE_TTL:
+        return cached[1]
+    return None
+
+
+def _remember_experiment_id(exp_name: str, exp_id: str) -> None:
+    """Cache a resolved name both ways, evicting the oldest entries when full."""
+    now = time.monotonic()
+    for cache, key, value in (
+        (_experiment_ids, exp_name, exp_id),
+        (_experiment_names, exp_id, exp_name),
+    ):
+        cache.pop(key, None)
+        if len(cache) >= _EXPERIMENT_ID_CACHE_SIZE:
+            cache.pop(next(iter(cache)), None)
+        cache[key] = (now, value)
+
 def get_experiment_id_by_name(exp_name: str) -> Optional[str]:
     """
-    Get experiment ID by name from MLflow with enhanced debugging.
+    Get experiment ID by name from MLflow.
+    
+    Falls back to listing all experiments if the direct lookup fails.
     """
-    print(f"[DEBUG] Looking up experiment ID for name: '{exp_name}'")
+    logger.debug("Looking up experiment ID for name: '%s'", exp_name)
+    
+    # Names are unique and rarely change, so reuse a recent resolution
+    exp_id = _cached_experiment_id(exp_name)
+    if exp_id:
+        return exp_id
     
     try:
         # First, try direct lookup with the API
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/get-by-name"
         params = {"experiment_name": exp_name}
-        
-        print(f"[DEBUG] Making request to: {url} with params: {params}")
-        
-        res = requests.get(url, params=params, timeout=10)
-        
-        print(f"[DEBUG] API response code: {res.status_code}")
+        res = _http().get(url, params=params, timeout=10)
         if res.status_code != 200:
-            print(f"[DEBUG] API error response: {res.text}")
+            logger.debug("get-by-name returned %s: %.200s", res.status_code, res.text)
         
         if res.ok:
-            data = res.json()
+            data = _json(res)
             exp_id = data["experiment"]["experiment_id"]
-            print(f"[DEBUG] Found experiment ID: {exp_id}")
+            logger.debug("Found experiment ID: %s", exp_id)
+            _remember_experiment_id(exp_name, exp_id)
             return exp_id
         
         # List all experiments as fallback
-        print("[DEBUG] Direct lookup failed, listing all experiments as fallback")
+        logger.debug("Direct lookup failed, listing all experiments as fallback")
         list_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/list"
-        list_res = requests.get(list_url, timeout=10)
+        list_res = _http().get(list_url, timeout=10)
         
         if list_res.ok:
-            experiments = list_res.json().get("experiments", [])
-            print(f"[DEBUG] Found {len(experiments)} total experiments")
+            experiments = _json(list_res).get("experiments", [])
             
             # Try exact match first
             for exp in experiments:
-                print(f"[DEBUG] Comparing '{exp.get('name')}' with '{exp_name}'")
                 if exp.get("name") == exp_name:
-                    print(f"[DEBUG] Found exact match with ID: {exp.get('experiment_id')}")
+                    _remember_experiment_id(exp_name, exp.get("experiment_id"))
                     return exp.get("experiment_id")
-            
-            print("[DEBUG] No matching experiment found")
         else:
-            print(f"[DEBUG] Failed to list experiments. Status: {list_res.status_code}")
+            logger.debug("Failed to list experiments. Status: %s", list_res.status_code)
         
     except requests.RequestException as e:
-        print(f"[DEBUG] Request exception: {str(e)}")
-    except Exception as e:
-        print(f"[DEBUG] Unexpected error in get_experiment_id_by_name: {str(e)}")
-        traceback.print_exc()
+        logger.warning("Request error looking up experiment '%s': %s", exp_name, e)
+    except Exception:
+        logger.exception("Unexpected error in get_experiment_id_by_name")
     
-    print(f"[DEBUG] No experiment found with name: '{exp_name}'")
+    logger.debug("No experiment found with name: '%s'", exp_name)
     return None
 
-def get_experiment_by_id(experiment_id: str) -> Tuple[bool, str, Optional[Dict]]:
+def resolve_experiment_by_name(
+    exp_name: str
+) -> Tuple[bool, str, Optional[str], List[Dict]]:
     """
-    Get experiment details by ID from MLflow with enhanced debugging.
+    Resolve an experiment name to its ID, listing experiments on a miss.
+    
+    A hit costs one lookup. A miss costs one more search request, whose
+    results both settle the match and tell the user what does exist.
+    
+    Args:
+        exp_name: The exact experiment name
+        
+    Returns:
+        Tuple of (success, message, experiment_id, experiments); experiment_id
+        is None and experiments holds the search results when the name was
+        not found
     """
-    print(f"[DEBUG] Getting experiment details for ID: '{experiment_id}'")
+    exp_id = _cached_experiment_id(exp_name)
+    if exp_id:
+        return True, "Experiment found", exp_id, []
     
     try:
-        url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/get"
-        params = {"experiment_id": experiment_id}
-        
-        print(f"[DEBUG] Making request to: {url} with params: {params}")
+        url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/get-by-name"
+        res = _http().get(url, params={"experiment_name": exp_name}, timeout=10)
+        if res.ok:
+            exp_id = _json(res)["experiment"]["experiment_id"]
+            _remember_experiment_id(exp_name, exp_id)
+            return True, "Experiment found", exp_id, []
         
-        res = requests.get(url, params=params, timeout=10)
+        search_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/search"
+        search_res = _http().post(search_url, json={"max_results": 100}, timeout=10)
+        if not search_res.ok:
+            return (
+                False,
+                "Failed to list available experiments. "
+                f"Status: {search_res.status_code}",
+                None,
+                [],
+            )
         
-        print(f"[DEBUG] API response code: {res.status_code}")
-        if res.status_code != 200:
-            print(f"[DEBUG] API error response: {res.text}")
+        experiments = _json(search_res).get("experiments", [])
+        for exp in experiments:
+            if exp.get("name") == exp_name:
+                _remember_experiment_id(exp_name, exp.get("experiment_id"))
+                return True, "Experiment found", exp.get("experiment_id"), []
+        return True, f"No experiment found named '{exp_name}'", None, experiments
+    except requests.RequestException as e:
+        return False, f"Error listing experiments: {str(e)}", None, []
+
+def get_experiment_by_id(experiment_id: str) -> Tuple[bool, str, Optional[Dict]]:
+    """
+    Get experiment details by ID from MLflow.
+    """
+    try:
+        url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/get"
+        params = {"experiment_id": experiment_id}
+        res = _http().get(url, params=params, timeout=10)
         
         if res.ok:
-            data = res.json()
-            print(f"[DEBUG] Got experiment details: {json.dumps(data, indent=2)[:200]}...")
-            return True, "Experiment details retrieved successfully", data["experiment"]
+            # Log the raw body: a sliced string needs no re-serialization
+            logger.debug("Got experiment details: %.200s", res.text)
+            data = _json(res)
+            experiment = data["experiment"]
+            if experiment.get("name"):
+                _remember_experiment_id(experiment["name"], experiment_id)
+            return True, "Experiment details retrieved successfully", experiment
         
         error_message = f"Failed to retrieve experiment details: {res.text}"
-        print(f"[DEBUG] {error_message}")
+        logger.debug(error_message)
         return False, error_message, None
         
     except requests.RequestException as e:
         error_message = f"Request error: {str(e)}"
-        print(f"[DEBUG] {error_message}")
+        logger.warning(error_message)
         return False, error_message, None
     except Exception as e:
         error_message = f"Unexpected error in get_experiment_by_id: {str(e)}"
-        print(f"[DEBUG] {error_message}")
-        traceback.print_exc()
+        logger.exception(error_message)
         return False, error_message, None
 
+
+def get_experiment_name(experiment_id: str) -> Optional[str]:
+    """
+    Get an experiment's name by ID, reusing recently resolved names.
+    
+    Args:
+        experiment_id: The experiment ID
+        
+    Returns:
+        The experiment name, or None if it could not be retrieved
+    """
+    exp_name = _cached_experiment_name(experiment_id)
+    if exp_name is not None:
+        return exp_name
+    success, _, experiment = get_experiment_by_id(experiment_id)
+    if success:
+        return experiment.get("name")
+    return None
+
 def create_experiment(experiment_name: str) -> Tuple[bool, str]:
     """
     Create a new experiment in MLflow.
@@ -115,9 +398,10 @@ def create_experiment(experiment_name: str) -> Tuple[bool, str]:
     headers = {"Content-Type": "application/json"}
     payload = {"name": experiment_name}
     try:
-        mlflow_res = requests.post(create_url, json=payload, headers=headers)
+        mlflow_res = _http().post(create_url, json=payload, headers=headers)
         if mlflow_res.ok:
-            mlflow_data = mlflow_res.json()
+            invalidate_listing_cache()
+            mlflow_data = _json(mlflow_res)
             exp_id = mlflow_data.get("experiment_id", "UNKNOWN")
             return True, exp_id
         else:
@@ -143,9 +427,9 @@ def create_run(experiment_id: str, run_name: Optional[str] = None) -> Tuple[bool
         run_payload["tags"] = [{"key": "mlflow.runName", "value": run_name}]
 
     try:
-        run_res = requests.post(run_url, json=run_payload, headers=headers)
+        run_res = _http().post(run_url, json=run_payload, headers=headers)
         if run_res.ok:
-            run_data = run_res.json()
+            run_data = _json(run_res)
             run_id = run_data["run"]["info"]["run_id"]
             return True, f"Run created in experiment {experiment_id}, run_id: {run_id}", run_id
         else:
@@ -153,30 +437,107 @@ def create_run(experiment_id: str, run_name: Optional[str] = None) -> Tuple[bool
     except requests.RequestException as e:
         return False, str(e), None
 
-def log_param(run_id: str, key: str, value: str) -> Tuple[bool, str]:
+def log_batch(
+    run_id: str,
+    metrics: Optional[List[Dict[str, Any]]] = None,
+    params: Optional[List[Dict[str, str]]] = None,
+    tags: Optional[List[Dict[str, str]]] = None
+) -> Tuple[bool, str]:
     """
-    Log a parameter to a run in MLflow.
+    Log metrics, parameters and tags to a run in a single MLflow request.
     
     Args:
         run_id: The run ID to log to
-        key: Parameter name
-        value: Parameter value
+        metrics: Dicts with "key", "value" and optionally "step" and
+            "timestamp" (milliseconds; defaults to now)
+        params: Dicts with "key" and "value"
+        tags: Dicts with "key" and "value"
         
     Returns:
         Tuple of (success, message)
     """
-    url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/log-parameter"
-    payload = {"run_id": run_id, "key": key, "value": value}
+    url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/log-batch"
+    # One timestamp for the whole batch; MLflow expects milliseconds
+    now_ms = int(time.time() * 1000)
+    payload = {
+        "run_id": run_id,
+        "metrics": [
+            {
+                "key": m["key"],
+                "value": m["value"],
+                "timestamp": m.get("timestamp", now_ms),
+                "step": m.get("step", 0),
+            }
+            for m in metrics or ()
+        ],
+        "params": list(params or ()),
+        "tags": list(tags or ()),
+    }
     headers = {"Content-Type": "application/json"}
     try:
-        res = requests.post(url, json=payload, headers=headers)
+        res = _http().post(url, json=payload, headers=headers)
         if res.ok:
-            return True, f"Logged param '{key}':'{value}' to run {run_id}"
+            return True, (
+                f"Logged {len(payload['metrics'])} metrics, "
+                f"{len(payload['params'])} params and "
+                f"{len(payload['tags'])} tags to run {run_id}"
+            )
         else:
             return False, res.text
     except requests.RequestException as e:
         return False, str(e)
 
+def log_params(run_id: str, params: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Log several parameters to a run in one request.
+    
+    Args:
+        run_id: The run ID to log to
+        params: Parameter names mapped to their values
+        
+    Returns:
+        Tuple of (success, message)
+    """
+    return log_batch(
+        run_id, params=[{"key": k, "value": str(v)} for k, v in params.items()]
+    )
+
+def log_metrics(
+    run_id: str, metrics: Dict[str, float], step: Optional[int] = 0
+) -> Tuple[bool, str]:
+    """
+    Log several metrics at one step to a run in one request.
+    
+    Args:
+        run_id: The run ID to log to
+        metrics: Metric names mapped to their values
+        step: Step number (default: 0)
+        
+    Returns:
+        Tuple of (success, message)
+    """
+    return log_batch(
+        run_id,
+        metrics=[{"key": k, "value": v, "step": step} for k, v in metrics.items()]
+    )
+
+def log_param(run_id: str, key: str, value: str) -> Tuple[bool, str]:
+    """
+    Log a parameter to a run in MLflow.
+    
+    Args:
+        run_id: The run ID to log to
+        key: Parameter name
+        value: Parameter value
+        
+    Returns:
+        Tuple of (success, message)
+    """
+    success, msg = log_batch(run_id, params=[{"key": key, "value": value}])
+    if success:
+        return True, f"Logged param '{key}':'{value}' to run {run_id}"
+    return False, msg
+
 def log_metric(run_id: str, key: str, value: float, step: Optional[int] = 0) -> Tuple[bool, str]:
     """
     Log a metric to a run in MLflow.
@@ -190,17 +551,12 @@ def log_metric(run_id: str, key: str, value: float, step: Optional[int] = 0) ->
     Returns:
         Tuple of (success, message)
     """
-    url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/log-metric"
-    payload = {"run_id": run_id, "key": key, "value": value, "timestamp": int(time.time()), "step": step}
-    headers = {"Content-Type": "application/json"}
-    try:
-        res = requests.post(url, json=payload, headers=headers)
-        if res.ok:
-            return True, f"Logged metric '{key}':{value} to run {run_id} at step {step}"
-        else:
-            return False, res.text
-    except requests.RequestException as e:
-        return False, str(e)
+    success, msg = log_batch(
+        run_id, metrics=[{"key": key, "value": value, "step": step}]
+    )
+    if success:
+        return True, f"Logged metric '{key}':{value} to run {run_id} at step {step}"
+    return False, msg
 
 def delete_experiment(experiment_id: str) -> Tuple[bool, str]:
     """
@@ -216,8 +572,14 @@ def delete_experiment(experiment_id: str) -> Tuple[bool, str]:
     headers = {"Content-Type": "application/json"}
     payload = {"experiment_id": experiment_id}
     try:
-        res = requests.post(delete_url, json=payload, headers=headers)
+        res = _http().post(delete_url, json=payload, headers=headers)
         if res.ok:
+            # A deleted experiment's name no longer resolves to it
+            for name, (_, exp_id) in list(_experiment_ids.items()):
+                if exp_id == experiment_id:
+                    _experiment_ids.pop(name, None)
+            _experiment_names.pop(experiment_id, None)
+            invalidate_listing_cache()
             return True, f"Experiment {experiment_id} was deleted."
         else:
             return False, res.text
@@ -238,7 +600,7 @@ def delete_run(run_id: str) -> Tuple[bool, str]:
     headers = {"Content-Type": "application/json"}
     payload = {"run_id": run_id}
     try:
-        res = requests.post(delete_url, json=payload, headers=headers)
+        res = _http().post(delete_url, json=payload, headers=headers)
         if res.ok:
             return True, f"Run {run_id} was deleted."
         else:
@@ -248,6 +610,7 @@ def delete_run(run_id: str) -> Tuple[bool, str]:
     
 
 
+@_cached_listing
 def list_experiments() -> Tuple[bool, str, List[Dict]]:
     """
     List all experiments in MLflow.
@@ -257,9 +620,9 @@ def list_experiments() -> Tuple[bool, str, List[Dict]]:
     """
     try:
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/experiments/list"
-        res = requests.get(url)
+        res = _http().get(url)
         if res.ok:
-            data = res.json()
+            data = _json(res)
             return True, "Experiments retrieved successfully", data.get("experiments", [])
         return False, f"Failed to list experiments: {res.text}", []
     except requests.RequestException as e:
@@ -278,42 +641,131 @@ def list_runs(experiment_id: str) -> Tuple[bool, str, List[Dict]]:
     try:
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/search"
         payload = {"experiment_ids": [experiment_id]}
-        res = requests.post(url, json=payload)
+        res = _http().post(url, json=payload)
         if res.ok:
-            data = res.json()
+            data = _json(res)
             return True, "Runs retrieved successfully", data.get("runs", [])
         return False, f"Failed to list runs: {res.text}", []
     except requests.RequestException as e:
         return False, f"Request error: {str(e)}", []
 
+def count_runs(experiment_id: str, page_size: int = 500) -> Tuple[bool, str, int]:
+    """
+    Count the runs of an experiment in MLflow.
+    
+    The runs are paged through with page_token and only counted, so no more
+    than one page of run payloads is held at a time.
+    
+    Args:
+        experiment_id: The experiment ID to count runs for
+        page_size: Runs requested per page
+        
+    Returns:
+        Tuple of (success, message, run_count)
+    """
+    url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/search"
+    payload: Dict[str, Any] = {
+        "experiment_ids": [experiment_id],
+        "max_results": page_size
+    }
+    run_count = 0
+    try:
+        while True:
+            res = _http().post(url, json=payload)
+            if not res.ok:
+                return False, f"Failed to count runs: {res.text}", 0
+            data = _json(res)
+            run_count += len(data.get("runs", ()))
+            page_token = data.get("next_page_token")
+            if not page_token:
+                return True, "Runs counted successfully", run_count
+            payload["page_token"] = page_token
+    except requests.RequestException as e:
+        return False, f"Request error: {str(e)}", 0
+
+def search_runs(
+    experiment_ids: List[str],
+    max_results: int = 100,
+    order_by: Optional[List[str]] = None
+) -> Tuple[bool, str, List[Dict]]:
+    """
+    Search runs across several experiments, sorted and limited by MLflow.
+    
+    Args:
+        experiment_ids: The experiment IDs to search
+        max_results: Maximum number of runs to return
+        order_by: MLflow order-by clauses, e.g. ["attributes.start_time DESC"]
+        
+    Returns:
+        Tuple of (success, message, runs_list)
+    """
+    try:
+        url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/runs/search"
+        payload = {
+            "experiment_ids": experiment_ids,
+            "max_results": max_results,
+            "order_by": order_by or []
+        }
+        res = _http().post(url, json=payload)
+        if res.ok:
+            data = _json(res)
+            return True, "Runs retrieved successfully", data.get("runs", [])
+        return False, f"Failed to search runs: {res.text}", []
+    except requests.RequestException as e:
+        return False, f"Request error: {str(e)}", []
+
 def get_mlflow_summary_stats() -> Dict[str, Any]:
     """
     Get summary statistics about MLflow experiments and models.
     
+    Collecting them lists the runs of every experiment, so a successful result
+    is reused for MLFLOW_SUMMARY_TTL seconds; its timestamp says how old it is.
+    
     Returns:
         Dictionary with summary statistics
     """
+    global _summary_cache
+    # Concurrent callers wait for one collection instead of each running it
+    with _summary_lock:
+        if (
+            _summary_cache
+            and time.monotonic() - _summary_cache[0] < settings.MLFLOW_SUMMARY_TTL
+        ):
+            return dict(_summary_cache[1])
+        summary = _collect_mlflow_summary_stats()
+        if "error" not in summary:
+            _summary_cache = (time.monotonic(), summary)
+        return dict(summary)
+
+def _list_runs_concurrently(
+    experiments: List[Dict[str, Any]]
+) -> Iterator[Tuple[bool, str, List[Dict]]]:
+    """Call `list_runs` for every experiment at once, yielding results in order."""
+    return _batch_pool.map(
+        list_runs, [exp.get("experiment_id") for exp in experiments]
+    )
+
+def _collect_mlflow_summary_stats() -> Dict[str, Any]:
+    """Query MLflow for the statistics returned by get_mlflow_summary_stats."""
     try:
         # Get experiment count
         exp_success, _, experiments = list_experiments()
         experiment_count = len(experiments) if exp_success else 0
         
-        # Get registered model count
-        models_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/registered-models/list"
-        models_res = requests.get(models_url)
-        registered_models = []
-        if models_res.ok:
-            registered_models = models_res.json().get("registered_models", [])
+        # Get registered model count (an empty list if the request failed)
+        _, _, registered_models = get_registered_models()
         
         # Get total run count across all experiments
         total_runs = 0
         active_runs = 0
-        for exp in experiments:
-            exp_id = exp.get("experiment_id")
-            runs_success, _, runs = list_runs(exp_id)
+        for runs_success, _, runs in _list_runs_concurrently(experiments):
             if runs_success:
                 total_runs += len(runs)
-                active_runs += sum(1 for r in runs if r.get("info", {}).get("status") == "RUNNING")
+                # MLflow always returns a run's info, so index it directly
+                # instead of building a default dict per run
+                active_runs += sum(
+                    1 for r in runs if r["info"].get("status") == "RUNNING"
+                )
         
         return {
             "experiment_count": experiment_count,
@@ -328,6 +780,7 @@ def get_mlflow_summary_stats() -> Dict[str, Any]:
             "timestamp": time.time()
         }
 
+@_cached_listing
 def get_model_versions(model_name: str) -> Tuple[bool, str, List[Dict]]:
     """
     Get versions for a specific registered model.
@@ -341,16 +794,17 @@ def get_model_versions(model_name: str) -> Tuple[bool, str, List[Dict]]:
     try:
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/model-versions/search"
         payload = {"filter": f"name='{model_name}'"}
-        res = requests.post(url, json=payload)
+        res = _http().post(url, json=payload)
         
         if res.ok:
-            data = res.json()
+            data = _json(res)
             versions = data.get("model_versions", [])
             return True, f"Found {len(versions)} versions for model '{model_name}'", versions
         return False, f"Failed to get model versions: {res.text}", []
     except requests.RequestException as e:
         return False, f"Request error: {str(e)}", []
 
+@_cached_listing
 def get_registered_models() -> Tuple[bool, str, List[Dict]]:
     """
     Get all registered models from MLflow.
@@ -360,10 +814,10 @@ def get_registered_models() -> Tuple[bool, str, List[Dict]]:
     """
     try:
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/registered-models/list"
-        res = requests.get(url)
+        res = _http().get(url)
         
         if res.ok:
-            data = res.json()
+            data = _json(res)
             models = data.get("registered_models", [])
             return True, f"Found {len(models)} registered models", models
         return False, f"Failed to get registered models: {res.text}", []
@@ -387,17 +841,17 @@ def get_model_details(model_name: str, version: Optional[str] = None) -> Tuple[b
             success, _, versions = get_model_versions(model_name)
             if not success or not versions:
                 return False, f"No versions found for model '{model_name}'", {}
-            # Get the latest version
-            versions.sort(key=lambda v: int(v.get("version", 0)), reverse=True)
-            version = versions[0].get("version")
+            # Get the latest version; a single pass instead of a full sort
+            latest = max(versions, key=lambda v: int(v.get("version") or 0))
+            version = latest.get("version")
         
         # Get details for the specific version
         url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/model-versions/get"
         params = {"name": model_name, "version": version}
-        res = requests.get(url, params=params)
+        res = _http().get(url, params=params)
         
         if res.ok:
-            data = res.json().get("model_version", {})
+            data = _json(res).get("model_version", {})
             return True, f"Retrieved details for {model_name} version {version}", data
         return False, f"Failed to get model details: {res.text}", {}
     except requests.RequestException as e:
@@ -414,19 +868,16 @@ def get_recently_updated_models(limit: int = 5) -> Tuple[bool, str, List[Dict]]:
         Tuple of (success, message, models)
     """
     try:
-        success, _, models = get_registered_models()
-        if not success or not models:
-            return False, "No registered models found", []
-        
-        # Sort by last updated timestamp (descending)
-        sorted_models = sorted(
-            models,
-            key=lambda m: m.get("last_updated_timestamp", 0),
-            reverse=True
-        )
+        # Let MLflow sort and limit, rather than downloading every model
+        url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/registered-models/search"
+        params = {"max_results": limit, "order_by": "last_updated_timestamp DESC"}
+        res = _http().get(url, params=params)
+        if not res.ok:
+            return False, f"Failed to search registered models: {res.text}", []
         
-        # Take the top N models
-        top_models = sorted_models[:limit]
+        top_models = _json(res).get("registered_models", [])
+        if not top_models:
+            return False, "No registered models found", []
         
         return True, f"Retrieved {len(top_models)} recently updated models", top_models
     except Exception as e:
@@ -442,15 +893,16 @@ def batch_create_experiments(experiment_names: List[str]) -> List[Dict[str, Any]
     Returns:
         List of dictionaries with experiment creation results
     """
-    results = []
-    for name in experiment_names:
+    def create_one(name: str) -> Dict[str, Any]:
         success, result = create_experiment(name)
-        results.append({
+        return {
             "experiment_name": name,
             "success": success,
             "result": result
-        })
-    return results
+        }
+    
+    # MLflow has no bulk create endpoint; issue the creates side by side
+    return list(_batch_pool.map(create_one, experiment_names))
 
 def get_runs_with_model_info(experiment_id: str) -> Tuple[bool, str, List[Dict]]:
     """
@@ -467,18 +919,20 @@ def get_runs_with_model_info(experiment_id: str) -> Tuple[bool, str, List[Dict]]
         if not success:
             return False, msg, []
         
+        # Get artifacts for every run at once
+        artifacts_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/artifacts/list"
+        
+        def list_artifacts(run: Dict[str, Any]) -> requests.Response:
+            params = {"run_id": run.get("info", {}).get("run_id")}
+            return _http().get(artifacts_url, params=params)
+        
         enhanced_runs = []
-        for run in runs:
-            run_id = run.get("info", {}).get("run_id")
-            
-            # Get artifacts for this run
-            artifacts_url = f"{settings.MLFLOW_TRACKING_URI}/api/2.0/mlflow/artifacts/list"
-            params = {"run_id": run_id}
-            artifacts_res = requests.get(artifacts_url, params=params)
-            
+        for run, artifacts_res in zip(
+            runs, _batch_pool.map(list_artifacts, runs), strict=True
+        ):
             model_info = {}
             if artifacts_res.ok:
-                artifacts = artifacts_res.json().get("files", [])
+                artifacts = _json(artifacts_res).get("files", [])
                 # Check for MLmodel file which indicates a model was logged
                 model_files = [a for a in artifacts if a.get("path", "").endswith("MLmodel")]
                 if model_files:
@@ -517,91 +971,70 @@ def get_recently_used_models(limit: int = 5) -> Tuple[bool, str, List[Dict]]:
         if not exp_success:
             return False, "Failed to retrieve experiments", []
         
-        # Collect recent runs with model references
-        all_recent_runs = []
-        for exp in experiments:
-            exp_id = exp.get("experiment_id")
-            runs_success, _, runs = list_runs(exp_id)
-            if runs_success:
-                all_recent_runs.extend(runs)
-        
-        # Sort by start time (most recent first)
-        all_recent_runs.sort(
-            key=lambda r: int(r.get("info", {}).get("start_time", 0)),
-            reverse=True
-        )
+        # Take the most recent runs (up to 100) across all experiments in one
+        # search, sorted and limited by MLflow
+        top_recent_runs = []
+        if experiments:
+            runs_success, runs_message, top_recent_runs = search_runs(
+                [exp.get("experiment_id") for exp in experiments],
+                max_results=100,
+                order_by=["attributes.start_time DESC"]
+            )
+            if not runs_success:
+                return False, runs_message, []
         
-        # Take top runs
-        top_recent_runs = all_recent_runs[:100]  # Consider up to 100 recent runs
+        # Fetch each model's versions once, in parallel, and index them by
+        # the run that produced them
+        model_names = [model.get("name") for model in models]
+        run_versions: Dict[str, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
+        for model_name, (version_success, _, versions) in zip(
+            model_names, _batch_pool.map(get_model_versions, model_names), strict=True
+        ):
+            if version_success:
+                for version in versions:
+                    run_versions[version.get("run_id")].append((model_name, version))
         
-        # For each run, check if it has model references
+        # For each run, look up the model versions associated with it
         for run in top_recent_runs:
-            run_id = run.get("info", {}).get("run_id")
+            info = run.get("info", {})
+            run_id = info.get("run_id")
+            run_models = run_versions.get(run_id)
+            if not run_models:
+                continue
             
-            # Look for model versions associated with this run
-            for model in models:
-                model_name = model.get("name")
+            # Parsed once per run rather than once per model version
+            start_time = int(info.get("start_time", 0))
+            for model_name, version in run_models:
+                usage = model_usage.get(model_name)
+                if usage is None:
+                    usage = model_usage[model_name] = {
+                        "name": model_name,
+                        "recent_runs": [],
+                        "latest_timestamp": 0
+                    }
                 
-                # Get versions for this model
-                version_success, _, versions = get_model_versions(model_name)
-                if version_success:
-                    # Check if any version is associated with this run
-                    for version in versions:
-                        if version.get("run_id") == run_id:
-                            # This run is associated with this model
-                            if model_name not in model_usage:
-                                model_usage[model_name] = {
-                                    "name": model_name,
-                                    "recent_runs": [],
-                                    "latest_timestamp": 0
-                                }
-                            
-                            # Add run info to model usage
-                            start_time = int(run.get("info", {}).get("start_time", 0))
-                            model_usage[model_name]["recent_runs"].append({
-                                "run_id": run_id,
-                                "timestamp": start_time,
-                                "version": version.get("version")
-                            })
-                            
-                            # Update latest timestamp if newer
-                            if start_time > model_usage[model_name]["latest_timestamp"]:
-                                model_usage[model_name]["latest_timestamp"] = start_time
-        
-        # Sort models by latest timestamp
-        sorted_models = sorted(
+                # Add run info to model usage
+                usage["recent_runs"].append({
+                    "run_id": run_id,
+                    "timestamp": start_time,
+                    "version": version.get("version")
+                })
+                
+                # Update latest timestamp if newer
+                if start_time > usage["latest_timestamp"]:
+                    usage["latest_timestamp"] = start_time
+        
+        # Take the top N models by latest timestamp
+        top_models = heapq.nlargest(
+            limit,
             model_usage.values(),
-            key=lambda m: m.get("latest_timestamp", 0),
-            reverse=True
+            key=lambda m: m.get("latest_timestamp", 0)
         )
         
-        # Take top N models
-        top_models = sorted_models[:limit]
-        
         return True, f"Retrieved {len(top_models)} recently used models", top_models
     except Exception as e:
         return False, f"Error retrieving recently used models: {str(e)}", []
     
-def batch_create_experiments(experiment_names: List[str]) -> List[Dict[str, Any]]:
-    """
-    Create multiple experiments in MLflow.
-    
-    Args:
-        experiment_names: List of names for new experiments
-        
-    Returns:
-        List of dictionaries with experiment creation results
-    """
-    results = []
-    for name in experiment_names:
-        success, result = create_experiment(name)
-        results.append({
-            "experiment_name": name,
-            "success": success,
-            "result": result
-        })
-    return results
-
 def batch_create_runs(experiment_id: str, run_names: List[str]) -> List[Dict[str, Any]]:
     """
     Create multiple runs in an MLflow experiment.
@@ -613,13 +1046,14 @@ def batch_create_runs(experiment_id: str, run_names: List[str]) -> List[Dict[str
     Returns:
         List of dictionaries with run creation results
     """
-    results = []
-    for name in run_names:
+    def create_one(name: str) -> Dict[str, Any]:
         success, msg, run_id = create_run(experiment_id, name)
-        results.append({
+        return {
             "run_name": name,
             "success": success,
             "message": msg,
             "run_id": run_id if success else None
-        })
-    return results
\ No newline at end of file
+        }
+    
+    # MLflow has no bulk create endpoint; issue the creates side by side
+    return list(_batch_pool.map(create_one, run_names))
@@ -0,0 +1,129 @@
+"""
+On-disk cache of provider model catalogs.
+Serves the last synced model list and refreshes it in the background once it
+is older than MODEL_CATALOG_TTL (stale-while-revalidate).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+import httpx
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from backend.core.config import settings
+from .llm_service import aget_provider_models
+
+logger = logging.getLogger("model_catalog")
+
+# In-flight background refreshes per provider, so an expired catalog is
+# re-synced once no matter how many callers see it
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _cache_paths(provider_id: str) -> Tuple[Path, Path]:
+    """Get the catalog file and `.last_sync` marker paths for a provider."""
+    cache_dir = Path(settings.MODEL_CATALOG_DIR).expanduser()
+    return (
+        cache_dir / f"{provider_id}_models.json",
+        cache_dir / f"{provider_id}_models.last_sync",
+    )
+
+
+def _read_cache(
+    provider_id: str, api_endpoint: Optional[str]
+) -> Optional[Tuple[List[Dict[str, Any]], float]]:
+    """
+    Read a cached catalog.
+
+    Args:
+        provider_id: The ID of the provider
+        api_endpoint: Endpoint the catalog must have been synced from
+
+    Returns:
+        Tuple of (models, last sync timestamp), or None on a cache miss
+    """
+    catalog_path, marker_path = _cache_paths(provider_id)
+    try:
+        synced_at = marker_path.stat().st_mtime
+        with open(catalog_path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    # A catalog synced from a different endpoint does not describe this one
+    if cached.get("endpoint") != api_endpoint:
+        return None
+    return cached.get("models", []), synced_at
+
+
+def _write_cache(
+    provider_id: str, api_endpoint: Optional[str], models: List[Dict[str, Any]]
+) -> None:
+    """Persist a catalog and touch its `.last_sync` marker."""
+    catalog_path, marker_path = _cache_paths(provider_id)
+    try:
+        catalog_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = catalog_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"endpoint": api_endpoint, "models": models}, f)
+        os.replace(tmp_path, catalog_path)
+        marker_path.touch()
+    except OSError as e:
+        logger.warning(f"Could not write {provider_id} model catalog: {str(e)}")
+
+
+async def _refresh(
+    http_client: httpx.AsyncClient,
+    provider_id: str,
+    api_key: Optional[str],
+    api_endpoint: Optional[str]
+) -> Optional[List[Dict[str, Any]]]:
+    """Fetch a provider's models and persist them if the fetch succeeded."""
+    models = await aget_provider_models(
+        http_client, provider_id, api_key=api_key, api_endpoint=api_endpoint
+    )
+    if models is not None:
+        _write_cache(provider_id, api_endpoint, models)
+    return models
+
+
+async def get_models_cached(
+    http_client: httpx.AsyncClient,
+    provider_id: str,
+    api_key: Optional[str] = None,
+    api_endpoint: Optional[str] = None
+) -> Tuple[Optional[List[Dict[str, Any]]], bool]:
+    """
+    Get a provider's models from the on-disk catalog.
+
+    A fresh catalog is returned as is. An expired one is still returned while a
+    background task re-syncs it, so upstream outages only make it staler. Only
+    a cache miss waits on the provider.
+
+    Args:
+        http_client: Shared async HTTP client
+        provider_id: The ID of the provider
+        api_key: Optional API key for the provider
+        api_endpoint: Optional API endpoint for the provider
+
+    Returns:
+        Tuple of (models, stale); models is None if there is no cached catalog
+        and the provider could not be reached
+    """
+    cached = _read_cache(provider_id, api_endpoint)
+    if cached is None:
+        models = await _refresh(http_client, provider_id, api_key, api_endpoint)
+        return models, models is None
+
+    models, synced_at = cached
+    if time.time() - synced_at < settings.MODEL_CATALOG_TTL:
+        return models, False
+
+    task = _refresh_tasks.get(provider_id)
+    if task is None or task.done():
+        _refresh_tasks[provider_id] = asyncio.create_task(
+            _refresh(http_client, provider_id, api_key, api_endpoint)
+        )
+    return models, True
\ No newline at end of file
@@ -3,15 +3,26 @@ Service module for OpenAI API interactions.
 Handles generating chat responses using the OpenAI API.
 """
 
-import openai
+import httpx
+from functools import lru_cache
+from openai import AsyncOpenAI
 from typing import List, Dict
 from fastapi import HTTPException
 from backend.core.config import settings
 
-# Configure OpenAI with API key from settings
-openai.api_key = settings.OPENAI_API_KEY
 
-def generate_chat_response(messages: List[Dict[str, str]]) -> str:
+@lru_cache(maxsize=1)
+def _client() -> AsyncOpenAI:
+    """Get the shared OpenAI client; its pool keeps connections alive between calls."""
+    return AsyncOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        http_client=httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            timeout=60
+        )
+    )
+
+async def generate_chat_response(messages: List[Dict[str, str]]) -> str:
     """
     Generate a response using OpenAI's API.
     
@@ -25,11 +36,11 @@ def generate_chat_response(messages: List[Dict[str, str]]) -> str:
         HTTPException: If there's an error with the OpenAI API
     """
     try:
-        response = openai.ChatCompletion.create(
+        response = await _client().chat.completions.create(
             model="gpt-4",
             messages=messages,
             temperature=0.0
         )
-        return response.choices[0].message["content"].strip()
+        return response.choices[0].message.content.strip()
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"OpenAI Error: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"OpenAI Error: {str(e)}")
@@ -3,19 +3,36 @@ Main application module for the FastAPI backend.
 Initializes the FastAPI application and includes routers.
 """
 
+import httpx
+import os
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from dotenv import load_dotenv
+from fastapi.responses import ORJSONResponse
 from backend.api.mlflow_router import router as mlflow_router
 from backend.api.invitation_router import router as invitation_router
 from backend.core.config import settings
 from backend.api.llm_router import router as llm_router
 
-# Load environment variables
-load_dotenv()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources on startup and release them on shutdown."""
+    # Shared async HTTP client so outbound calls reuse keep-alive connections
+    app.state.http = httpx.AsyncClient(
+        timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0),
+        limits=httpx.Limits(max_keepalive_connections=20)
+    )
+    yield
+    await app.state.http.aclose()
+
 
 # Initialize FastAPI app
-app = FastAPI(title="Prodizy Platform API Services")
+app = FastAPI(
+    title="Prodizy Platform API Services",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 # Include routers
 app.include_router(mlflow_router, prefix="/chat")
@@ -25,9 +42,23 @@ app.include_router(llm_router, prefix="/llm")
 if __name__ == "__main__":
     port = settings.API_PORT
     print(f"Starting FastAPI server on port {port}")
-    uvicorn.run(
-        "main:app",  # Use relative import when running directly
-        host="0.0.0.0", 
-        port=port,
-        reload=True
-    )
\ No newline at end of file
+    if settings.DEBUG:
+        uvicorn.run(
+            "main:app",  # Use relative import when running directly
+            host="0.0.0.0", 
+            port=port,
+            reload=True
+        )
+    else:
+        # WORKERS defaults to 1: session state is per process, so every request
+        # of a chat must reach the same worker.
+        # "auto" picks uvloop and httptools when installed (uvicorn[standard])
+        # and falls back to asyncio/h11 where they are not, e.g. on Windows.
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=settings.WORKERS or os.cpu_count(),
+            loop="auto",
+            http="auto"
+        )
@@ -2,6 +2,7 @@
 Pydantic models for chat requests and responses.
 """
 
+from dataclasses import dataclass, field
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
@@ -14,10 +15,47 @@ class ChatRequest(BaseModel):
     query: str
     invitation_code: str
     cached_intent: Optional[Dict[str, Any]] = None
+    # Stream the reply as Server-Sent Events instead of one JSON body
+    stream: bool = False
 
 
 class ChatResponse(BaseModel):
     """
     Model for chat response data.
     """
-    assistant_response: Dict[str, Any]
\ No newline at end of file
+    assistant_response: Dict[str, Any]
+
+
+@dataclass(slots=True)
+class ChatReply:
+    """
+    The LLM's parsed reply while an intent handler updates it.
+    """
+    intent: str = ""
+    confirmation: str = ""
+    message: str = ""
+    entities: Dict[str, Any] = field(default_factory=dict)
+    # Any other keys the LLM returned, passed through unchanged
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ChatReply":
+        """Build a reply from the LLM's JSON object."""
+        extra = dict(data)
+        return cls(
+            intent=extra.pop("intent", "") or "",
+            confirmation=extra.pop("confirmation", "") or "",
+            message=extra.pop("message", "") or "",
+            entities=extra.pop("entities", None) or {},
+            extra=extra,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict for the assistant_response body."""
+        return {
+            **self.extra,
+            "intent": self.intent,
+            "entities": self.entities,
+            "confirmation": self.confirmation,
+            "message": self.message,
+        }
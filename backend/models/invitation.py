@@ -2,19 +2,24 @@
 Models and utilities for invitation code management using SQLite.
 """
 
-from pydantic import BaseModel
-from typing import Dict, Optional, List, Any
+from dataclasses import dataclass, field
+from typing import Dict, Optional, List, Any, Tuple
 from datetime import datetime, timedelta
 import time
-import uuid
-import hashlib
+import secrets
 import sqlite3
-import json
-import os
+import threading
+from backend.core.config import settings
 
 
-class InvitationCode(BaseModel):
-    """Model representing an invitation code."""
+@dataclass(slots=True)
+class InvitationCode:
+    """
+    An invitation code as stored in the database.
+
+    Only ever built from trusted rows, so it is a plain dataclass rather than
+    a validated Pydantic model.
+    """
 
     code: str
     created_at: float  # Unix timestamp
@@ -22,49 +27,176 @@ class InvitationCode(BaseModel):
     max_requests: int = 10
     remaining_requests: int = 10
     is_active: bool = True
-    used_by_sessions: List[str] = []
+    used_by_sessions: List[str] = field(default_factory=list)
 
 
 class InvitationStore:
     """Store and manage invitation codes using SQLite."""
 
+    _INVITATIONS_TABLE = """
+    CREATE TABLE IF NOT EXISTS {name} (
+        code TEXT PRIMARY KEY,
+        created_at REAL,
+        expires_at REAL,
+        max_requests INTEGER,
+        remaining_requests INTEGER,
+        is_active INTEGER,
+        used_by_sessions TEXT
+    ) WITHOUT ROWID
+    """
+
+    # The connection's statement cache is keyed on the SQL text, so the hot
+    # queries are shared constants and each is parsed once per connection
+    _SQL_SELECT_ALL = "SELECT code FROM invitations"
+    _SQL_SELECT_ONE = (
+        "SELECT code, created_at, expires_at, max_requests, remaining_requests, "
+        "is_active FROM invitations WHERE code = ?"
+    )
+    _SQL_SELECT_SESSIONS = "SELECT session_id FROM invitation_sessions WHERE code = ?"
+    # The columns _evaluate needs, plus whether the session already used the code
+    _SQL_SELECT_STATUS = """
+    SELECT expires_at, max_requests, remaining_requests, is_active, EXISTS (
+        SELECT 1 FROM invitation_sessions
+        WHERE code = :code AND session_id = :session_id
+    )
+    FROM invitations WHERE code = :code
+    """
+    _SQL_INSERT = "INSERT INTO invitations VALUES (?, ?, ?, ?, ?, ?, ?)"
+    _SQL_INSERT_SESSION = (
+        "INSERT OR IGNORE INTO invitation_sessions VALUES (:code, :session_id)"
+    )
+    # Applies the _evaluate rules and spends a request in one statement; when
+    # nothing is left to spend, _evaluate decides on the status row whether a
+    # session that already used the code may continue
+    _SQL_CONSUME = """
+    UPDATE invitations SET remaining_requests = remaining_requests - 1
+    WHERE code = :code
+        AND is_active = 1
+        AND expires_at >= :now
+        AND remaining_requests > 0
+    RETURNING remaining_requests, max_requests
+    """
+    _SQL_REFUND = """
+    UPDATE invitations
+    SET remaining_requests = MIN(remaining_requests + 1, max_requests)
+    WHERE code = :code
+    RETURNING remaining_requests
+    """
+    _SQL_USE = """
+    UPDATE invitations SET remaining_requests = MAX(remaining_requests - 1, 0)
+    WHERE code = :code
+    RETURNING remaining_requests
+    """
+
+    # Seconds a validate_code status row is reused, the most codes held, and
+    # the most sessions held per code; other worker processes may spend
+    # requests meanwhile, but consumption itself always goes to the database
+    _STATUS_CACHE_TTL = 2.0
+    _STATUS_CACHE_CODES = 1024
+    _STATUS_CACHE_SESSIONS = 64
+
+    # Stored in PRAGMA user_version once _init_db has set up the schema
+    _SCHEMA_VERSION = 1
+
     def __init__(self, db_path="invitation_store.db"):
         """Initialize the invitation store with SQLite database."""
         self.db_path = db_path
+        # One long-lived connection instead of opening the file per call; the
+        # lock serializes its use across the worker threads serving requests
+        self._conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=128,
+        )
+        self._lock = threading.Lock()
+        # code -> session ID -> (monotonic timestamp, _SQL_SELECT_STATUS row)
+        self._status_cache: Dict[str, Dict[str, Tuple[float, tuple]]] = {}
         self._init_db()
 
         # Add a default invitation code if the database is empty
-        if not self._get_all_codes():
+        if not self._has_codes():
             self.create_invitation_code(max_requests=10, expiry_seconds=3600)
 
     def _init_db(self):
         """Initialize the SQLite database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
+
+        # Write-ahead logging lets /validate reads proceed while /use holds the
+        # write lock; the mode is stored in the database file, so set it once
+        cursor.execute("PRAGMA journal_mode=WAL")
+        # The rest are per connection: WAL stays consistent with NORMAL syncing,
+        # and other worker processes wait for the write lock instead of failing
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+
+        # An up-to-date database needs no schema work, and so no write lock
+        (version,) = cursor.execute("PRAGMA user_version").fetchone()
+        if version >= self._SCHEMA_VERSION:
+            return
+
+        # Set up the schema in one write transaction, so worker processes
+        # starting together do not run the migrations below twice
+        cursor.execute("BEGIN IMMEDIATE")
+
+        # Create the invitations table if it doesn't exist; keyed directly on
+        # the code, so a lookup is one B-tree descent instead of an index
+        # probe followed by a rowid lookup
+        cursor.execute(self._INVITATIONS_TABLE.format(name="invitations"))
+
+        # Databases created before the table was WITHOUT ROWID are rebuilt once
+        (table_sql,) = cursor.execute(
+            "SELECT sql FROM sqlite_master "
+            "WHERE type = 'table' AND name = 'invitations'"
+        ).fetchone()
+        if "WITHOUT ROWID" not in table_sql.upper():
+            cursor.execute(self._INVITATIONS_TABLE.format(name="invitations_new"))
+            cursor.execute("INSERT INTO invitations_new SELECT * FROM invitations")
+            cursor.execute("DROP TABLE invitations")
+            cursor.execute("ALTER TABLE invitations_new RENAME TO invitations")
+
+        # Sessions that used each code, keyed for an index probe per request
+        # instead of parsing a JSON list that grows with every new session
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS invitation_sessions (
+            code TEXT,
+            session_id TEXT,
+            PRIMARY KEY (code, session_id)
+        ) WITHOUT ROWID
+        """)
 
-        # Create the invitations table if it doesn't exist
+        # Move sessions recorded in the legacy used_by_sessions column into
+        # the table; the column is left empty afterwards, so this is a no-op
+        # once a database has been migrated
         cursor.execute("""
-        CREATE TABLE IF NOT EXISTS invitations (
-            code TEXT PRIMARY KEY,
-            created_at REAL,
-            expires_at REAL,
-            max_requests INTEGER,
-            remaining_requests INTEGER,
-            is_active INTEGER,
-            used_by_sessions TEXT
-        )
+        INSERT OR IGNORE INTO invitation_sessions
+        SELECT invitations.code, json_each.value
+        FROM invitations, json_each(invitations.used_by_sessions)
+        WHERE invitations.used_by_sessions != '[]'
         """)
+        cursor.execute(
+            "UPDATE invitations SET used_by_sessions = '[]' "
+            "WHERE used_by_sessions != '[]'"
+        )
+        cursor.execute(f"PRAGMA user_version = {self._SCHEMA_VERSION}")
+        cursor.execute("COMMIT")
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
 
-        conn.commit()
-        conn.close()
+    def _has_codes(self) -> bool:
+        """Check whether the database holds any invitation code."""
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM invitations LIMIT 1").fetchone()
+        return row is not None
 
     def _get_all_codes(self):
         """Get all invitation codes from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT code FROM invitations")
-        codes = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            codes = self._conn.execute(self._SQL_SELECT_ALL).fetchall()
         return [code[0] for code in codes]
 
     def create_invitation_code(
@@ -80,18 +212,29 @@ class InvitationStore:
         Returns:
             The generated invitation code
         """
-        # Generate a unique code
-        raw_code = str(uuid.uuid4())
-        # Create a shorter hashed version (first 8 chars of SHA-256)
-        code = hashlib.sha256(raw_code.encode()).hexdigest()[:8]
+        return self.create_invitation_codes(1, max_requests, expiry_seconds)[0]
 
-        now = time.time()
+    def create_invitation_codes(
+        self, count: int, max_requests: int = 10, expiry_seconds: int = 3600
+    ) -> List[str]:
+        """
+        Create several invitation codes in a single transaction.
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Bulk seeding then pays for one commit instead of one per code.
 
-        cursor.execute(
-            "INSERT INTO invitations VALUES (?, ?, ?, ?, ?, ?, ?)",
+        Args:
+            count: Number of codes to create
+            max_requests: Maximum number of requests allowed with each code
+            expiry_seconds: Number of seconds until the codes expire
+
+        Returns:
+            The generated invitation codes
+        """
+        # Generate unique codes (9 random bytes -> 12 URL-safe characters)
+        codes = [secrets.token_urlsafe(9) for _ in range(count)]
+
+        now = time.time()
+        rows = [
             (
                 code,
                 now,
@@ -99,76 +242,67 @@ class InvitationStore:
                 max_requests,
                 max_requests,
                 1,  # is_active (1 = True)
-                json.dumps([]),  # used_by_sessions as JSON
-            ),
-        )
-
-        conn.commit()
-        conn.close()
-
-        return code
-
-    def validate_code(self, code: str, session_id: str) -> Dict[str, Any]:
+                "[]",  # legacy used_by_sessions; see invitation_sessions
+            )
+            for code in codes
+        ]
+
+        conn = self._conn
+        with self._lock:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(self._SQL_INSERT, rows)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+        return codes
+
+    def _evaluate(
+        self, status: Optional[tuple], now: Optional[float] = None
+    ) -> Dict[str, Any]:
         """
-        Validate an invitation code and return its status.
+        Apply the validity rules to an invitation's status row.
 
         Args:
-            code: The invitation code to validate
-            session_id: The session ID using this code
+            status: Row from _SQL_SELECT_STATUS, or None if the code is missing
+            now: Unix timestamp to check expiry against (defaults to the current time)
 
         Returns:
             Dictionary with validation status
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if code exists
-        cursor.execute("SELECT * FROM invitations WHERE code = ?", (code,))
-        invitation_data = cursor.fetchone()
-
-        if not invitation_data:
-            conn.close()
+        if not status:
             return {"valid": False, "message": "Invalid invitation code."}
 
         # Unpack data
-        (
-            code,
-            created_at,
-            expires_at,
-            max_requests,
-            remaining_requests,
-            is_active,
-            used_by_sessions_json,
-        ) = invitation_data
-
-        is_active = bool(is_active)
-        used_by_sessions = json.loads(used_by_sessions_json)
+        expires_at, max_requests, remaining_requests, is_active, seen = status
 
         # Check if code is active
         if not is_active:
-            conn.close()
             return {
                 "valid": False,
                 "message": "This invitation code has been deactivated.",
             }
 
         # Check if code has expired
-        if time.time() > expires_at:
-            conn.close()
-            return {"valid": False, "message": "This invitation code has expired."}
+        if (time.time() if now is None else now) > expires_at:
+            return {
+                "valid": False,
+                "message": "This invitation code has expired.",
+            }
 
         # Check if the session has already used this code
-        new_session = session_id not in used_by_sessions
+        new_session = not seen
 
         # If it's a new session but the code has no remaining requests
         if new_session and remaining_requests <= 0:
-            conn.close()
             return {
                 "valid": False,
                 "message": "This invitation code has reached its request limit.",
             }
 
-        conn.close()
         # Code is valid
         return {
             "valid": True,
@@ -178,62 +312,153 @@ class InvitationStore:
             "new_session": new_session,
         }
 
-    def use_request(self, code: str, session_id: str) -> Optional[int]:
+    def validate_code(self, code: str, session_id: str) -> Dict[str, Any]:
         """
-        Decrement the remaining requests for a code and return the new count.
+        Validate an invitation code and return its status.
 
         Args:
-            code: The invitation code
-            session_id: The session ID using the code
+            code: The invitation code to validate
+            session_id: The session ID using this code
 
         Returns:
-            The number of remaining requests, or None if the code is invalid
+            Dictionary with validation status
+        """
+        # Check if code exists; expiry is evaluated afresh even on a cache hit
+        now = time.monotonic()
+        with self._lock:
+            cached = self._status_cache.get(code, {}).get(session_id)
+            if cached and now - cached[0] < self._STATUS_CACHE_TTL:
+                return self._evaluate(cached[1])
+
+            status = self._conn.execute(
+                self._SQL_SELECT_STATUS, {"code": code, "session_id": session_id}
+            ).fetchone()
+            if status is not None:
+                sessions = self._status_cache.get(code)
+                if sessions is None:
+                    if len(self._status_cache) >= self._STATUS_CACHE_CODES:
+                        self._status_cache.pop(next(iter(self._status_cache)))
+                    sessions = self._status_cache[code] = {}
+                elif (
+                    session_id not in sessions
+                    and len(sessions) >= self._STATUS_CACHE_SESSIONS
+                ):
+                    # Callers inventing session IDs must not grow one code's
+                    # entry without limit; drop its oldest session
+                    sessions.pop(next(iter(sessions)))
+                sessions[session_id] = (now, status)
+
+        return self._evaluate(status)
+
+    def consume_request(self, code: str, session_id: str) -> Dict[str, Any]:
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        Validate an invitation code and use one of its requests atomically.
 
-        # Get the current invitation data
-        cursor.execute(
-            "SELECT remaining_requests, used_by_sessions FROM invitations WHERE code = ?",
-            (code,),
-        )
-        result = cursor.fetchone()
+        The check and the decrement are a single UPDATE ... RETURNING, run in
+        one transaction with recording the session, so concurrent callers
+        cannot both spend the last remaining request. Only when the update
+        matches nothing is the code read back, to explain why.
 
-        if not result:
-            conn.close()
-            return None
+        Args:
+            code: The invitation code
+            session_id: The session ID using the code
 
-        remaining_requests, used_by_sessions_json = result
-        used_by_sessions = json.loads(used_by_sessions_json)
+        Returns:
+            Dictionary with validation status; when valid, remaining_requests
+            is the count after this request was used, and consumed tells
+            whether a request was actually spent (see refund_request)
+        """
+        now = time.time()
+        params = {"code": code, "session_id": session_id, "now": now}
+        conn = self._conn
+        with self._lock:
+            # Every session's cached status shows this code's remaining count
+            self._status_cache.pop(code, None)
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                consumed = conn.execute(self._SQL_CONSUME, params).fetchone()
+                if consumed is None:
+                    status = conn.execute(self._SQL_SELECT_STATUS, params).fetchone()
+                    conn.execute("ROLLBACK")
+                else:
+                    conn.execute(self._SQL_INSERT_SESSION, params)
+                    conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+        if consumed is None:
+            result = self._evaluate(status, now)
+            result["consumed"] = False
+            return result
+
+        remaining_requests, max_requests = consumed
+        return {
+            "valid": True,
+            "message": "Valid invitation code.",
+            "remaining_requests": remaining_requests,
+            "max_requests": max_requests,
+            "consumed": True,
+        }
 
-        # Add session to used sessions if not already there
-        if session_id not in used_by_sessions:
-            used_by_sessions.append(session_id)
+    def refund_request(self, code: str) -> Optional[int]:
+        """
+        Give back a request spent by consume_request that produced no answer.
 
-        # Decrement remaining requests
-        if remaining_requests > 0:
-            remaining_requests -= 1
+        Args:
+            code: The invitation code
 
-        # Update the invitation in the database
-        cursor.execute(
-            "UPDATE invitations SET remaining_requests = ?, used_by_sessions = ? WHERE code = ?",
-            (remaining_requests, json.dumps(used_by_sessions), code),
-        )
+        Returns:
+            The number of remaining requests, or None if the code is invalid
+        """
+        with self._lock:
+            self._status_cache.pop(code, None)
+            result = self._conn.execute(self._SQL_REFUND, {"code": code}).fetchone()
+        return result[0] if result else None
 
-        conn.commit()
-        conn.close()
+    def use_request(self, code: str, session_id: str) -> Optional[int]:
+        """
+        Decrement the remaining requests for a code and return the new count.
+
+        Args:
+            code: The invitation code
+            session_id: The session ID using the code
 
-        return remaining_requests
+        Returns:
+            The number of remaining requests, or None if the code is invalid
+        """
+        params = {"code": code, "session_id": session_id}
+        conn = self._conn
+        with self._lock:
+            self._status_cache.pop(code, None)
+            try:
+                # The decrement and the session record land together or not at all
+                conn.execute("BEGIN IMMEDIATE")
+                result = conn.execute(self._SQL_USE, params).fetchone()
+
+                if not result:
+                    conn.execute("ROLLBACK")
+                    return None
+
+                conn.execute(self._SQL_INSERT_SESSION, params)
+                conn.execute("COMMIT")
+            except Exception:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+        return result[0]
 
     def get_invitation(self, code: str) -> Optional[InvitationCode]:
         """Get the invitation code object from the database."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM invitations WHERE code = ?", (code,))
-        invitation_data = cursor.fetchone()
-
-        conn.close()
+        with self._lock:
+            invitation_data = self._conn.execute(
+                self._SQL_SELECT_ONE, (code,)
+            ).fetchone()
+            sessions = self._conn.execute(
+                self._SQL_SELECT_SESSIONS, (code,)
+            ).fetchall()
 
         if not invitation_data:
             return None
@@ -246,7 +471,6 @@ class InvitationStore:
             max_requests,
             remaining_requests,
             is_active,
-            used_by_sessions_json,
         ) = invitation_data
 
         return InvitationCode(
@@ -256,10 +480,10 @@ class InvitationStore:
             max_requests=max_requests,
             remaining_requests=remaining_requests,
             is_active=bool(is_active),
-            used_by_sessions=json.loads(used_by_sessions_json),
+            used_by_sessions=[session[0] for session in sessions],
         )
 
 
 invitation_store = InvitationStore(
-    db_path=os.getenv("INVITATION_DB_PATH", "invitation_store.db")
+    db_path=settings.INVITATION_DB_PATH or "invitation_store.db"
 )
@@ -0,0 +1,35 @@
+"""
+Pydantic models for LLM provider diagnostics.
+"""
+
+from enum import Enum
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class ProviderStatus(str, Enum):
+    """Health of an LLM provider as reported by /llm/status."""
+
+    HEALTHY = "healthy"
+    INVALID_KEY = "invalid_key"
+    INSUFFICIENT_CREDITS = "insufficient_credits"
+    RATE_LIMITED = "rate_limited"
+    UNAVAILABLE = "unavailable"
+    NOT_CONFIGURED = "not_configured"
+
+
+class ProviderHealth(BaseModel):
+    """Result of probing a single LLM provider."""
+
+    status: ProviderStatus
+    latency_ms: Optional[float] = None
+    message: Optional[str] = None
+    endpoint: Optional[str] = None
+    models: Optional[List[str]] = None
+    stale: Optional[bool] = None
+
+
+class LLMStatusResponse(BaseModel):
+    """Response model for /llm/status."""
+
+    providers: Dict[str, ProviderHealth]
\ No newline at end of file
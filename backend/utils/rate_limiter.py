@@ -0,0 +1,58 @@
+"""
+In-memory rate limiting for endpoints that look up invitation codes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Hashable, Tuple
+
+
+class RateLimiter:
+    """Fixed-window counter allowing `limit` calls per key every `window` seconds."""
+
+    def __init__(self, limit: int, window: float, max_keys: int = 10000):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            limit: Calls allowed per key in one window
+            window: Window length in seconds
+            max_keys: Most keys tracked; the oldest windows are dropped beyond it
+        """
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        # key -> (window start as a monotonic timestamp, calls in the window),
+        # ordered by window start so expired windows are always at the front
+        self._windows: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def allow(self, key: Hashable) -> bool:
+        """
+        Count a call for a key.
+
+        Args:
+            key: Identifies the caller
+
+        Returns:
+            True if the call is within the limit, False if it should be rejected
+        """
+        now = time.monotonic()
+        windows = self._windows
+        with self._lock:
+            # Drop expired windows from the front, and the oldest live ones
+            # when too many keys are tracked, so each call does bounded work
+            while windows:
+                oldest = next(iter(windows.values()))[0]
+                if now - oldest < self.window and len(windows) < self.max_keys:
+                    break
+                windows.popitem(last=False)
+
+            # Any window still tracked is live; a new key starts its window now
+            # and goes to the back, which keeps the order by window start
+            started, calls = windows.get(key, (now, 0))
+            if calls >= self.limit:
+                return False
+            windows[key] = (started, calls + 1)
+        return True
@@ -2,14 +2,55 @@
 Session management utilities for storing conversation history and session data.
 """
 
-from collections import defaultdict
-from typing import Dict, List, Any
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Any, Tuple
 
-# Stores conversation for fluid multi-turn chat
-session_store = defaultdict(list)
+# Messages kept per session; prompts only use a recent window of them
+MAX_STORED_MESSAGES = 200
+
+# Sessions kept in memory; the least recently used are dropped beyond this
+MAX_SESSIONS = 10000
+
+
+class LRUSessionStore:
+    """
+    Per-session values that are created on first access, like a defaultdict,
+    but bounded: once more than `maxsize` sessions are held, the least
+    recently used session is evicted.
+    """
+    
+    def __init__(self, factory: Callable[[], Any], maxsize: int = MAX_SESSIONS):
+        self._factory = factory
+        self._maxsize = maxsize
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __getitem__(self, session_id: str) -> Any:
+        with self._lock:
+            value = self._entries.get(session_id)
+            if value is None:
+                value = self._entries[session_id] = self._factory()
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(session_id)
+            return value
+    
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Stores conversation for fluid multi-turn chat, as (role, content) tuples; a
+# 2-tuple is a fraction of the size of a {"role", "content"} dict, and the
+# dicts the LLM needs are only built for the messages actually sent
+session_store = LRUSessionStore(list)
 
 # Stores session data (key-value pairs) like last run ID, last experiment ID, etc.
-session_data = defaultdict(dict)
+session_data = LRUSessionStore(dict)
 
 def get_conversation_history(session_id: str) -> List[Dict[str, str]]:
     """
@@ -21,7 +62,59 @@ def get_conversation_history(session_id: str) -> List[Dict[str, str]]:
     Returns:
         List of conversation messages
     """
-    return session_store[session_id]
+    return [
+        {"role": role, "content": content}
+        for role, content in session_store[session_id]
+    ]
+
+def get_conversation_window(
+    session_id: str, max_messages: int = 20, max_chars: int = 16000
+) -> List[Dict[str, str]]:
+    """
+    Get the most recent part of a session's conversation history.
+    
+    Messages are taken newest first until either limit would be exceeded;
+    the newest message is always included. The window never starts with an
+    assistant reply, so it opens on the user turn that prompted it.
+    
+    Args:
+        session_id: The unique session identifier
+        max_messages: Maximum number of messages to return
+        max_chars: Maximum total length of the message contents
+        
+    Returns:
+        List of conversation messages, oldest first
+    """
+    history = session_store[session_id]
+    start = len(history)
+    total_chars = 0
+    while start > 0 and len(history) - start < max_messages:
+        total_chars += len(history[start - 1][1])
+        if total_chars > max_chars and start < len(history):
+            break
+        start -= 1
+    while start < len(history) - 1 and history[start][0] == "assistant":
+        start += 1
+    return [
+        {"role": role, "content": content} for role, content in history[start:]
+    ]
+
+def get_session_bundle(
+    session_id: str, max_messages: int = 20, max_chars: int = 16000
+) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """
+    Get everything a chat request reads from the session in one call.
+    
+    Args:
+        session_id: The unique session identifier
+        max_messages: Maximum number of conversation messages to return
+        max_chars: Maximum total length of the message contents
+        
+    Returns:
+        Tuple of (recent conversation window, session data)
+    """
+    window = get_conversation_window(session_id, max_messages, max_chars)
+    return window, session_data[session_id]
 
 def append_to_conversation(session_id: str, role: str, content: str) -> None:
     """
@@ -32,7 +125,11 @@ def append_to_conversation(session_id: str, role: str, content: str) -> None:
         role: Message role (user/assistant)
         content: Message content
     """
-    session_store[session_id].append({"role": role, "content": content})
+    history = session_store[session_id]
+    history.append((role, content))
+    # Trim in batches so the O(n) delete is amortized over many appends
+    if len(history) > 2 * MAX_STORED_MESSAGES:
+        del history[:-MAX_STORED_MESSAGES]
 
 def get_session_data(session_id: str) -> Dict[str, Any]:
     """
@@ -44,8 +141,6 @@ def get_session_data(session_id: str) -> Dict[str, Any]:
     Returns:
         Session data dictionary
     """
-    if session_id not in session_data:
-        session_data[session_id] = {}
     return session_data[session_id]
 
 def set_session_data(session_id: str, key: str, value: Any) -> None:
@@ -57,6 +152,14 @@ def set_session_data(session_id: str, key: str, value: Any) -> None:
         key: Data key
         value: Data value
     """
-    if session_id not in session_data:
-        session_data[session_id] = {}
-    session_data[session_id][key] = value
\ No newline at end of file
+    session_data[session_id][key] = value
+
+def set_session_data_many(session_id: str, values: Dict[str, Any]) -> None:
+    """
+    Set several key-value pairs in the session data at once.
+    
+    Args:
+        session_id: The unique session identifier
+        values: Data keys and their values
+    """
+    session_data[session_id].update(values)
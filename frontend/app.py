@@ -1,11 +1,20 @@
 import streamlit as st
+import pandas as pd
 import requests
 import os
 import time
-import traceback
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from utils.api import chat_with_bot, create_session
 
-load_dotenv()
+
+@st.cache_resource
+def load_env() -> bool:
+    """Load .env once per server process; it updates os.environ for every rerun."""
+    return load_dotenv()
+
+
+load_env()
 
 st.set_page_config(
     page_title="Prodizy Platform - Intelligent Data-Aware AI Platform",
@@ -22,6 +31,25 @@ MLFLOW_TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "http://127.0.0.1:5000")
 DEFAULT_PROVIDER = os.getenv("DEFAULT_LLM_PROVIDER", "openai")
 DEFAULT_MODEL = os.getenv("DEFAULT_LLM_MODEL", "gpt-4o")
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
+# (connect, read) timeouts: a dead server is noticed within the short connect
+# timeout instead of using up the whole budget before it is even reached
+CONNECT_TIMEOUT = float(os.getenv("CONNECT_TIMEOUT", "2"))
+READ_TIMEOUT = float(os.getenv("READ_TIMEOUT", "8"))
+HEALTH_CHECK_TIMEOUT = (1.0, 4.0)
+API_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+CHAT_TIMEOUT = (CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+# Every rerun redraws the whole history, so only the latest messages are kept
+MAX_HISTORY = int(os.getenv("MAX_CHAT_HISTORY", "50"))
+
+
+# One pooled session for every backend and MLflow call, kept across reruns
+@st.cache_resource
+def get_http_session():
+    return create_session()
+
+
+SESSION = get_http_session()
+
 
 # Check if running on localhost, is required to disable invitation generation on deployment servers
 is_localhost = "localhost" in BACKEND_API_URL or "127.0.0.1" in BACKEND_API_URL
@@ -43,8 +71,6 @@ if "llm_providers" not in st.session_state:
     st.session_state.llm_providers = []
 if "selected_provider" not in st.session_state:
     st.session_state.selected_provider = DEFAULT_PROVIDER
-if "provider_models" not in st.session_state:
-    st.session_state.provider_models = {}
 if "selected_model" not in st.session_state:
     st.session_state.selected_model = DEFAULT_MODEL
 if "invitation_code" not in st.session_state:
@@ -62,7 +88,7 @@ if "llm_status" not in st.session_state:
 
 def check_backend_connection():
     try:
-        response = requests.get(f"{BACKEND_API_URL}docs", timeout=5)
+        response = SESSION.get(f"{BACKEND_API_URL}docs", timeout=HEALTH_CHECK_TIMEOUT)
         if response.status_code < 400:
             return True
         return False
@@ -72,7 +98,9 @@ def check_backend_connection():
 
 def check_mlflow_connection():
     try:
-        response = requests.get(f"{MLFLOW_TRACKING_URI}/health", timeout=5)
+        response = SESSION.get(
+            f"{MLFLOW_TRACKING_URI}/health", timeout=HEALTH_CHECK_TIMEOUT
+        )
         if response.status_code < 400:
             return True
         return False
@@ -83,8 +111,8 @@ def check_mlflow_connection():
 def validate_invitation_code(code, session_id="streamlit-session"):
     try:
         payload = {"code": code, "session_id": session_id}
-        response = requests.post(
-            f"{BACKEND_API_URL}invitation/validate", json=payload, timeout=5
+        response = SESSION.post(
+            f"{BACKEND_API_URL}invitation/validate", json=payload, timeout=API_TIMEOUT
         )
         if response.ok:
             data = response.json()
@@ -99,9 +127,11 @@ def validate_invitation_code(code, session_id="streamlit-session"):
         return False, f"Error: {str(e)}"
 
 
+# The provider list only changes with the backend's configuration
+@st.cache_data(ttl=300, show_spinner=False)
 def get_providers():
     try:
-        response = requests.get(f"{BACKEND_API_URL}chat/providers", timeout=5)
+        response = SESSION.get(f"{BACKEND_API_URL}chat/providers", timeout=API_TIMEOUT)
         if response.ok:
             data = response.json()
             return data.get("providers", [])
@@ -110,11 +140,13 @@ def get_providers():
         return []
 
 
+# Keyed on both arguments, so switching back to a provider is instant
+@st.cache_data(ttl=300, show_spinner="Fetching available models...")
 def get_provider_models(provider_id, invitation_code):
     try:
         payload = {"provider_id": provider_id, "invitation_code": invitation_code}
-        response = requests.post(
-            f"{BACKEND_API_URL}chat/provider-models", json=payload, timeout=10
+        response = SESSION.post(
+            f"{BACKEND_API_URL}chat/provider-models", json=payload, timeout=API_TIMEOUT
         )
         if response.ok:
             data = response.json()
@@ -124,68 +156,12 @@ def get_provider_models(provider_id, invitation_code):
         return []
 
 
-def chat_with_bot(query, provider_id, model_id, invitation_code):
-    payload = {
-        "session_id": "streamlit-session",
-        "query": query,
-        "invitation_code": invitation_code,
-        "cached_intent": {"llm_provider_id": provider_id, "llm_model_id": model_id},
-    }
-
-    headers = {"Content-Type": "application/json"}
-
-    try:
-        start_time = time.time()
-        response = requests.post(
-            f"{BACKEND_API_URL}chat/mlflow",
-            json=payload,
-            headers=headers,
-            timeout=REQUEST_TIMEOUT,
-        )
-        elapsed_time = time.time() - start_time
-
-        if elapsed_time > 5:
-            st.info(f"Request took {elapsed_time:.2f} seconds to complete")
-
-        response.raise_for_status()
-
-        response_json = response.json()
-        assistant_response = response_json.get("assistant_response", {})
-
-        st.session_state.remaining_requests -= 1
-
-        return assistant_response
-    except requests.exceptions.Timeout:
-        return {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"❌ Request timed out after {REQUEST_TIMEOUT} seconds. The backend or MLflow server might be unresponsive.",
-        }
-    except requests.exceptions.ConnectionError:
-        return {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"❌ Connection error: Could not connect to the backend at {BACKEND_API_URL}. Please check if the backend is running.",
-        }
-    except requests.RequestException as e:
-        return {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"❌ Request error: {str(e)}",
-        }
-    except Exception as e:
-        error_details = traceback.format_exc()
-        return {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"❌ Unexpected error: {str(e)}\n\nDetails: {error_details}",
-        }
-
-
 # Generate a development invitation code
 def generate_dev_invitation():
     try:
-        response = requests.post(f"{BACKEND_API_URL}invitation/create", timeout=5)
+        response = SESSION.post(
+            f"{BACKEND_API_URL}invitation/create", timeout=API_TIMEOUT
+        )
         if response.ok:
             data = response.json()
             return data.get("code", "Error generating code")
@@ -197,7 +173,10 @@ def generate_dev_invitation():
 # Check LLM status
 def check_llm_status():
     try:
-        response = requests.get(f"{BACKEND_API_URL}llm/status", timeout=10)
+        # The backend probes every provider, so allow it longer to answer
+        response = SESSION.get(
+            f"{BACKEND_API_URL}llm/status", timeout=(CONNECT_TIMEOUT, 10)
+        )
         if response.ok:
             return response.json()
         return {"providers": {}}
@@ -205,11 +184,37 @@ def check_llm_status():
         return {"providers": {}, "error": str(e)}
 
 
-if st.session_state.backend_status is None:
-    st.session_state.backend_status = check_backend_connection()
+@st.cache_resource
+def get_health_check_pool():
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-check")
+
 
-if st.session_state.mlflow_status is None:
-    st.session_state.mlflow_status = check_mlflow_connection()
+# Chat requests from every browser session
+@st.cache_resource
+def get_chat_pool():
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="chat")
+
+
+# Status checks run at the same time, so a cold page waits for the slowest
+# one rather than their sum; the results are shared by every browser session
+# and reused for a short while instead of each rerun probing the servers again
+@st.cache_data(ttl=15, show_spinner=False)
+def run_health_checks():
+    pool = get_health_check_pool()
+    backend = pool.submit(check_backend_connection)
+    mlflow = pool.submit(check_mlflow_connection)
+    llm_status = pool.submit(check_llm_status)
+    return {
+        "backend": backend.result(),
+        "mlflow": mlflow.result(),
+        "llm_status": llm_status.result(),
+    }
+
+
+health = run_health_checks()
+st.session_state.backend_status = health["backend"]
+st.session_state.mlflow_status = health["mlflow"]
+st.session_state.llm_status = health["llm_status"]
 
 if not st.session_state.backend_status:
     st.error(f"⚠️ Cannot connect to backend at {BACKEND_API_URL}")
@@ -229,10 +234,36 @@ if not st.session_state.mlflow_status:
     - Network/firewall issues
     """)
 
-if st.session_state.backend_status and len(st.session_state.llm_providers) == 0:
+if st.session_state.backend_status:
     st.session_state.llm_providers = get_providers()
+    if not st.session_state.llm_providers:
+        # Do not keep a failed fetch for the full five minutes
+        get_providers.clear()
+
+
+# st.fragment arrived in Streamlit 1.37 (st.experimental_fragment in 1.33)
+FRAGMENT = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def fragment(run_every=None):
+    """Rerun the decorated function on its own where Streamlit supports it.
+
+    On releases without fragments the function just renders as part of the
+    page.
+    """
+    if FRAGMENT is None:
+        return lambda func: func
+    return FRAGMENT(run_every=run_every)
+
+
+@fragment(run_every=15)
+def server_status_panel():
+    # Refreshes itself on the health check TTL without rerunning the page
+    health = run_health_checks()
+    st.session_state.backend_status = health["backend"]
+    st.session_state.mlflow_status = health["mlflow"]
+    st.session_state.llm_status = health["llm_status"]
 
-with st.sidebar:
     with st.container():
         st.subheader("🖥️ Server Status")
 
@@ -254,36 +285,25 @@ with st.sidebar:
         if st.session_state.backend_status:
             st.markdown("##### LLM Providers")
 
-            # Fetch LLM status if not already available
-            if st.session_state.llm_status is None:
-                with st.spinner("Checking LLM providers..."):
-                    st.session_state.llm_status = check_llm_status()
-
             # Display LLM provider statuses
             llm_providers = st.session_state.llm_status.get("providers", {})
 
             if llm_providers:
-                # Create a 2-column grid layout for LLM providers
-                provider_names = list(llm_providers.keys())
-                rows = (len(provider_names) + 1) // 2
-
-                for i in range(rows):
-                    cols = st.columns(2)
-
-                    for j in range(2):
-                        idx = i * 2 + j
-                        if idx < len(provider_names):
-                            provider = provider_names[idx]
-                            provider_info = llm_providers[provider]
-
-                            # Determine status
-                            is_available = provider_info.get("status") == "available"
-
-                            with cols[j]:
-                                if is_available:
-                                    st.success(f"{provider.title()}: ✅")
-                                else:
-                                    st.error(f"{provider.title()}: ❌")
+                # One table element instead of a grid of columns and alerts
+                st.dataframe(
+                    pd.DataFrame(
+                        [
+                            (
+                                provider.title(),
+                                "✅" if info.get("status") == "healthy" else "❌",
+                            )
+                            for provider, info in llm_providers.items()
+                        ],
+                        columns=["Provider", "Status"],
+                    ),
+                    hide_index=True,
+                    use_container_width=True,
+                )
             else:
                 st.info("No LLM provider information available")
 
@@ -297,13 +317,31 @@ with st.sidebar:
                 if st.button(
                     "Refresh Status", use_container_width=True, type="primary"
                 ):
-                    st.session_state.backend_status = check_backend_connection()
-                    st.session_state.mlflow_status = check_mlflow_connection()
-                    if st.session_state.backend_status:
-                        st.session_state.llm_providers = get_providers()
-                    st.session_state.llm_status = None  # Reset to trigger refresh
+                    # Drop the cached results so the rerun checks again
+                    run_health_checks.clear()
+                    get_providers.clear()
                     st.rerun()
 
+
+@fragment(run_every=0.25)
+def pending_reply():
+    """Show the reply being generated, and rerun the page once it is done."""
+    # Only this bubble reruns while the request is in flight, not the sidebar
+    # and chat history around it
+    with st.chat_message("assistant"):
+        st.write("Processing your request...")
+    chat_future = st.session_state.get("chat_future")
+    if chat_future is None or chat_future.done():
+        st.rerun()
+    if FRAGMENT is None:
+        # Without fragments the whole page has to poll
+        time.sleep(0.25)
+        st.rerun()
+
+
+with st.sidebar:
+    server_status_panel()
+
     if st.session_state.session_started:
         with st.container():
             st.subheader("🤖 LLM Configuration")
@@ -345,6 +383,8 @@ with st.sidebar:
                 st.session_state.chat_history = []
                 st.session_state.current_message = None
                 st.session_state.is_processing = False
+                # A reply still in flight belongs to the chat being cleared
+                st.session_state.pop("chat_future", None)
                 st.rerun()
 
         with col2:
@@ -355,6 +395,7 @@ with st.sidebar:
                     st.session_state.chat_history = []
                     st.session_state.current_message = None
                     st.session_state.is_processing = False
+                    st.session_state.pop("chat_future", None)
                     st.rerun()
 
 if not st.session_state.invitation_valid:
@@ -405,31 +446,30 @@ elif not st.session_state.session_started:
     with st.container():
         st.markdown("### Choose your LLM Provider")
 
-        provider_options = [p["name"] for p in st.session_state.llm_providers]
-        provider_ids = [p["id"] for p in st.session_state.llm_providers]
+        provider_names = {p["id"]: p["name"] for p in st.session_state.llm_providers}
 
-        if provider_options:
+        if provider_names:
+            provider_ids = list(provider_names)
             default_idx = 0
-            if DEFAULT_PROVIDER in provider_ids:
+            if DEFAULT_PROVIDER in provider_names:
                 default_idx = provider_ids.index(DEFAULT_PROVIDER)
 
-            selected_provider_name = st.selectbox(
-                "LLM Provider", options=provider_options, index=default_idx
+            # Options are the ids, so the selection needs no reverse lookup
+            selected_provider_id = st.selectbox(
+                "LLM Provider",
+                options=provider_ids,
+                index=default_idx,
+                format_func=provider_names.__getitem__,
             )
 
-            provider_idx = provider_options.index(selected_provider_name)
-            selected_provider_id = provider_ids[provider_idx]
-
             st.session_state.selected_provider = selected_provider_id
 
-            with st.spinner("Fetching available models..."):
-                models = get_provider_models(
-                    selected_provider_id, st.session_state.invitation_code
-                )
-                provider_cache_key = selected_provider_id
-                st.session_state.provider_models[provider_cache_key] = models
-
-            models = st.session_state.provider_models.get(provider_cache_key, [])
+            models = get_provider_models(
+                selected_provider_id, st.session_state.invitation_code
+            )
+            if not models:
+                # Do not keep a failed fetch; Retry Loading Models asks again
+                get_provider_models.clear()
 
             if models:
                 st.markdown("### Select a Model")
@@ -437,14 +477,16 @@ elif not st.session_state.session_started:
                 model_cols = st.columns(min(3, len(models)))
 
                 for i, model in enumerate(models):
-                    with model_cols[i % len(model_cols)]:
+                    with model_cols[i % len(model_cols)], st.container(border=True):
                         model_id = model["id"]
                         model_name = model["name"]
                         model_desc = model.get("description", "")
 
-                        st.markdown(f"#### {model_name}")
-                        st.write(model_desc)
-                        st.write(f"Max tokens: {model.get('max_tokens', 'Unknown')}")
+                        # One markdown element per card instead of three
+                        st.markdown(
+                            f"#### {model_name}\n{model_desc}\n\n"
+                            f"Max tokens: {model.get('max_tokens', 'Unknown')}"
+                        )
 
                         if st.button(f"Select {model_name}", key=f"model_{model_id}"):
                             st.session_state.selected_model = model_id
@@ -460,7 +502,7 @@ elif not st.session_state.session_started:
         else:
             st.error("No LLM providers available. Please check the backend connection.")
             if st.button("Retry Loading Providers"):
-                st.session_state.llm_providers = get_providers()
+                get_providers.clear()
                 st.rerun()
 
 else:
@@ -483,10 +525,6 @@ else:
 
         if st.session_state.is_processing and st.session_state.current_message:
             st.chat_message("user").write(st.session_state.current_message)
-            with st.chat_message("assistant"):
-                st.write("Processing your request...")
-                with st.spinner():
-                    pass
 
     chat_disabled = (
         st.session_state.is_processing
@@ -511,25 +549,50 @@ else:
     if prompt and not st.session_state.is_processing:
         st.session_state.current_message = prompt
         st.session_state.is_processing = True
+        # Never pick up the finished request of an earlier message
+        st.session_state.pop("chat_future", None)
 
-        st.rerun()
+        # Show the message and start the request in this run, rather than
+        # rerunning the whole script first just to draw it
+        with chat_container:
+            st.chat_message("user").write(prompt)
 
     if st.session_state.is_processing and st.session_state.current_message:
-        assistant_data = chat_with_bot(
-            st.session_state.current_message,
-            st.session_state.selected_provider,
-            st.session_state.selected_model,
-            st.session_state.invitation_code,
-        )
-
-        assistant_message = assistant_data.get("message")
-        if not assistant_message:
-            assistant_message = str(assistant_data)
-
-        st.session_state.chat_history.append(("You", st.session_state.current_message))
-        st.session_state.chat_history.append(("Bot", assistant_message))
-
-        st.session_state.is_processing = False
-        st.session_state.current_message = None
-
-        st.rerun()
+        # The request runs on a worker thread while pending_reply polls it,
+        # so the page stays live until the reply arrives
+        chat_future = st.session_state.get("chat_future")
+        if chat_future is None:
+            chat_future = st.session_state.chat_future = get_chat_pool().submit(
+                chat_with_bot,
+                SESSION,
+                BACKEND_API_URL,
+                st.session_state.current_message,
+                st.session_state.selected_provider,
+                st.session_state.selected_model,
+                st.session_state.invitation_code,
+                CHAT_TIMEOUT,
+            )
+        if not chat_future.done():
+            with chat_container:
+                pending_reply()
+        else:
+            del st.session_state.chat_future
+            assistant_data, elapsed_time = chat_future.result()
+            if elapsed_time is not None:
+                st.session_state.remaining_requests -= 1
+                if elapsed_time > 5:
+                    st.info(f"Request took {elapsed_time:.2f} seconds to complete")
+
+            assistant_message = assistant_data.get("message")
+            if not assistant_message:
+                assistant_message = str(assistant_data)
+
+            chat_history = st.session_state.chat_history
+            chat_history.append(("You", st.session_state.current_message))
+            chat_history.append(("Bot", assistant_message))
+            del chat_history[:-MAX_HISTORY]
+
+            st.session_state.is_processing = False
+            st.session_state.current_message = None
+
+            st.rerun()
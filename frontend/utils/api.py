@@ -2,49 +2,114 @@
 API client utilities for communicating with the backend.
 """
 
+import os
+import logging
+import time
 import requests
-from typing import Dict, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, Tuple
 
-def chat_with_bot(query: str, session_id: str, api_url: str, api_key: str) -> Dict[str, Any]:
+logger = logging.getLogger(__name__)
+
+
+def create_session() -> requests.Session:
+    """
+    Create a pooled session for backend calls.
+    
+    Reusing one session keeps connections alive between calls instead of
+    paying a new TCP (and TLS) handshake for every request.
+    
+    HTTP_POOL_SIZE sets the connections kept per host and HTTP_RETRIES the
+    retries for failed connects and 502/503/504 replies to idempotent
+    requests; both are read when the session is created, after .env is loaded.
+    
+    Returns:
+        A session with a retrying, pooled adapter on http:// and https://
+    """
+    retry = Retry(
+        total=int(os.getenv("HTTP_RETRIES", "3")),
+        backoff_factor=0.3,
+        status_forcelist=(502, 503, 504)
+    )
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=int(os.getenv("HTTP_POOL_SIZE", "50")),
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def chat_with_bot(
+    session: requests.Session,
+    api_url: str,
+    query: str,
+    provider_id: str,
+    model_id: str,
+    invitation_code: str,
+    timeout: Tuple[float, float],
+    session_id: str = "streamlit-session",
+) -> Tuple[Dict[str, Any], Optional[float]]:
     """
     Send a chat query to the Prodizy Platform API.
     
+    Safe to run on a worker thread: it does not touch Streamlit state.
+    
     Args:
+        session: Pooled session from create_session
+        api_url: The API base URL
         query: The user's query text
+        provider_id: The LLM provider to use
+        model_id: The LLM model to use
+        invitation_code: The invitation code paying for the request
+        timeout: (connect, read) timeout in seconds
         session_id: The session identifier
-        api_url: The API base URL
-        api_key: The API key for authorization
         
     Returns:
-        The assistant's response data as a dictionary
+        Tuple of (assistant response, seconds the request took); the time is
+        None when the request failed and the response describes the error
     """
     payload = {
         "session_id": session_id,
         "query": query,
-        "invitation_code": "streamlit-user"
-    }
-    
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {api_key}"
+        "invitation_code": invitation_code,
+        "cached_intent": {"llm_provider_id": provider_id, "llm_model_id": model_id},
     }
     
     try:
-        response = requests.post(
-            f"{api_url}chat/mlflow",
-            json=payload,
-            headers=headers
-        )
+        start_time = time.time()
+        response = session.post(f"{api_url}chat/mlflow", json=payload, timeout=timeout)
+        elapsed_time = time.time() - start_time
         response.raise_for_status()
+        
+        # Parse JSON and return the assistant_response object
+        response_json = response.json()
+        return response_json.get("assistant_response", {}), elapsed_time
+    except requests.exceptions.Timeout:
+        message = (
+            f"❌ Request timed out after {timeout[1]} seconds. "
+            "The backend or MLflow server might be unresponsive."
+        )
+    except requests.exceptions.ConnectionError:
+        message = (
+            f"❌ Connection error: Could not connect to the backend at {api_url}. "
+            "Please check if the backend is running."
+        )
     except requests.RequestException as e:
-        # Return an error-like dict
-        return {
-            "intent": "error",
-            "confirmation": "needs_clarification",
-            "message": f"❌ Error: {str(e)}"
-        }
-
-    # Parse JSON and return the assistant_response object
-    response_json = response.json()
-    assistant_response = response_json.get("assistant_response", {})
-    return assistant_response
\ No newline at end of file
+        message = f"❌ Request error: {str(e)}"
+    except Exception as e:
+        # The traceback goes to the server log rather than into the chat
+        # history, where it would be kept for the rest of the session; the
+        # error still has to be returned, or the chat would stay "processing"
+        logger.exception("Unexpected error in chat_with_bot")
+        message = f"❌ Unexpected error: {str(e)}"
+    
+    # Return an error-like dict
+    return {
+        "intent": "error",
+        "confirmation": "needs_clarification",
+        "message": message,
+    }, None